@@ -1,90 +1,200 @@
 """
 Extrae speakers y agenda del Excel del programa y genera los JSON para la webapp.
+
+Con --eventos procesa en paralelo una carpeta de Excels (uno por convención
+o edición): cada evento va a su propia carpeta de datos y se arma un
+registro de expositores común a todos los eventos.
+
+Si ya se publicó un paquete con publicar_datos.py (webapp/data/bundle/),
+cada build que cambia los datos publica una versión nueva: la app lee el
+paquete, no los JSON sueltos.
+
+Con --tiempos, --memoria o --perfil mide cada fase del build (ver
+instrumentacion.py) y escribe un reporte JSON de la corrida.
 """
-import openpyxl
+import os
+import re
 import json
+import hashlib
+import argparse
+import tempfile
+import threading
+import time
+import bisect
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from collections import deque
 from pathlib import Path
 
+import openpyxl
+
+from indice_busqueda import build_search_index, fold
+from horarios import (SCHEDULE_SHEET, ScheduleError, build_agenda, clock_minutes, default_slots,
+                      parse_schedule_sheet, print_issues, validate)
+import formato_compacto
+import instrumentacion
+
 BASE = Path(__file__).resolve().parent.parent
 EXCEL_PATH = BASE / "webapp" / "Programa" / "Estructura del programa Convencion RT.xlsx"
 SPEAKERS_OUT = BASE / "webapp" / "data" / "speakers.json"
 AGENDA_OUT = BASE / "webapp" / "data" / "agenda.json"
-
-def main():
-    wb = openpyxl.load_workbook(str(EXCEL_PATH), data_only=True)
-    ws = wb["Sheet1"]
-
-    grid = []
-    for row in ws.iter_rows(min_row=1, max_row=80, max_col=8, values_only=True):
-        grid.append([str(c).strip() if c else "" for c in row])
-
-    # Parse speakers
-    speakers = []
-    speaker_id = 0
-    seen_names = set()
+SEARCH_INDEX_OUT = BASE / "webapp" / "data" / "speakers-index.json"
+AGENDA_INDEX_OUT = BASE / "webapp" / "data" / "agenda-index.json"
+AGENDA_INDEX_VERSION = 1
+# Qué datos se publicaron en formato compacto; app.js lo lee en vez de probar
+DATA_FORMATS_OUT = BASE / "webapp" / "data" / "formatos.json"
+# Estado del modo incremental (hash del Excel y de cada registro generado)
+STATE_PATH = BASE / "scripts" / ".actualizar_datos.state.json"
+STATE_VERSION = 1
+# Campos que no vienen del Excel (se completan después); se conservan al regenerar
+CARRIED_FIELDS = ("photo", "photoSet", "institution", "bio")
+OUTPUTS = (SPEAKERS_OUT, AGENDA_OUT, SEARCH_INDEX_OUT, AGENDA_INDEX_OUT, DATA_FORMATS_OUT)
+# Salidas del modo --compacto (cada una con hermanos .gz/.br)
+COMPACT_OUTPUTS = {
+    SPEAKERS_OUT: BASE / "webapp" / "data" / "speakers.compact.json",
+    AGENDA_OUT: BASE / "webapp" / "data" / "agenda.compact.json",
+}
+# Modo --eventos: una carpeta por evento más el registro común de expositores
+EVENTS_OUT = BASE / "webapp" / "data" / "eventos"
+EVENTS_INDEX_NAME = "eventos.json"
+REGISTRY_NAME = "speakers-registry.json"
+
+AREA_MAP = {"MAMA": "mama", "NEURO": "neuro", "PULMON": "pulmon", "PROSTATA": "prostata"}
+SKIP_NAMES = {"n/a", "no corresponde", "invitado brainlab", "equipo diagnostico",
+              "equipo diagnóstico", "", "se elimina", "imagenologa hb",
+              "endoscopista hospital maciel"}
+# Columnas de casos del formato original (E:H), usadas si no aparece la fila "Caso N"
+DEFAULT_CASE_COLS = (4, 5, 6, 7)
+CASE_HEADER_RE = re.compile(r"^caso\s*\d+$", re.IGNORECASE)
+
+
+def speaker_key(name):
+    """Normalized name used to dedupe speakers across rows and areas."""
+    return name.lower().replace(" ", "")
+
+
+def open_workbook(path):
+    """Open the workbook in openpyxl's read-only mode.
+
+    Rows are then streamed from the XML parts instead of building the whole
+    workbook in memory.
+    """
+    return openpyxl.load_workbook(str(path), read_only=True, data_only=True)
+
+
+def sheet_rows(wb, sheet="Sheet1"):
+    """Yield the rows of an open workbook's sheet lazily as lists of stripped strings.
+
+    The extent is whatever the sheet actually contains; no fixed row/column
+    window is applied.
+    """
+    for row in wb[sheet].iter_rows(values_only=True):
+        yield [str(c).strip() if c else "" for c in row]
+
+
+def parse_program(rows):
+    """Parse speakers, moderators, case types and case speakers in a single pass.
+
+    ``rows`` can be any iterable of row lists (see ``sheet_rows``).
+    Only the last two specialty cells are kept for the lookback, so memory
+    does not grow with the number of rows. ``case_speakers`` maps an area
+    and case number to the ids of the speakers listed in that case column.
+    """
+    mentions = []
     current_area = ""
-    area_map = {"MAMA": "mama", "NEURO": "neuro", "PULMON": "pulmon", "PROSTATA": "prostata"}
-    skip_names = {"n/a", "no corresponde", "invitado brainlab", "equipo diagnostico",
-                  "equipo diagnóstico", "", "se elimina", "imagenologa hb",
-                  "endoscopista hospital maciel"}
     moderators = {}
     case_types = {}
+    case_cols = DEFAULT_CASE_COLS
+    prev_specialties = deque(maxlen=2)
+
+    for row in rows:
+        if case_cols is DEFAULT_CASE_COLS:
+            header_cols = tuple(c for c, v in enumerate(row) if CASE_HEADER_RE.match(v))
+            if header_cols:
+                case_cols = header_cols
+
+        width = max(case_cols[-1] + 1, 4)
+        if len(row) < width:
+            row = list(row) + [""] * (width - len(row))
 
-    for i, row in enumerate(grid):
-        if row[1] in area_map:
-            current_area = area_map[row[1]]
+        if row[1] in AREA_MAP:
+            current_area = AREA_MAP[row[1]]
             mod_text = row[2]
             if "Moderador" in mod_text:
                 mod_name = mod_text.split(")")[-1].strip()
                 if " con apoyo de " in mod_name:
                     mod_name = mod_name.split(" con apoyo de ")[0].strip()
                 moderators[current_area] = mod_name
+            prev_specialties.appendleft(row[2])
             continue
 
-        if row[3].strip().lower() == "tipo" and current_area:
-            case_types[current_area] = [row[4], row[5], row[6], row[7] if len(row) > 7 else ""]
+        label = row[3].strip().lower()
 
-        if row[3].strip().lower() == "nombre" and current_area:
+        if label == "tipo" and current_area:
+            case_types[current_area] = [row[col] for col in case_cols]
+
+        if label == "nombre" and current_area:
             specialty = row[2].strip()
             if not specialty:
-                for j in range(i - 1, max(i - 3, 0), -1):
-                    if grid[j][2].strip():
-                        specialty = grid[j][2].strip()
-                        break
+                specialty = next((s for s in prev_specialties if s), "")
 
-            for col in range(4, min(8, len(row))):
+            for case_num, col in enumerate(case_cols, 1):
                 names_str = row[col]
                 if not names_str:
                     continue
                 for name in names_str.split("/"):
                     name = name.strip().replace("  ", " ")
-                    if name.lower().strip() in skip_names or len(name) < 3:
+                    if name.lower().strip() in SKIP_NAMES or len(name) < 3:
                         continue
                     if "(opcion" in name.lower():
                         name = name.split("(")[0].strip()
-                    key = name.lower().replace(" ", "")
-                    if key in seen_names:
-                        continue
-                    seen_names.add(key)
-                    speaker_id += 1
-                    speakers.append({
-                        "id": f"speaker-{speaker_id:03d}",
-                        "name": name,
-                        "specialty": specialty,
-                        "institution": "",
-                        "area": current_area,
-                        "photo": "",
-                        "bio": ""
-                    })
+                    mentions.append((name, specialty, current_area, case_num))
+
+        prev_specialties.appendleft(row[2].strip())
+
+    with instrumentacion.phase("speaker dedupe"):
+        speakers, case_speakers = dedupe_speakers(mentions, moderators)
+    return speakers, moderators, case_types, case_speakers
+
+
+def dedupe_speakers(mentions, moderators):
+    """Speakers and case speakers from the (name, specialty, area, case) mentions.
+
+    Ids follow the order of first mention; moderators not mentioned in any
+    case are added at the end.
+    """
+    speakers = []
+    speaker_id = 0
+    seen_names = {}
+    case_speakers = {}
+    # (area, case, id) already listed, so repeated mentions are O(1) to skip
+    listed = set()
+    for name, specialty, area, case_num in mentions:
+        key = speaker_key(name)
+        if key not in seen_names:
+            speaker_id += 1
+            seen_names[key] = f"speaker-{speaker_id:03d}"
+            speakers.append({
+                "id": seen_names[key],
+                "name": name,
+                "specialty": specialty,
+                "institution": "",
+                "area": area,
+                "photo": "",
+                "bio": ""
+            })
+        if (area, case_num, seen_names[key]) not in listed:
+            listed.add((area, case_num, seen_names[key]))
+            case_speakers.setdefault(area, {}).setdefault(case_num, []).append(seen_names[key])
 
     # Add moderators
     for area, name in moderators.items():
-        key = name.lower().replace(" ", "")
+        key = speaker_key(name)
         if key not in seen_names:
-            seen_names.add(key)
             speaker_id += 1
+            seen_names[key] = f"speaker-{speaker_id:03d}"
             speakers.append({
-                "id": f"speaker-{speaker_id:03d}",
+                "id": seen_names[key],
                 "name": name,
                 "specialty": "Moderador",
                 "institution": "RT International Institute",
@@ -93,125 +203,635 @@ def main():
                 "bio": ""
             })
 
-    with open(str(SPEAKERS_OUT), "w", encoding="utf-8") as f:
-        json.dump(speakers, f, ensure_ascii=False, indent=2)
-    print(f"speakers.json: {len(speakers)} speakers")
-
-    # Build agenda
-    area_labels = {"mama": "Mama", "neuro": "Neuro", "pulmon": "Pulmón", "prostata": "Próstata"}
-
-    def make_session(time, end, area, room, title, moderator=None, desc=None):
-        s = {"time": time, "end": end, "area": area, "room": room, "title": title, "speakers": []}
-        if moderator:
-            s["moderator"] = moderator
-        if desc:
-            s["description"] = desc
-        return s
-
-    def case_title(area, num, cases):
-        idx = num - 1
-        desc = cases[idx] if len(cases) > idx and cases[idx] else ""
-        if desc == "SE ELIMINA":
-            desc = "Por confirmar"
-        label = area_labels.get(area, area)
-        if desc:
-            return f"Caso {num} — {label}: {desc}"
-        return f"Caso {num} — {label}"
-
-    day1 = []
-    day2 = []
-
-    # Day 1
-    day1.append(make_session("08:30", "09:00", "mama", "Salón Principal",
-                             "Apertura y bienvenida",
-                             desc="Palabras de bienvenida y presentación del formato."))
-
-    for area in ["mama", "neuro"]:
-        room = "Sala A" if area == "mama" else "Sala B"
-        cases = case_types.get(area, [])
-        day1.append(make_session("09:00", "10:15", area, room,
-                                 case_title(area, 1, cases),
-                                 moderator=moderators.get(area, "")))
-
-    day1.append(make_session("10:15", "10:45", "mama", "Foyer", "Coffee break"))
-
-    for area in ["pulmon", "prostata"]:
-        room = "Sala A" if area == "pulmon" else "Sala B"
-        cases = case_types.get(area, [])
-        day1.append(make_session("10:45", "12:00", area, room,
-                                 case_title(area, 1, cases),
-                                 moderator=moderators.get(area, "")))
-
-    day1.append(make_session("12:00", "13:30", "mama", "Restaurante", "Almuerzo"))
-
-    for area in ["mama", "neuro"]:
-        room = "Sala A" if area == "mama" else "Sala B"
-        cases = case_types.get(area, [])
-        day1.append(make_session("13:30", "14:45", area, room,
-                                 case_title(area, 2, cases),
-                                 moderator=moderators.get(area, "")))
-
-    day1.append(make_session("14:45", "15:15", "mama", "Foyer", "Coffee break"))
-
-    for area in ["pulmon", "prostata"]:
-        room = "Sala A" if area == "pulmon" else "Sala B"
-        cases = case_types.get(area, [])
-        day1.append(make_session("15:15", "16:30", area, room,
-                                 case_title(area, 2, cases),
-                                 moderator=moderators.get(area, "")))
-
-    day1.append(make_session("20:00", "23:00", "mama", "Por confirmar",
-                             "Cena de la Convención",
-                             desc="Cena formal de networking para todos los asistentes."))
-
-    # Day 2
-    for area in ["mama", "neuro"]:
-        room = "Sala A" if area == "mama" else "Sala B"
-        cases = case_types.get(area, [])
-        day2.append(make_session("09:00", "10:15", area, room,
-                                 case_title(area, 3, cases),
-                                 moderator=moderators.get(area, "")))
-
-    day2.append(make_session("10:15", "10:45", "mama", "Foyer", "Coffee break"))
-
-    for area in ["pulmon", "prostata"]:
-        room = "Sala A" if area == "pulmon" else "Sala B"
-        cases = case_types.get(area, [])
-        day2.append(make_session("10:45", "12:00", area, room,
-                                 case_title(area, 3, cases),
-                                 moderator=moderators.get(area, "")))
-
-    day2.append(make_session("12:00", "13:30", "mama", "Restaurante", "Almuerzo"))
-
-    for area in ["mama", "neuro"]:
-        room = "Sala A" if area == "mama" else "Sala B"
-        cases = case_types.get(area, [])
-        day2.append(make_session("13:30", "14:45", area, room,
-                                 case_title(area, 4, cases),
-                                 moderator=moderators.get(area, "")))
-
-    day2.append(make_session("14:45", "15:15", "mama", "Foyer", "Coffee break"))
-
-    for area in ["pulmon", "prostata"]:
-        room = "Sala A" if area == "pulmon" else "Sala B"
-        cases = case_types.get(area, [])
-        day2.append(make_session("15:15", "16:30", area, room,
-                                 case_title(area, 4, cases),
-                                 moderator=moderators.get(area, "")))
-
-    day2.append(make_session("16:30", "17:00", "mama", "Salón Principal",
-                             "Cierre y conclusiones",
-                             desc="Síntesis de las discusiones y próximos pasos."))
-
-    agenda = [
-        {"day": 1, "date": "2026-03-13", "sessions": day1},
-        {"day": 2, "date": "2026-03-14", "sessions": day2}
-    ]
-
-    with open(str(AGENDA_OUT), "w", encoding="utf-8") as f:
-        json.dump(agenda, f, ensure_ascii=False, indent=2)
-    print(f"agenda.json: {len(day1)} + {len(day2)} sessions")
+    return speakers, case_speakers
+
+
+def carry_forward(speakers, path):
+    """Keep the CARRIED_FIELDS of the speakers already in ``path``, matched by name.
+
+    The workbook has no photos, institutions or bios: they are filled in
+    afterwards (by hand, and the photoSet manifest by optimizar_fotos.py),
+    so a rebuild must not blank them. A value the sheet does give wins.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            previous = {speaker_key(s.get("name", "")): s for s in json.load(f)}
+    except (OSError, ValueError):
+        return speakers
+    for speaker in speakers:
+        old = previous.get(speaker_key(speaker["name"]))
+        if old is None:
+            continue
+        for field in CARRIED_FIELDS:
+            if old.get(field) and not speaker.get(field):
+                speaker[field] = old[field]
+    return speakers
+
+
+def build_agenda_index(agenda):
+    """Lookup tables derived from ``agenda`` for the app.
+
+    Times are minutes from local midnight of the first date (``base``), so
+    the app turns ``now`` into the same unit once and binary-searches
+    ``start``. Slots are sorted by start time, ties in agenda order.
+    ``maxEnd[i]`` is the latest end among slots ``0..i``: scanning back from
+    ``now`` for running sessions stops as soon as it drops below ``now``.
+    ``day``/``session`` point back into agenda.json and ``key`` is the
+    ``sessionKey()`` of each slot. ``speakers`` maps a speaker id to the
+    slots that list it in ``speakers``.
+    """
+    dated = [day for day in agenda if day.get("date")]
+    if not dated:
+        return {"version": AGENDA_INDEX_VERSION, "base": None, "slots": {}, "speakers": {}}
+    base = min(date.fromisoformat(day["date"]) for day in dated)
+
+    rows = []
+    for day_pos, day in enumerate(agenda):
+        if not day.get("date"):
+            continue
+        offset = (date.fromisoformat(day["date"]) - base).days * 24 * 60
+        for session_pos, session in enumerate(day.get("sessions", [])):
+            try:
+                start = offset + clock_minutes(session["time"])
+                end = offset + clock_minutes(session["end"])
+            except (KeyError, ValueError):
+                continue
+            rows.append((start, day_pos, session_pos, end, session_key(session, day["date"]),
+                         session.get("speakers") or []))
+    rows.sort(key=lambda row: row[:3])
+
+    max_end = []
+    speakers = {}
+    for slot, (start, _, _, end, _, ids) in enumerate(rows):
+        max_end.append(max(end, max_end[-1]) if max_end else end)
+        for speaker_id in dict.fromkeys(ids):
+            speakers.setdefault(speaker_id, []).append(slot)
+
+    return {
+        "version": AGENDA_INDEX_VERSION,
+        "base": base.isoformat(),
+        "slots": {
+            "start": [row[0] for row in rows],
+            "end": [row[3] for row in rows],
+            "maxEnd": max_end,
+            "day": [row[1] for row in rows],
+            "session": [row[2] for row in rows],
+            "key": [row[4] for row in rows],
+        },
+        "speakers": speakers,
+    }
+
+
+def current_and_next(index, minute):
+    """Slots running at ``minute`` and the first one starting after it.
+
+    Same lookup app.js does with the table; used to check it from Python.
+    """
+    slots = index["slots"]
+    upcoming = bisect.bisect_right(slots.get("start", []), minute)
+    running = []
+    for slot in range(upcoming - 1, -1, -1):
+        if slots["maxEnd"][slot] < minute:
+            break
+        if slots["end"][slot] >= minute:
+            running.append(slot)
+    return sorted(running), (upcoming if upcoming < len(slots.get("start", [])) else None)
+
+
+def file_hash(path):
+    """SHA-256 of a file, read in chunks."""
+    h = hashlib.sha256()
+    with open(str(path), "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def record_hash(record):
+    """Stable short hash of a JSON-serializable record."""
+    raw = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def session_key(session, date):
+    """Same key as ``sessionKey()`` in app.js."""
+    return f"{date}|{session['time']}|{session['title']}"
+
+
+def record_hashes(speakers, agenda):
+    """Per-record hashes as ``{kind: {key: [hash, label]}}``.
+
+    Speaker ids are positional, so they are left out of the hash; otherwise
+    inserting one speaker would report every later one as modified.
+    """
+    return {
+        "speakers": {speaker_key(s["name"]): [record_hash({k: v for k, v in s.items() if k != "id"}), s["name"]]
+                     for s in speakers},
+        "sessions": {session_key(s, day["date"]): [record_hash(s), s["title"]]
+                     for day in agenda for s in day["sessions"]},
+    }
+
+
+def diff_records(old, new):
+    """Compare two ``{key: [hash, label]}`` maps -> added/removed/modified labels."""
+    return {
+        "added": [new[k][1] for k in new if k not in old],
+        "removed": [old[k][1] for k in old if k not in new],
+        "modified": [new[k][1] for k in new if k in old and old[k][0] != new[k][0]],
+    }
+
+
+def dump_json(data):
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def dump_json_compact(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def current_umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def write_if_changed(path, text):
+    """Atomically replace ``path`` with ``text`` unless it already has that content.
+
+    The new content goes to a temporary file in the same directory and is
+    moved into place with ``os.replace``, so readers never see a partial file.
+    Returns True when the file was rewritten.
+    """
+    path = Path(path)
+    data = text.encode("utf-8")
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return False
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates the file as 0600; keep the mode a plain open() would give
+        os.chmod(tmp, path.stat().st_mode & 0o777 if path.exists() else 0o666 & ~current_umask())
+        os.replace(tmp, str(path))
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return True
+
+
+def load_state(path):
+    try:
+        with open(str(path), encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if state.get("version") == STATE_VERSION else {}
+
+
+def outputs_unchanged(state, outputs):
+    """True if every output still has the hash recorded in the state file."""
+    recorded = state.get("outputs", {})
+    for path in outputs:
+        path = Path(path)
+        if not path.exists() or recorded.get(path.name) != file_hash(path):
+            return False
+    return True
+
+
+def print_changes(kind, changes):
+    for status in ("added", "removed", "modified"):
+        for label in changes[status]:
+            print(f"  {kind} {status}: {label}")
+
+
+def output_paths(compact):
+    return OUTPUTS + (tuple(COMPACT_OUTPUTS.values()) if compact else ())
+
+
+def kb(size):
+    return f"{size / 1024:.1f} KB"
+
+
+def write_compact(source, data):
+    """Write the compact encoding of ``data`` next to ``source`` and report sizes."""
+    path = COMPACT_OUTPUTS[source]
+    text = dump_json_compact(formato_compacto.encode(data))
+    if write_if_changed(path, text) or not Path(str(path) + ".gz").exists():
+        sizes = formato_compacto.write_compressed_siblings(path)
+    else:
+        sizes = {enc: Path(f"{path}.{ext}").stat().st_size
+                 for enc, ext in (("gzip", "gz"), ("br", "br")) if Path(f"{path}.{ext}").exists()}
+    compressed = ", ".join(f"{enc} {kb(size)}" for enc, size in sizes.items())
+    print(f"{path.name}: {Path(source).name} {kb(Path(source).stat().st_size)} -> "
+          f"compacto {kb(len(text.encode('utf-8')))} ({compressed})")
+
+
+def remove_compact():
+    """Drop compact files left by an earlier --compacto build, so they never go stale."""
+    for path in COMPACT_OUTPUTS.values():
+        for stale in (path, Path(str(path) + ".gz"), Path(str(path) + ".br")):
+            if stale.exists():
+                stale.unlink()
+                print(f"{stale.name}: eliminado (build sin --compacto)")
+
+
+def data_formats(compact):
+    """The manifest telling app.js which datasets have a compact file."""
+    return {"compact": sorted(Path(source).stem for source in COMPACT_OUTPUTS) if compact else []}
+
+
+def write_derived(speakers, agenda, compact=False):
+    """Write the indexes and, with ``compact``, the compact encodings.
+
+    The formats manifest is written after the compact files appear and
+    before they are removed, so it never lists a file that is missing.
+    """
+    write_index(SEARCH_INDEX_OUT, build_search_index(speakers))
+    write_index(AGENDA_INDEX_OUT, build_agenda_index(agenda))
+    formats = dump_json_compact(data_formats(compact))
+    if compact:
+        write_compact(SPEAKERS_OUT, speakers)
+        write_compact(AGENDA_OUT, agenda)
+        write_if_changed(DATA_FORMATS_OUT, formats)
+    else:
+        write_if_changed(DATA_FORMATS_OUT, formats)
+        remove_compact()
+
+
+def load_schedule(wb):
+    """Slots of the open workbook's schedule sheet, or the default grid if it has none."""
+    if SCHEDULE_SHEET not in wb.sheetnames:
+        return default_slots()
+    return parse_schedule_sheet(instrumentacion.timed_iter("workbook load", sheet_rows(wb, SCHEDULE_SHEET)))
+
+
+def parse_workbook(path):
+    """Speakers, agenda, moderators and schedule issues of one program workbook.
+
+    The workbook is opened once for both the program and the schedule sheet.
+    """
+    with instrumentacion.phase("workbook load"):
+        wb = open_workbook(path)
+    try:
+        with instrumentacion.phase("grid parse"):
+            rows = instrumentacion.timed_iter("workbook load", sheet_rows(wb))
+            speakers, moderators, case_types, case_speakers = parse_program(rows)
+        with instrumentacion.phase("agenda build"):
+            agenda = build_agenda(load_schedule(wb), moderators, case_types, case_speakers)
+    finally:
+        wb.close()
+    with instrumentacion.phase("schedule validate"):
+        issues = validate(agenda, {s["id"]: s["name"] for s in speakers})
+    return speakers, agenda, moderators, issues
+
+
+def build(state, state_path=None, compact=False, strict=False):
+    """Regenerate the outputs if the workbook or the outputs changed.
+
+    ``state`` is the previous state dict (empty for a full build). Returns it
+    unchanged when there is nothing to do, otherwise the new state, which is
+    also saved to ``state_path`` if given. Everything is parsed, validated
+    and serialized before the first write, so a parse error (or, with
+    ``strict``, a schedule conflict) leaves the previous JSON files untouched.
+    """
+    with instrumentacion.phase("workbook hash"):
+        workbook_hash = file_hash(EXCEL_PATH)
+    outputs = output_paths(compact)
+    if (state.get("workbook") == workbook_hash and state.get("compact", False) == compact
+            and outputs_unchanged(state, outputs)):
+        return state
+
+    speakers, agenda, moderators, issues = parse_workbook(EXCEL_PATH)
+    carry_forward(speakers, SPEAKERS_OUT)
+    print_issues(issues)
+    if strict and any(issue["severity"] == "error" for issue in issues):
+        raise ScheduleError("la agenda tiene conflictos")
+    instrumentacion.count(speakers=len(speakers), sessions=sum(len(day["sessions"]) for day in agenda))
+    with instrumentacion.phase("JSON write"):
+        speakers_text, agenda_text = dump_json(speakers), dump_json(agenda)
+
+        written = write_if_changed(SPEAKERS_OUT, speakers_text)
+        print(f"speakers.json: {len(speakers)} speakers{'' if written else ' (sin cambios)'}")
+        written = write_if_changed(AGENDA_OUT, agenda_text)
+        counts = " + ".join(str(len(day["sessions"])) for day in agenda)
+        print(f"agenda.json: {counts} sessions{'' if written else ' (sin cambios)'}")
+        write_derived(speakers, agenda, compact)
     print(f"Moderadores: {moderators}")
+    republish_bundle()
+
+    hashes = record_hashes(speakers, agenda)
+    if state:
+        for kind, label in (("speakers", "speaker"), ("sessions", "session")):
+            print_changes(label, diff_records(state.get(kind, {}), hashes[kind]))
+
+    new_state = {
+        "version": STATE_VERSION,
+        "workbook": workbook_hash,
+        "compact": compact,
+        "outputs": {Path(p).name: file_hash(p) for p in outputs},
+        **hashes,
+    }
+    if state_path:
+        write_if_changed(state_path, json.dumps(new_state, ensure_ascii=False))
+    return new_state
+
+
+def republish_bundle():
+    """Publish a new data bundle version if one was published and the data changed.
+
+    Once publicar_datos.py has run, the app reads the bundle, not the plain
+    JSON files, so a rebuild would otherwise stay invisible to clients.
+    """
+    import publicar_datos
+    latest = publicar_datos.load_latest()
+    if latest is None:
+        return False
+    with instrumentacion.phase("bundle publish"):
+        if latest["hash"] == publicar_datos.content_hash(publicar_datos.load_datasets()):
+            return False
+        publicar_datos.publish()
+    return True
+
+
+def write_index(path, index):
+    """Write a derived index as compact JSON; returns True if it changed."""
+    text = dump_json_compact(index)
+    written = write_if_changed(path, text)
+    print(f"{Path(path).name}: {len(text.encode('utf-8')) / 1024:.1f} KB"
+          f"{'' if written else ' (sin cambios)'}")
+    return written
+
+
+def start_watcher(paths, on_change, interval=0.2):
+    """Call ``on_change()`` whenever one of ``paths`` is created, modified,
+    moved into place or deleted. Returns a function that stops watching.
+
+    Uses watchdog's native notifications when installed and falls back to
+    polling ``os.stat`` every ``interval`` seconds otherwise. Whole
+    directories are watched so Excel's save sequence (write temp file,
+    rename over the original) is seen as a change of the workbook itself.
+    """
+    targets = {str(Path(p).resolve()) for p in paths}
+
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        Observer = None
+
+    if Observer is not None:
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                for p in (event.src_path, getattr(event, "dest_path", "")):
+                    if p and os.path.abspath(p) in targets:
+                        on_change()
+                        return
+
+        observer = Observer()
+        for folder in {os.path.dirname(t) for t in targets}:
+            observer.schedule(Handler(), folder, recursive=False)
+        observer.start()
+
+        def stop():
+            observer.stop()
+            observer.join()
+        return stop
+
+    def signature():
+        sig = []
+        for t in sorted(targets):
+            try:
+                st = os.stat(t)
+                sig.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                sig.append(None)
+        return sig
+
+    stopped = threading.Event()
+
+    def poll():
+        last = signature()
+        while not stopped.wait(interval):
+            current = signature()
+            if current != last:
+                last = current
+                on_change()
+
+    threading.Thread(target=poll, daemon=True).start()
+    return stopped.set
+
+
+def watch(state, state_path, debounce=0.25, compact=False, strict=False):
+    """Rebuild on every save of the workbook until interrupted.
+
+    Bursts of events are collapsed: the build starts once nothing changed
+    for ``debounce`` seconds. The state stays in memory between builds, and
+    our own writes to the outputs are recognized by their hashes and ignored.
+    """
+    changed = threading.Event()
+    stop = start_watcher((EXCEL_PATH, *output_paths(compact)), changed.set)
+    print(f"Observando {EXCEL_PATH.name} (Ctrl+C para salir)...")
+    try:
+        while True:
+            if not changed.wait(1):
+                continue
+            changed.clear()
+            while changed.wait(debounce):
+                changed.clear()
+            started = time.perf_counter()
+            try:
+                new_state = build(state, state_path, compact, strict)
+            except Exception as exc:
+                # Workbook missing or half-saved: keep the previous JSON and wait
+                print(f"No se pudo regenerar ({type(exc).__name__}: {exc}); se mantienen los JSON anteriores.")
+                continue
+            if new_state is not state:
+                print(f"Regenerado en {time.perf_counter() - started:.2f}s")
+                state = new_state
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop()
+
+
+def event_slug(path):
+    """Data folder name of the event in workbook ``path``."""
+    return re.sub(r"[^a-z0-9]+", "-", fold(Path(path).stem)).strip("-") or "evento"
+
+
+def build_event(job):
+    """Worker: parse one event workbook and write its data folder.
+
+    Returns a summary with the speakers to merge into the registry, or the
+    error, so one broken workbook does not stop the other events.
+    """
+    workbook, out_dir, compact, strict = job
+    started = time.perf_counter()
+    summary = {"event": out_dir.name, "workbook": workbook.name}
+    try:
+        speakers, agenda, _, issues = parse_workbook(workbook)
+    except Exception as exc:
+        return {**summary, "error": f"{type(exc).__name__}: {exc}"}
+    carry_forward(speakers, out_dir / SPEAKERS_OUT.name)
+    errors = [issue["message"] for issue in issues if issue["severity"] == "error"]
+    summary.update({
+        "speakers": [[speaker_key(s["name"]), s["id"], s["name"], s["specialty"], s["area"]] for s in speakers],
+        "sessions": sum(len(day["sessions"]) for day in agenda),
+        "dates": [day["date"] for day in agenda if day.get("date")],
+        "conflicts": errors,
+    })
+    if strict and errors:
+        return {**summary, "error": "la agenda tiene conflictos (--estricto)"}
+
+    with instrumentacion.phase("JSON write"):
+        files = {
+            SPEAKERS_OUT.name: dump_json(speakers),
+            AGENDA_OUT.name: dump_json(agenda),
+            SEARCH_INDEX_OUT.name: dump_json_compact(build_search_index(speakers)),
+            AGENDA_INDEX_OUT.name: dump_json_compact(build_agenda_index(agenda)),
+            DATA_FORMATS_OUT.name: dump_json_compact(data_formats(compact)),
+        }
+        compact_names = []
+        if compact:
+            for source, data in ((SPEAKERS_OUT, speakers), (AGENDA_OUT, agenda)):
+                name = COMPACT_OUTPUTS[source].name
+                files[name] = dump_json_compact(formato_compacto.encode(data))
+                compact_names.append(name)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        written = [name for name, text in files.items() if write_if_changed(out_dir / name, text)]
+        for name in compact_names:
+            if name in written or not (out_dir / (name + ".gz")).exists():
+                formato_compacto.write_compressed_siblings(out_dir / name)
+    summary.update({"written": written, "seconds": time.perf_counter() - started})
+    return summary
+
+
+def merge_registry(summaries):
+    """Cross-event speaker registry keyed by ``speaker_key``.
+
+    Each entry keeps the first spelling of the name, and per event the
+    speaker id there, plus every area and specialty seen.
+    """
+    registry = {}
+    for summary in sorted(summaries, key=lambda s: s["event"]):
+        for key, speaker_id, name, specialty, area in summary.get("speakers", []):
+            entry = registry.setdefault(key, {"name": name, "events": {}, "areas": [], "specialties": []})
+            entry["events"][summary["event"]] = speaker_id
+            if area and area not in entry["areas"]:
+                entry["areas"].append(area)
+            if specialty and specialty not in entry["specialties"]:
+                entry["specialties"].append(specialty)
+    return dict(sorted(registry.items()))
+
+
+def build_events(workbooks_dir, out_root=EVENTS_OUT, compact=False, strict=False, workers=None):
+    """Build every workbook in ``workbooks_dir`` concurrently; returns the summaries."""
+    workbooks = sorted(p for p in Path(workbooks_dir).glob("*.xlsx") if not p.name.startswith("~$"))
+    if not workbooks:
+        print(f"No hay Excels en {workbooks_dir}")
+        return []
+    slugs = {}
+    for workbook in workbooks:
+        slugs.setdefault(event_slug(workbook), []).append(workbook.name)
+    repeated = {slug: names for slug, names in slugs.items() if len(names) > 1}
+    if repeated:
+        raise ValueError(f"Excels con el mismo nombre de evento: {repeated}")
+
+    started = time.perf_counter()
+    jobs = [(workbook, Path(out_root) / event_slug(workbook), compact, strict) for workbook in workbooks]
+    summaries = []
+    # One process per core, not per event: extra workbooks wait for a free worker
+    with ProcessPoolExecutor(max_workers=workers, **instrumentacion.pool_options()) as pool:
+        futures = [pool.submit(instrumentacion.call_in_worker, build_event, job) for job in jobs]
+        for future in as_completed(futures):
+            summary, phases = future.result()
+            instrumentacion.merge(phases)
+            summaries.append(summary)
+            if "error" in summary:
+                print(f"{summary['event']}: ERROR {summary['error']}")
+                continue
+            conflicts = f", {len(summary['conflicts'])} conflictos de agenda" if summary["conflicts"] else ""
+            print(f"{summary['event']}: {len(summary['speakers'])} speakers, {summary['sessions']} sesiones"
+                  f"{conflicts} ({len(summary['written'])} archivos escritos, {summary['seconds']:.2f}s)")
+
+    ok = [s for s in summaries if "error" not in s]
+    registry = merge_registry(ok)
+    out_root = Path(out_root)
+    out_root.mkdir(parents=True, exist_ok=True)
+    write_if_changed(out_root / REGISTRY_NAME, dump_json(registry))
+    events = [{"event": s["event"], "workbook": s["workbook"], "dates": s["dates"],
+               "speakers": len(s["speakers"]), "sessions": s["sessions"]}
+              for s in sorted(ok, key=lambda s: s["event"])]
+    write_if_changed(out_root / EVENTS_INDEX_NAME, dump_json(events))
+    shared = sum(len(entry["events"]) > 1 for entry in registry.values())
+    print(f"{REGISTRY_NAME}: {len(registry)} expositores, {shared} en más de un evento")
+    print(f"{len(ok)}/{len(summaries)} eventos en {time.perf_counter() - started:.2f}s")
+    instrumentacion.count(events=len(summaries), failed=len(summaries) - len(ok), speakers=len(registry))
+    return summaries
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--incremental", action="store_true",
+                        help="Saltear el parseo si el Excel no cambió y reportar diferencias por registro")
+    parser.add_argument("--watch", action="store_true",
+                        help="Quedar observando el Excel y regenerar los JSON en cada guardado")
+    parser.add_argument("--solo-indice", action="store_true",
+                        help="Regenerar solo los índices (y el formato compacto con --compacto) "
+                             "a partir de los speakers.json y agenda.json actuales")
+    parser.add_argument("--compacto", action="store_true",
+                        help="Escribir también speakers/agenda en formato compacto, con .gz/.br")
+    parser.add_argument("--estricto", action="store_true",
+                        help="No escribir los JSON si la agenda tiene conflictos de salas o personas")
+    parser.add_argument("--eventos", metavar="CARPETA",
+                        help="Procesar en paralelo todos los Excels de CARPETA, uno por evento")
+    parser.add_argument("--salida", default=str(EVENTS_OUT),
+                        help="Con --eventos: carpeta donde va una subcarpeta de datos por evento")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Con --eventos: procesos en paralelo (por defecto, uno por núcleo)")
+    parser.add_argument("--state", default=str(STATE_PATH),
+                        help="Archivo de estado para el modo incremental")
+    instrumentacion.add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with instrumentacion.session("actualizar_datos", args, argv):
+        run(args)
+
+
+def run(args):
+    if args.eventos:
+        summaries = build_events(args.eventos, Path(args.salida), args.compacto, args.estricto, args.workers)
+        if any("error" in summary for summary in summaries):
+            raise SystemExit(1)
+        return
+    if args.solo_indice:
+        with open(SPEAKERS_OUT, encoding="utf-8") as f:
+            speakers = json.load(f)
+        with open(AGENDA_OUT, encoding="utf-8") as f:
+            agenda = json.load(f)
+        write_derived(speakers, agenda, args.compacto)
+        return
+
+    state_path = Path(args.state) if args.incremental or args.watch else None
+    state = load_state(state_path) if state_path else {}
+
+    try:
+        new_state = build(state, state_path, args.compacto, args.estricto)
+    except ScheduleError as exc:
+        print(f"No se escribieron los JSON: {exc}")
+        if not args.watch:
+            raise SystemExit(1)
+        new_state = state
+    else:
+        if new_state is state:
+            print("Sin cambios en el Excel; los JSON generados están al día.")
+
+    if args.watch:
+        watch(new_state, state_path, compact=args.compacto, strict=args.estricto)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,83 @@
+"""
+Benchmark de codigos_arribo.py para un congreso grande.
+
+Con --asistentes claves sintéticas (50.000 por defecto) mide:
+- la firma de los códigos (códigos por segundo),
+- el armado de la tabla de verificación y su tamaño (crudo, en el JSON y
+  comprimido con gzip, que es lo que viaja al teléfono),
+- la búsqueda binaria sobre la tabla empaquetada, igual a la de app.js,
+  con códigos válidos y con códigos falsificados (que no deben pasar),
+- el dibujo de los QR en paralelo (QR por segundo), si está instalado qrcode.
+
+Uso: python scripts/bench_arribos.py [--asistentes 50000] [--qr 2000] [--workers N]
+"""
+import gzip
+import time
+import base64
+import random
+import secrets
+import argparse
+import tempfile
+from pathlib import Path
+
+import codigos_arribo as arribo
+from actualizar_datos import dump_json_compact
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--asistentes", type=int, default=50000)
+    parser.add_argument("--busquedas", type=int, default=100000,
+                        help="Búsquedas de códigos válidos y de códigos falsos")
+    parser.add_argument("--qr", type=int, default=2000, help="Cantidad de QR a dibujar (0 para omitir)")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    n = args.asistentes
+    secret = secrets.token_bytes(32)
+    keys = [f"asistente.{i}@ejemplo.uy" for i in range(n)]
+
+    started = time.perf_counter()
+    codes = [arribo.sign(secret, key) for key in keys]
+    elapsed = time.perf_counter() - started
+    print(f"Firma: {n} códigos en {elapsed:.3f}s ({n / elapsed:,.0f} por segundo)")
+
+    started = time.perf_counter()
+    table = arribo.build_table(codes)
+    text = dump_json_compact(table)
+    elapsed = time.perf_counter() - started
+    packed = base64.b64decode(table["hashes"])
+    zipped = gzip.compress(text.encode("utf-8"), 9)
+    print(f"Tabla: {table['count']} entradas de {table['bytes']} bytes en {elapsed * 1000:.0f} ms; "
+          f"{len(packed) / 1024:.0f} KB crudos, {len(text) / 1024:.0f} KB en JSON, "
+          f"{len(zipped) / 1024:.0f} KB con gzip")
+
+    rng = random.Random(2026)
+    valid = [rng.choice(codes) for _ in range(args.busquedas)]
+    forged = [arribo.sign(secrets.token_bytes(32), rng.choice(keys)) for _ in range(args.busquedas)]
+    width = table["bytes"]
+    for label, sample, expected in (("válidos", valid, True), ("falsos", forged, False)):
+        started = time.perf_counter()
+        results = [arribo.contains(packed, width, code) for code in sample]
+        elapsed = time.perf_counter() - started
+        wrong = sum(result != expected for result in results)
+        print(f"Búsqueda ({label}): {elapsed / len(sample) * 1e6:.2f} µs por código "
+              f"(~{table['count'].bit_length()} comparaciones); "
+              f"{'ok' if not wrong else f'{wrong} RESULTADOS ERRÓNEOS'}")
+
+    if args.qr:
+        if not arribo.qr_available():
+            print('QR: omitido, falta el paquete qrcode (pip install "qrcode[pil]")')
+            return
+        with tempfile.TemporaryDirectory() as tmp:
+            jobs = [(code, str(Path(tmp) / f"{i}.png")) for i, code in enumerate(codes[:args.qr])]
+            started = time.perf_counter()
+            drawn = arribo.render_qrs(jobs, args.workers)
+            elapsed = time.perf_counter() - started
+            size = sum(Path(path).stat().st_size for _, path in jobs) / drawn
+            print(f"QR: {drawn} en {elapsed:.2f}s ({drawn / elapsed:,.0f} por segundo, "
+                  f"{size / 1024:.1f} KB cada uno); 50.000 tomarían ~{50000 / drawn * elapsed:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark del índice de búsqueda de expositores.
+
+Genera miles de expositores sintéticos (nombres con acentos, especialidades,
+instituciones y áreas como las del programa), construye el índice y compara
+cada consulta contra el recorrido lineal que hacía la app en cada tecla,
+verificando que ambos devuelvan exactamente los mismos expositores.
+
+Uso: python scripts/bench_busqueda.py [--speakers 5000] [--queries 400]
+"""
+import gzip
+import json
+import time
+import random
+import argparse
+
+from indice_busqueda import SearchIndex, build_search_index, matches
+
+FIRST_NAMES = ["José", "María", "Agustín", "Lucía", "Martín", "Inés", "Sebastián", "Valentina",
+               "Nicolás", "Sofía", "Andrés", "Mónica", "Joaquín", "Verónica", "Raúl", "Ana",
+               "Federico", "Natalia", "Emiliano", "Cecilia", "Germán", "Florencia"]
+LAST_NAMES = ["González", "Rodríguez", "Fernández", "Pérez", "Martínez", "Gómez", "Suárez",
+              "Núñez", "Ibáñez", "Castro", "Rosich", "Lorenzo", "Ferreira", "Aguiar", "Rivero",
+              "Gadea", "Olivera", "Acosta", "Benítez", "Cabrera", "Méndez", "Sosa"]
+SPECIALTIES = ["Radiooncólogo", "Físico Médico", "Tecnólogo", "Cirujano de Tórax",
+               "Neurocirujano", "Mastólogo", "Urólogo", "Oncólogo Médico", "Imagenólogo",
+               "Patólogo", "Moderador"]
+INSTITUTIONS = ["RT International Institute", "Hospital de Clínicas", "Hospital Maciel",
+                "Instituto Nacional del Cáncer", "Hospital Británico", "CASMU", "Médica Uruguaya", ""]
+AREAS = ["mama", "neuro", "pulmon", "prostata"]
+
+
+def synthetic_speakers(n, rng):
+    return [{
+        "id": f"speaker-{i + 1:05d}",
+        "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "specialty": rng.choice(SPECIALTIES),
+        "institution": rng.choice(INSTITUTIONS),
+        "area": rng.choice(AREAS),
+    } for i in range(n)]
+
+
+def synthetic_queries(speakers, n, rng):
+    """Keystroke-like prefixes and fragments of real values, plus misses."""
+    queries = []
+    while len(queries) < n:
+        speaker = rng.choice(speakers)
+        value = speaker[rng.choice(["name", "name", "specialty", "institution"])] or speaker["name"]
+        kind = rng.random()
+        if kind < 0.6:
+            # Typing a name or specialty, one prefix per keystroke
+            word = rng.choice(value.split())
+            queries.extend(word[:k] for k in range(1, len(word) + 1))
+        elif kind < 0.9:
+            start = rng.randrange(len(value))
+            queries.append(value[start:start + rng.randint(3, 8)].lower())
+        else:
+            queries.append(rng.choice(["zzz", "xqw", "Kowalski", "dermato"]))
+    return queries[:n]
+
+
+def linear_search(speakers, term):
+    return [i for i, speaker in enumerate(speakers) if matches(speaker, term)]
+
+
+def timed(fn, queries):
+    started = time.perf_counter()
+    results = [fn(q) for q in queries]
+    return time.perf_counter() - started, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--speakers", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=2026)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    speakers = synthetic_speakers(args.speakers, rng)
+    queries = synthetic_queries(speakers, args.queries, rng)
+
+    started = time.perf_counter()
+    index = build_search_index(speakers)
+    build_time = time.perf_counter() - started
+    raw = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    print(f"{len(speakers)} expositores, {len(index['postings'])} fragmentos indexados")
+    print(f"Índice: {build_time * 1000:.0f} ms, {len(raw) / 1024:.0f} KB "
+          f"({len(gzip.compress(raw)) / 1024:.0f} KB gzip)")
+
+    linear_time, expected = timed(lambda q: linear_search(speakers, q), queries)
+    searcher = SearchIndex(json.loads(raw), speakers)
+    index_time, got = timed(searcher.search, queries)
+    mismatches = sum(a != b for a, b in zip(expected, got))
+
+    per_query = 1e6 / len(queries)
+    print(f"{len(queries)} consultas")
+    print(f"  recorrido lineal: {linear_time * per_query:8.0f} µs/consulta")
+    print(f"  índice:           {index_time * per_query:8.0f} µs/consulta "
+          f"({linear_time / index_time:.1f}x)")
+    print(f"  resultados distintos: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
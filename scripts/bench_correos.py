@@ -0,0 +1,219 @@
+"""
+Benchmark de combinar_correos.py, con un servidor SMTP de prueba local.
+
+Genera un CSV sintético de asistentes y mide:
+- el render a mbox (mensajes por minuto y pico de memoria de Python),
+- la reanudación: corta a la mitad, deja un mensaje a medio escribir y
+  verifica que la segunda corrida complete el mbox sin repetidos,
+- el envío por SMTP con el pool de conexiones contra el servidor de
+  prueba, con una fracción de rechazos temporales para ejercitar los
+  reintentos, verificando que cada destinatario reciba un solo mensaje,
+- el límite de mensajes por segundo.
+
+Con --servidor PUERTO solo levanta el servidor de prueba (acepta y cuenta
+los mensajes, sin entregarlos), para probar combinar_correos.py --smtp.
+
+Uso: python scripts/bench_correos.py [--destinatarios 20000] [--conexiones 8]
+     python scripts/bench_correos.py --servidor 2525
+"""
+import csv
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import combinar_correos as correo
+
+FIRST_NAMES = ["José", "María", "Agustín", "Lucía", "Martín", "Inés", "Sebastián", "Valentina",
+               "Nicolás", "Sofía", "Andrés", "Mónica", "Joaquín", "Verónica", "Raúl", "Ana"]
+LAST_NAMES = ["González", "Rodríguez", "Fernández", "Pérez", "Martínez", "Gómez", "Suárez",
+              "Núñez", "Ibáñez", "Castro", "Olivera", "Acosta", "Benítez", "Cabrera"]
+SPECIALTIES = ["Radiooncólogo", "Físico Médico", "Tecnólogo", "Oncólogo Médico", "Urólogo"]
+AREAS = ["Mama", "Pulmón", "Próstata", "Neuro", ""]
+
+
+class SmtpStandIn:
+    """Local SMTP server that accepts and counts messages without delivering them.
+
+    With ``fail_rate`` it answers that fraction of MAIL commands with a
+    temporary 451, like a busy relay.
+    """
+
+    def __init__(self, fail_rate=0.0, seed=0):
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.received = {}
+        self.rejected = 0
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        writer.write(b"220 standin ESMTP\r\n")
+        recipient, failing = None, False
+        try:
+            while line := await reader.readline():
+                verb = line[:4].upper()
+                if verb == b"EHLO":
+                    writer.write(b"250-standin\r\n250-PIPELINING\r\n250-8BITMIME\r\n250 AUTH PLAIN\r\n")
+                elif verb in (b"HELO", b"RSET", b"NOOP"):
+                    recipient, failing = None, False
+                    writer.write(b"250 OK\r\n")
+                elif verb == b"AUTH":
+                    writer.write(b"235 OK\r\n")
+                elif verb == b"MAIL":
+                    failing = self.rng.random() < self.fail_rate
+                    if failing:
+                        self.rejected += 1
+                    writer.write(b"451 intente mas tarde\r\n" if failing else b"250 OK\r\n")
+                elif verb == b"RCPT":
+                    recipient = line[line.index(b"<") + 1:line.rindex(b">")].decode()
+                    writer.write(b"503 sin MAIL\r\n" if failing else b"250 OK\r\n")
+                elif verb == b"DATA":
+                    if failing or recipient is None:
+                        writer.write(b"503 sin RCPT\r\n")
+                        continue
+                    writer.write(b"354 adelante\r\n")
+                    size = 0
+                    while (data := await reader.readline()) != b".\r\n":
+                        if not data:
+                            return
+                        size += len(data)
+                    self.received[recipient] = self.received.get(recipient, 0) + 1
+                    writer.write(b"250 OK recibido\r\n")
+                    recipient = None
+                elif verb == b"QUIT":
+                    writer.write(b"221 chau\r\n")
+                    break
+                else:
+                    writer.write(b"502 no implementado\r\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self, port=0):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", port)
+        return self.server.sockets[0].getsockname()[1]
+
+
+def write_attendees(path, n, rng):
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["Nombre", "Apellido", "Correo electrónico", "Teléfono", "Especialidad",
+                         "Institución", "Área"])
+        for i in range(n):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            writer.writerow([first, last, f"{correo.ascii_word(first).lower()}.{i}@ejemplo.uy",
+                             f"+598 9{i:07d}", rng.choice(SPECIALTIES), "Hospital de Clínicas",
+                             rng.choice(AREAS)])
+
+
+def render_mbox(template, csv_path, mbox, progress_path, limit=None):
+    progress = correo.Progress(progress_path)
+    messages = correo.pending_messages(template, correo.csv_recipients(csv_path), progress,
+                                       correo.DEFAULT_SENDER)
+    if limit:
+        messages = (item for _, item in zip(range(limit), messages))
+    return correo.write_messages(messages, correo.MboxSink(mbox, progress), progress)
+
+
+def mbox_message_ids(path):
+    ids = []
+    with open(path, "rb") as f:
+        for line in f:
+            if line.startswith(b"Message-ID: "):
+                ids.append(line[12:].strip())
+    return ids
+
+
+async def smtp_run(template, csv_path, progress_path, connections, fail_rate, per_second=0, limit=None):
+    standin = SmtpStandIn(fail_rate)
+    port = await standin.start()
+    progress = correo.Progress(progress_path)
+    messages = correo.pending_messages(template, correo.csv_recipients(csv_path), progress,
+                                       correo.DEFAULT_SENDER)
+    if limit:
+        messages = (item for _, item in zip(range(limit), messages))
+    started = time.perf_counter()
+    stats = await correo.deliver(messages, progress, lambda: correo.SmtpClient("127.0.0.1", port),
+                                 correo.DEFAULT_SENDER, connections, per_second)
+    elapsed = time.perf_counter() - started
+    standin.server.close()
+    await standin.server.wait_closed()
+    return stats, standin, elapsed
+
+
+def serve(port):
+    async def run():
+        standin = SmtpStandIn()
+        await standin.start(port)
+        print(f"Servidor SMTP de prueba en 127.0.0.1:{port} (Ctrl+C para salir)")
+        while True:
+            await asyncio.sleep(5)
+            print(f"{sum(standin.received.values())} mensajes, {standin.connections} conexiones")
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--destinatarios", type=int, default=20000)
+    parser.add_argument("--plantilla", default="invitacion", choices=sorted(correo.TEMPLATES))
+    parser.add_argument("--conexiones", type=int, default=8)
+    parser.add_argument("--rechazos", type=float, default=0.02,
+                        help="Fracción de MAIL rechazados temporalmente por el servidor de prueba")
+    parser.add_argument("--servidor", type=int, metavar="PUERTO",
+                        help="Solo levantar el servidor SMTP de prueba en PUERTO")
+    args = parser.parse_args(argv)
+    if args.servidor:
+        serve(args.servidor)
+        return
+
+    n = args.destinatarios
+    template = correo.load_template(args.plantilla)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path = tmp / "asistentes.csv"
+        write_attendees(csv_path, n, random.Random(2026))
+
+        mbox = tmp / "salida.mbox"
+        tracemalloc.start()
+        started = time.perf_counter()
+        written = render_mbox(template, csv_path, mbox, tmp / "salida.progreso")
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"mbox: {written} mensajes ({mbox.stat().st_size / 1e6:.0f} MB) en {elapsed:.2f}s, "
+              f"{written / elapsed * 60:,.0f} por minuto; pico de memoria {peak / 1e6:.1f} MB")
+
+        # Resume: half, then a torn write at the end, then the rest
+        mbox = tmp / "reanudado.mbox"
+        progress_path = tmp / "reanudado.progreso"
+        render_mbox(template, csv_path, mbox, progress_path, limit=n // 2)
+        with open(mbox, "ab") as f:
+            f.write(b"From MAILER-DAEMON\nMessage-ID: <cortado@a-medias>\nSubject: a med")
+        render_mbox(template, csv_path, mbox, progress_path)
+        ids = mbox_message_ids(mbox)
+        ok = len(ids) == n and len(set(ids)) == n
+        print(f"Reanudación: {len(ids)} mensajes, {len(set(ids))} distintos -> {'ok' if ok else 'FALLÓ'}")
+
+        stats, standin, elapsed = asyncio.run(
+            smtp_run(template, csv_path, tmp / "smtp.progreso", args.conexiones, args.rechazos))
+        delivered = sum(standin.received.values())
+        once = all(count == 1 for count in standin.received.values()) and len(standin.received) == n
+        print(f"SMTP: {delivered} entregados por {args.conexiones} conexiones en {elapsed:.2f}s, "
+              f"{delivered / elapsed * 60:,.0f} por minuto; {standin.rejected} rechazos temporales, "
+              f"{stats['reintentos']} reintentos, {stats['fallidos']} fallidos; "
+              f"{'uno por destinatario' if once else 'ENTREGAS REPETIDAS O FALTANTES'}")
+
+        stats, standin, elapsed = asyncio.run(
+            smtp_run(template, csv_path, tmp / "limite.progreso", args.conexiones, 0, per_second=100, limit=200))
+        print(f"Límite de 100/s: {stats['enviados']} mensajes en {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
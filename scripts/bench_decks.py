@@ -0,0 +1,52 @@
+"""
+Benchmark de generación de decks de expositores.
+
+Compara el tiempo por deck del camino python-pptx completo (cada slide y
+cada shape armados de cero) contra la plantilla compilada que usa --batch.
+"""
+import json
+import argparse
+import tempfile
+import time
+from itertools import cycle, islice
+from pathlib import Path
+
+import generar_template_expositor as gen
+
+
+def time_decks(render, jobs):
+    started = time.perf_counter()
+    for job in jobs:
+        render(job)
+    return (time.perf_counter() - started) / len(jobs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("-n", type=int, default=20, help="Decks por camino")
+    args = parser.parse_args(argv)
+
+    with open(gen.SPEAKERS_JSON, encoding="utf-8") as f:
+        speakers = json.load(f)
+    with open(gen.AGENDA_JSON, encoding="utf-8") as f:
+        cases = gen.speaker_cases(json.load(f))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = [(gen.speaker_portada(s, cases), str(Path(tmp) / f"{i}.pptx"))
+                for i, s in enumerate(islice(cycle(speakers), args.n))]
+
+        uncached = time_decks(gen.build_speaker_deck, jobs)
+
+        started = time.perf_counter()
+        gen.compiled_deck()
+        compile_time = time.perf_counter() - started
+        compiled = time_decks(gen.render_speaker_deck, jobs)
+
+    print(f"python-pptx por deck:        {uncached * 1000:8.1f} ms")
+    print(f"plantilla compilada por deck: {compiled * 1000:8.1f} ms "
+          f"(compilación única {compile_time * 1000:.0f} ms)")
+    print(f"Aceleración: {uncached / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
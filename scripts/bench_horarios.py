@@ -0,0 +1,111 @@
+"""
+Benchmark de la validación de agenda (horarios.validate).
+
+Genera un programa sintético de varios días con miles de sesiones en
+paralelo, cientos de expositores y algunos choques sembrados a propósito,
+mide validate() y compara los conflictos que encuentra con la comparación
+de todos contra todos (O(n²)) que reemplaza.
+
+Uso: python scripts/bench_horarios.py [--sessions 5000] [--speakers 400] [--rooms 40]
+"""
+import time
+import random
+import argparse
+from datetime import date, timedelta
+
+from horarios import clock_minutes, minutes_clock, validate
+
+SLOT_MINUTES = (30, 45, 60, 75, 90)
+
+
+def synthetic_agenda(n_sessions, n_speakers, n_rooms, rng):
+    """Back-to-back sessions per room from 08:00, a new day when a room passes 20:00."""
+    days = {}
+    room_clock = {room: (0, 8 * 60) for room in range(n_rooms)}
+    for i in range(n_sessions):
+        room = i % n_rooms
+        day, start = room_clock[room]
+        length = rng.choice(SLOT_MINUTES)
+        if start + length > 20 * 60:
+            day, start = day + 1, 8 * 60
+        # A few sessions start early and collide with the previous one in the room
+        shift = rng.choice((15, 30)) if rng.random() < 0.01 and start > 8 * 60 else 0
+        room_clock[room] = (day, start + length)
+        days.setdefault(day, []).append({
+            "time": minutes_clock(start - shift), "end": minutes_clock(start + length),
+            "area": "mama", "room": f"Sala {room + 1}", "title": f"Sesión {i + 1}",
+            "speakers": [f"speaker-{rng.randrange(n_speakers):04d}" for _ in range(rng.randint(1, 4))],
+            "moderator": f"Moderador {rng.randrange(n_speakers // 10 or 1)}",
+        })
+    first = date(2026, 3, 13)
+    return [{"day": day + 1, "date": (first + timedelta(days=day)).isoformat(), "sessions": sessions}
+            for day, sessions in sorted(days.items())]
+
+
+def naive_conflicts(agenda):
+    """(kind, who, title) of every session that overlaps an earlier-starting
+    one in the same room or with a person in common."""
+    rows = []
+    for day in agenda:
+        offset = date.fromisoformat(day["date"]).toordinal() * 24 * 60
+        for s in day["sessions"]:
+            people = set(s["speakers"]) | {s["moderator"]}
+            rows.append((offset + clock_minutes(s["time"]), offset + clock_minutes(s["end"]), len(rows),
+                         s["room"], people, s["title"]))
+    flagged = set()
+    for a in rows:
+        for b in rows:
+            if a[:3] >= b[:3] or a[1] <= b[0]:
+                continue
+            if a[3] == b[3]:
+                flagged.add(("sala", "", b[5]))
+            flagged.update(("persona", who, b[5]) for who in a[4] & b[4])
+    return flagged
+
+
+def found_conflicts(issues):
+    found = set()
+    for issue in issues:
+        title = issue["message"].rsplit("'", 2)[-2]
+        if issue["kind"] == "sala":
+            found.add(("sala", "", title))
+        elif issue["kind"] == "persona":
+            found.add(("persona", issue["message"].split(" está en ")[0], title))
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--speakers", type=int, default=400)
+    parser.add_argument("--rooms", type=int, default=40)
+    parser.add_argument("--check", type=int, default=1500,
+                        help="Comparar con O(n²) solo si hay hasta esta cantidad de sesiones")
+    parser.add_argument("--seed", type=int, default=2026)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    agenda = synthetic_agenda(args.sessions, args.speakers, args.rooms, rng)
+    runs = []
+    for _ in range(5):
+        started = time.perf_counter()
+        issues = validate(agenda)
+        runs.append(time.perf_counter() - started)
+    kinds = {}
+    for issue in issues:
+        kinds[issue["kind"]] = kinds.get(issue["kind"], 0) + 1
+    print(f"{args.sessions} sesiones en {len(agenda)} días, {args.rooms} salas, {args.speakers} expositores")
+    print(f"validate(): {min(runs) * 1000:.1f} ms (mejor de {len(runs)})")
+    print(f"  {', '.join(f'{kind}: {count}' for kind, count in sorted(kinds.items()))}")
+
+    if args.sessions <= args.check:
+        started = time.perf_counter()
+        naive = naive_conflicts(agenda)
+        naive_time = time.perf_counter() - started
+        same = found_conflicts(issues) == naive
+        print(f"Todos contra todos: {naive_time * 1000:.0f} ms, {len(naive)} conflictos; "
+              f"{'mismo resultado' if same else 'RESULTADOS DISTINTOS'}")
+
+
+if __name__ == "__main__":
+    main()
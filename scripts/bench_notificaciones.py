@@ -0,0 +1,148 @@
+"""
+Prueba de carga del canal de notificaciones de servidor.py.
+
+Levanta servidor.py con un registro de notificaciones temporal, abre miles
+de conexiones /events/notifications que quedan en espera (como las apps
+abiertas durante el evento) y publica avisos con notificaciones.append().
+Mide cuánto tarda cada aviso en llegar a todas las conexiones, verifica
+que ninguna se pierda ni se repita, y prueba la reanudación desde un id.
+
+Uso: python scripts/bench_notificaciones.py [--clients 2000] [--messages 5]
+"""
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+from bench_servidor import free_port, percentile, start_server
+from notificaciones import append
+from servidor import FEED_PATH
+
+BASE = Path(__file__).resolve().parent.parent
+
+
+def raise_fd_limit(wanted):
+    """Lift the open files soft limit (servidor.py inherits it); returns the limit."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+    if soft < target:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def server_rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+async def subscribe(port, last_id, ready):
+    """Open one event stream; returns (reader, writer) once the headers arrived."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=1 << 16)
+    writer.write((f"GET {FEED_PATH} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+                  f"Accept: text/event-stream\r\nLast-Event-ID: {last_id}\r\n\r\n").encode())
+    status = await reader.readline()
+    if b" 200 " not in status:
+        raise ConnectionError(status.decode("latin-1").strip())
+    while (await reader.readline()) not in (b"\r\n", b""):
+        pass
+    ready.append(1)
+    return reader, writer
+
+
+async def receive(reader, count, arrivals):
+    """Collect the ids of ``count`` notification events with their arrival time."""
+    ids = []
+    while len(ids) < count:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("stream closed")
+        if line.startswith(b"id: "):
+            ids.append(int(line[4:]))
+            arrivals.setdefault(ids[-1], []).append(time.perf_counter())
+    return ids
+
+
+async def run(port, log, clients, messages, interval):
+    ready = []
+    connect_started = time.perf_counter()
+    streams = []
+    # Connect in batches so the listen backlog is not overrun
+    for start in range(0, clients, 500):
+        streams += await asyncio.gather(*(subscribe(port, 0, ready)
+                                          for _ in range(start, min(clients, start + 500))))
+    connect_time = time.perf_counter() - connect_started
+
+    arrivals, published = {}, {}
+    receivers = [asyncio.create_task(receive(reader, messages, arrivals)) for reader, _ in streams]
+    await asyncio.sleep(0.5)
+    for i in range(messages):
+        entry = append(f"Aviso de prueba {i + 1}", "Carga de notificaciones", path=log, json_path=None)
+        published[entry["id"]] = time.perf_counter()
+        await asyncio.sleep(interval)
+    results = await asyncio.wait_for(asyncio.gather(*receivers), timeout=30 + messages * interval)
+    expected = sorted(published)
+    bad = sum(ids != expected for ids in results)
+
+    # Resume: a client that saw the first message only gets the rest
+    reader, writer = await subscribe(port, expected[0], [])
+    resumed = await asyncio.wait_for(receive(reader, messages - 1, {}), timeout=5)
+    writer.close()
+    for _, w in streams:
+        w.close()
+
+    latencies = sorted(t - published[i] for i, times in arrivals.items() for t in times)
+    last_delivery = [max(times) - published[i] for i, times in arrivals.items()]
+    return connect_time, latencies, last_delivery, bad, resumed == expected[1:]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=1.5, help="Segundos entre avisos")
+    args = parser.parse_args(argv)
+
+    limit = raise_fd_limit(2 * args.clients + 256)
+    if limit is not None and limit < args.clients + 64:
+        parser.error(f"El límite de archivos abiertos ({limit}) no alcanza para {args.clients} clientes")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / "notifications.jsonl"
+        log.write_text("", encoding="utf-8")
+        port = free_port()
+        proc = start_server([sys.executable, str(BASE / "scripts" / "servidor.py"), str(port),
+                             "--bind", "127.0.0.1", "--notificaciones", str(log)], port)
+        try:
+            idle_rss = server_rss_kb(proc.pid)
+            connect_time, latencies, last_delivery, bad, resumed = asyncio.run(
+                run(port, log, args.clients, args.messages, args.interval))
+            busy_rss = server_rss_kb(proc.pid)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    print(f"{args.clients} conexiones abiertas en {connect_time:.2f} s, {args.messages} avisos")
+    print(f"Latencia por entrega: p50 {percentile(latencies, 0.5) * 1000:.0f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.0f} ms, máx {latencies[-1] * 1000:.0f} ms")
+    print(f"Hasta la última conexión: {max(last_delivery) * 1000:.0f} ms en el peor aviso")
+    if idle_rss and busy_rss:
+        print(f"Memoria del servidor: {idle_rss / 1024:.1f} MB sin clientes, {busy_rss / 1024:.1f} MB "
+              f"con {args.clients} ({(busy_rss - idle_rss) / args.clients:.1f} KB por conexión)")
+    print(f"Conexiones con avisos perdidos o repetidos: {bad}")
+    print(f"Reanudación desde id: {'ok' if resumed else 'FALLÓ'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Benchmark de perfiles_supabase.py, con un PostgREST de prueba local.
+
+Genera perfiles sintéticos (algunos vinculados a expositores reales de
+speakers.json, el resto asistentes), los sirve con un servidor HTTP que
+entiende el subconjunto de PostgREST que usa el script (select, order,
+limit, updated_at=gte. y el or=() de la paginación por clave) y mide:
+- el cruce por diccionario contra el de auth.js (un findIndex por perfil),
+  verificando que den lo mismo,
+- la corrida completa: traer todos los perfiles y hornear el archivo,
+- la corrida incremental después de modificar unos pocos perfiles, que
+  debe traer solo esos (más el solapamiento) y subir la versión,
+- una corrida sin cambios, que no debe subir la versión.
+
+Con --servidor PUERTO solo levanta el PostgREST de prueba, para probar
+perfiles_supabase.py --url http://127.0.0.1:PUERTO.
+
+Uso: python scripts/bench_perfiles.py [--perfiles 20000] [--modificados 50]
+     python scripts/bench_perfiles.py --servidor 54321
+"""
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import perfiles_supabase as perfiles
+from actualizar_datos import SPEAKERS_OUT
+
+FIRST_NAMES = ["José", "María", "Agustín", "Lucía", "Martín", "Inés", "Sebastián", "Valentina"]
+LAST_NAMES = ["González", "Rodríguez", "Fernández", "Pérez", "Martínez", "Gómez", "Suárez", "Núñez"]
+COUNTRIES = ["Uruguay", "Argentina", "Brasil", "Chile", ""]
+
+
+class PostgrestStandIn:
+    """In-memory ``profiles`` table behind the bits of the PostgREST API the baker uses."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = 0
+        self.rows_sent = 0
+
+    def query(self, params):
+        rows = self.rows
+        if "updated_at" in params:
+            since = perfiles.parse_timestamp(params["updated_at"].removeprefix("gte."))
+            rows = [row for row in rows if perfiles.parse_timestamp(row["updated_at"]) >= since]
+        if "or" in params:
+            # (updated_at.gt."T",and(updated_at.eq."T",user_id.gt."U"))
+            values = params["or"].split('"')
+            after, user_id = perfiles.parse_timestamp(values[1]), values[5]
+            rows = [row for row in rows if (perfiles.parse_timestamp(row["updated_at"]), row["user_id"])
+                    > (after, user_id)]
+        rows = sorted(rows, key=lambda row: (perfiles.parse_timestamp(row["updated_at"]), row["user_id"]))
+        rows = rows[:int(params.get("limit", len(rows)))]
+        fields = params.get("select", "*").split(",")
+        return [row if fields == ["*"] else {field: row.get(field) for field in fields} for row in rows]
+
+    def handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urllib.parse.urlsplit(self.path)
+                if url.path != "/rest/v1/profiles":
+                    self.send_error(404)
+                    return
+                rows = standin.query(dict(urllib.parse.parse_qsl(url.query)))
+                standin.requests += 1
+                standin.rows_sent += len(rows)
+                body = json.dumps(rows, ensure_ascii=False).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self, port=0):
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self.handler())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.server.server_address[1]
+
+
+def timestamp(moment):
+    return moment.isoformat(timespec="microseconds")
+
+
+def synthetic_profiles(n, speakers, rng, start):
+    rows = []
+    claimable = [speaker["id"] for speaker in speakers]
+    rng.shuffle(claimable)
+    for i in range(n):
+        rows.append({
+            "user_id": f"00000000-0000-4000-8000-{i:012d}",
+            "speaker_id": claimable[i] if i < len(claimable) // 2 else None,
+            "name": rng.choice(FIRST_NAMES),
+            "lastname": rng.choice(LAST_NAMES + [""]),
+            "country": rng.choice(COUNTRIES),
+            "institution": rng.choice(["Hospital de Clínicas", "", "CASMU"]),
+            "specialty": "",
+            "phone": f"+598 9{i:07d}" if rng.random() < 0.5 else "",
+            "email": f"persona{i}@ejemplo.uy",
+            "bio": "",
+            "photo_url": "",
+            "visibility": {"phone": rng.random() < 0.3},
+            # Spread over a day; runs of rows share a timestamp, as after a bulk import
+            "updated_at": timestamp(start + timedelta(seconds=(i // 7) * 30)),
+        })
+    return rows
+
+
+def find_index_merge(speakers, profiles):
+    """The merge as auth.js did it: one linear search of speakersData per profile."""
+    merged = list(speakers)
+    claimed = set()
+    for profile in profiles:
+        if not profile.get("speaker_id"):
+            continue
+        claimed.add(profile["speaker_id"])
+        index = next((i for i, s in enumerate(merged) if s.get("id") == profile["speaker_id"]), -1)
+        if index == -1:
+            continue
+        merged[index] = {**merged[index], **perfiles.profile_overlay(profile)}
+    return merged, sorted(claimed)
+
+
+def serve(port, n):
+    with open(SPEAKERS_OUT, encoding="utf-8") as f:
+        speakers = json.load(f)
+    rows = synthetic_profiles(n, speakers, random.Random(2026), datetime.now(timezone.utc) - timedelta(days=1))
+    PostgrestStandIn(rows).start(port)
+    print(f"PostgREST de prueba con {n} perfiles en http://127.0.0.1:{port} (Ctrl+C para salir)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--perfiles", type=int, default=20000)
+    parser.add_argument("--expositores", type=int, default=2000,
+                        help="Mínimo de expositores (se replican los de speakers.json)")
+    parser.add_argument("--modificados", type=int, default=50)
+    parser.add_argument("--servidor", type=int, metavar="PUERTO",
+                        help="Solo levantar el PostgREST de prueba en PUERTO")
+    args = parser.parse_args(argv)
+    if args.servidor:
+        serve(args.servidor, args.perfiles)
+        return
+
+    rng = random.Random(2026)
+    with open(SPEAKERS_OUT, encoding="utf-8") as f:
+        speakers = json.load(f)
+    # A bigger program than the real one, with the real records as a base
+    base, copy = list(speakers), 0
+    while len(speakers) < args.expositores:
+        copy += 1
+        speakers += [{**speaker, "id": f"{speaker['id']}-{copy}"} for speaker in base]
+    start = datetime.now(timezone.utc) - timedelta(days=1)
+    rows = synthetic_profiles(args.perfiles, speakers, rng, start)
+
+    started = time.perf_counter()
+    expected = find_index_merge(speakers, sorted(rows, key=perfiles.change_order))
+    linear = time.perf_counter() - started
+    started = time.perf_counter()
+    overlays, claimed = perfiles.build_overlays(rows)
+    merged = perfiles.apply_overlays(speakers, overlays), claimed
+    joined = time.perf_counter() - started
+    print(f"Cruce de {len(rows)} perfiles con {len(speakers)} expositores: findIndex {linear * 1000:.0f} ms, "
+          f"diccionario {joined * 1000:.1f} ms (x{linear / joined:.0f}); "
+          f"{'mismo resultado' if merged == expected else 'RESULTADOS DISTINTOS'}")
+
+    standin = PostgrestStandIn(rows)
+    port = standin.start()
+    url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "speakers-perfiles.json"
+        perfiles.STATE_PATH = Path(tmp) / "estado.json"
+
+        def run(*extra):
+            standin.requests = standin.rows_sent = 0
+            started = time.perf_counter()
+            perfiles.main(["--url", url, "--salida", str(out), *extra])
+            elapsed = time.perf_counter() - started
+            with open(out, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            return snapshot, elapsed, standin.requests, standin.rows_sent
+
+        snapshot, elapsed, requests, sent = run("--completo")
+        print(f"Completa: {sent} filas en {requests} páginas, {elapsed:.2f}s; "
+              f"{out.stat().st_size / 1024:.0f} KB, versión {snapshot['version']}")
+
+        # Touch a few profiles, the way a user editing theirs would
+        now = datetime.now(timezone.utc)
+        linked = [row for row in rows if row["speaker_id"]]
+        for row in rng.sample(linked, args.modificados):
+            row["country"] = "Paraguay"
+            row["updated_at"] = timestamp(now)
+        before = snapshot["version"]
+        snapshot, elapsed, requests, sent = run()
+        print(f"Incremental: {sent} filas ({args.modificados} modificadas, el resto por el solapamiento) "
+              f"en {requests} páginas, {elapsed:.2f}s, versión {snapshot['version']} "
+              f"-> {'ok' if snapshot['version'] == before + 1 else 'NO SUBIÓ LA VERSIÓN'}")
+
+        before = snapshot["version"]
+        snapshot, elapsed, requests, sent = run()
+        print(f"Sin cambios: {sent} filas (solapamiento), {elapsed:.2f}s, versión {snapshot['version']} "
+              f"-> {'ok' if snapshot['version'] == before else 'SUBIÓ LA VERSIÓN'}")
+
+        print(f"Horneado igual a un cruce desde cero: "
+              f"{'ok' if (snapshot['overlays'], snapshot['claimed']) == perfiles.build_overlays(rows) else 'DISTINTO'}")
+    standin.server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Suite de benchmarks de los scripts de datos y decks, con línea base.
+
+Genera Excels sintéticos con el formato que espera actualizar_datos.py
+(fila de encabezado "Caso N", filas de área con el moderador, filas
+"Tipo" y "Nombre" con varios expositores separados por "/", nombres a
+descartar, "(opcion ...)" y dobles espacios) de 10 a 100.000 filas, y mide
+por tamaño la lectura del Excel, el parseo de la grilla, el dedupe de
+expositores, el armado de la agenda y la emisión de los JSON. También mide
+la creación del deck con python-pptx, el render de la plantilla compilada
+y embed_fonts_from_original con fuentes grandes.
+
+Cada medición es el mejor de --repeticiones. Con --guardar los resultados
+quedan como línea base; en las corridas siguientes se comparan contra ella
+y el script sale con código 1 si alguna medición empeoró más que
+--tolerancia (y más de --minimo-ms, para no marcar ruido).
+
+Uso: python scripts/bench_regresiones.py [--filas 10 100 1000 10000 100000]
+     [--fuente-mb 64] [--guardar] [--base scripts/bench_baseline.json]
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import zipfile
+import argparse
+import platform
+import tempfile
+from pathlib import Path
+
+import openpyxl
+
+import actualizar_datos as datos
+import generar_template_expositor as gen
+import instrumentacion
+
+BASELINE_PATH = Path(__file__).resolve().parent / "bench_baseline.json"
+BASELINE_VERSION = 1
+ROW_COUNTS = (10, 100, 1000, 10000, 100000)
+# Area header text as in the real sheet: "MAMA", "NEURO", ...
+AREAS = list(datos.AREA_MAP)
+FIRST_NAMES = ["José", "María", "Agustín", "Lucía", "Martín", "Inés", "Sebastián", "Valentina",
+               "Nicolás", "Sofía", "Andrés", "Mónica", "Joaquín", "Verónica", "Raúl", "Ana",
+               "Federico", "Natalia", "Emiliano", "Cecilia", "Germán", "Florencia"]
+LAST_NAMES = ["González", "Rodríguez", "Fernández", "Pérez", "Martínez", "Gómez", "Suárez",
+              "Núñez", "Ibáñez", "Castro", "Rosich", "Lorenzo", "Ferreira", "Aguiar", "Rivero",
+              "Gadea", "Olivera", "Acosta", "Benítez", "Cabrera", "Méndez", "Sosa"]
+SPECIALTIES = ["Imagenologo", "Mastologo", "Patologo", "Oncologo médico", "Genetista",
+               "Radiooncologo", "Fisico Médico/Tecnólogos", "Inteligencia Artificial"]
+SKIPPED = ["N/A", "No corresponde", "Invitado Brainlab", "Equipo Diagnóstico", ""]
+
+
+def name_pool(size, rng):
+    """``size`` distinct speaker names (numbered once the combinations run out)."""
+    names, seen = [], set()
+    while len(names) < size:
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}"
+        if name in seen:
+            name = f"{name} {len(names)}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def name_cell(names, rng):
+    """One case cell: 1-3 names joined by "/", sometimes messy or skipped."""
+    if rng.random() < 0.12:
+        return rng.choice(SKIPPED)
+    picked = [rng.choice(names) for _ in range(rng.choice((1, 1, 2, 3)))]
+    if rng.random() < 0.05:
+        picked[0] = picked[0].replace(" ", "  ", 1)
+    if rng.random() < 0.03:
+        picked[-1] += f"(opcion {rng.choice(LAST_NAMES)})"
+    return rng.choice(("/", "/ ", " / ")).join(picked)
+
+
+def program_rows(n_rows, rng):
+    """Yield ``n_rows`` rows laid out like the program sheet."""
+    names = name_pool(max(20, n_rows // 3), rng)
+    yield ["", "", "", "", "Viernes 13", "", "Sabado 14", ""]
+    yield ["", "Taller", "Especialidad", "", "Caso 1", "Caso 2", "Caso 3", "Caso 4"]
+    emitted, block = 2, 0
+    while True:
+        area = AREAS[block % len(AREAS)]
+        rows = [
+            ["", area, f"Moderador (Presenta caso) {rng.choice(names)}", "Nombre del paciente",
+             "pendiente", "", "", ""],
+            ["", "", "", "Tipo"] + [f"Caso {block}-{c}" for c in range(1, 5)],
+            ["", "", "", "Link carpeta caso"] + [f"https://example.org/{block}/{c}" for c in range(1, 5)],
+        ]
+        for specialty in SPECIALTIES:
+            rows.append(["", "", specialty, "Nombre"] + [name_cell(names, rng) for _ in range(4)])
+            rows.append(["", "", "", "Tema", "", "", "", ""])
+        for row in rows:
+            if emitted == n_rows:
+                return
+            yield row
+            emitted += 1
+        block += 1
+
+
+def write_workbook(path, n_rows, seed):
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    for row in program_rows(n_rows, random.Random(seed)):
+        ws.append(row)
+    wb.save(path)
+
+
+def best_of(repeats, fn):
+    """Best (lowest) result of ``repeats`` calls to ``fn``, which returns a dict of seconds."""
+    best = {}
+    for _ in range(repeats):
+        for key, seconds in fn().items():
+            best[key] = min(seconds, best.get(key, seconds))
+    return best
+
+
+def bench_workbook(path, out_dir):
+    """Phase times of one full parse + JSON emission of ``path``."""
+    with instrumentacion.record() as run:
+        speakers, agenda, _, _ = datos.parse_workbook(path)
+        with instrumentacion.phase("JSON write"):
+            for name, text in ((datos.SPEAKERS_OUT.name, datos.dump_json(speakers)),
+                               (datos.AGENDA_OUT.name, datos.dump_json(agenda)),
+                               (datos.SEARCH_INDEX_OUT.name,
+                                datos.dump_json_compact(datos.build_search_index(speakers))),
+                               (datos.AGENDA_INDEX_OUT.name,
+                                datos.dump_json_compact(datos.build_agenda_index(agenda)))):
+                # A fresh file each time, so every run really writes
+                target = out_dir / name
+                if target.exists():
+                    target.unlink()
+                datos.write_if_changed(target, text)
+    phases = run.self_seconds()
+    return {
+        "lectura": phases.get("workbook load", 0.0),
+        "parseo": phases.get("grid parse", 0.0),
+        "dedupe": phases.get("speaker dedupe", 0.0),
+        "agenda": phases.get("agenda build", 0.0) + phases.get("schedule validate", 0.0),
+        "json": phases.get("JSON write", 0.0),
+    }
+
+
+def font_source(path, megabytes, fonts=4):
+    """A deck whose ppt/fonts/ parts add up to ``megabytes`` of incompressible data."""
+    prs = gen.build_presentation()
+    buf = io.BytesIO()
+    prs.save(buf)
+    size = megabytes * 1024 * 1024 // fonts
+    with zipfile.ZipFile(buf) as src, zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as out:
+        for info in src.infolist():
+            out.writestr(info, src.read(info))
+        for i in range(1, fonts + 1):
+            out.writestr(f"ppt/fonts/font{i}.fntdata", os.urandom(size))
+
+
+def bench_decks(tmp, font_mb):
+    source = tmp / "fuentes.pptx"
+    font_source(source, font_mb)
+    target = tmp / "deck.pptx"
+
+    def decks():
+        results = {}
+        started = time.perf_counter()
+        prs = gen.build_presentation()
+        results["deck/python-pptx"] = time.perf_counter() - started
+        started = time.perf_counter()
+        gen.save_with_fonts(prs, io.BytesIO(), font_source=source)
+        results[f"deck/save_with_fonts {font_mb}MB"] = time.perf_counter() - started
+        gen.build_presentation().save(target)
+        started = time.perf_counter()
+        gen.embed_fonts_from_original(str(source), str(target))
+        results[f"deck/embed_fonts_from_original {font_mb}MB"] = time.perf_counter() - started
+        return results
+
+    def render():
+        started = time.perf_counter()
+        for i in range(20):
+            gen.render_speaker_deck(({"name": f"Expositor {i}"}, str(tmp / "render.pptx")))
+        return {"deck/plantilla compilada": (time.perf_counter() - started) / 20}
+
+    return decks, render
+
+
+def compare(results, baseline, tolerance, floor_ms):
+    """Rows (key, now, before, ratio, regressed) for every measurement."""
+    rows = []
+    for key, seconds in results.items():
+        before = baseline.get(key)
+        ratio = seconds / before if before else None
+        regressed = (before is not None and seconds > before * (1 + tolerance)
+                     and (seconds - before) * 1000 > floor_ms)
+        rows.append((key, seconds, before, ratio, regressed))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=list(ROW_COUNTS),
+                        help="Tamaños de Excel sintético (filas)")
+    parser.add_argument("--fuente-mb", type=int, default=64,
+                        help="Tamaño total de las fuentes para embed_fonts_from_original")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--sin-decks", action="store_true", help="Medir solo los Excels")
+    parser.add_argument("--base", default=str(BASELINE_PATH), help="Archivo de línea base")
+    parser.add_argument("--guardar", action="store_true",
+                        help="Guardar estos resultados como nueva línea base")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Empeoramiento relativo aceptado (0.25 = 25%%)")
+    parser.add_argument("--minimo-ms", type=float, default=10.0,
+                        help="Diferencias menores que esto nunca son regresión")
+    parser.add_argument("--seed", type=int, default=2026)
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for n_rows in args.filas:
+            path = tmp / f"programa-{n_rows}.xlsx"
+            started = time.perf_counter()
+            write_workbook(path, n_rows, args.seed)
+            print(f"Excel de {n_rows} filas ({path.stat().st_size / 1024:.0f} KB) "
+                  f"generado en {time.perf_counter() - started:.1f}s")
+            out_dir = tmp / f"json-{n_rows}"
+            out_dir.mkdir()
+            times = best_of(args.repeticiones, lambda: bench_workbook(path, out_dir))
+            results.update({f"excel/{n_rows}/{phase}": seconds for phase, seconds in times.items()})
+        if not args.sin_decks:
+            decks, render = bench_decks(tmp, args.fuente_mb)
+            results.update(best_of(args.repeticiones, decks))
+            results.update(best_of(args.repeticiones, render))
+
+    base_path = Path(args.base)
+    baseline = {}
+    if base_path.exists():
+        with open(base_path, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+    rows = compare(results, baseline, args.tolerancia, args.minimo_ms)
+    width = max(len(key) for key in results)
+    for key, seconds, before, ratio, regressed in rows:
+        versus = f"  base {before * 1000:9.1f} ms  x{ratio:.2f}" if before else ""
+        print(f"{key:<{width}} {seconds * 1000:9.1f} ms{versus}{'  REGRESIÓN' if regressed else ''}")
+
+    regressions = [row[0] for row in rows if row[4]]
+    if args.guardar:
+        base_path.write_text(json.dumps({
+            "version": BASELINE_VERSION,
+            "machine": platform.node(),
+            "python": platform.python_version(),
+            "savedAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": {key: round(seconds, 6) for key, seconds in results.items()},
+        }, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"Línea base guardada en {base_path}")
+    elif not baseline:
+        print(f"Sin línea base en {base_path}; usar --guardar para crearla")
+    elif regressions:
+        print(f"{len(regressions)} mediciones empeoraron más de {args.tolerancia:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    else:
+        print(f"Sin regresiones contra la línea base ({base_path.name})")
+
+
+if __name__ == "__main__":
+    main()
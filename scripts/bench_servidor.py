@@ -0,0 +1,138 @@
+"""
+Prueba de carga: servidor.py contra python -m http.server.
+
+Levanta ambos servidores sobre webapp/ en puertos locales y les pega con
+clientes HTTP/1.1 concurrentes (asyncio) que piden la misma mezcla de
+archivos que la app al cargar, con ?t= anti-caché en los JSON. Reporta
+requests/s y latencias p50/p99.
+
+Uso: python scripts/bench_servidor.py [--clients 200] [--requests 20]
+"""
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parent.parent
+WEBAPP_DIR = BASE / "webapp"
+
+PATHS = [
+    "/", "/css/style.css", "/js/app.js", "/js/auth.js", "/js/chat.js",
+    "/img/logo-convention-gold.png", "/img/speakers/agustin-rosich.jpg",
+    "/data/agenda.json?t={t}", "/data/speakers.json?t={t}",
+    "/data/notifications.json?t={t}",
+]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(args, port):
+    proc = subprocess.Popen(args, cwd=str(WEBAPP_DIR),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError(f"El servidor no arrancó: {args}")
+
+
+async def read_response(reader):
+    """Read one response; returns (status, keep_alive)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("closed")
+    version, status = status_line.split()[:2]
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip().lower()
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+        keep_alive = (version == b"HTTP/1.1" and headers.get("connection") != "close")
+    else:
+        await reader.read()
+        keep_alive = False
+    return int(status), keep_alive
+
+
+async def client(port, n_requests, offset, latencies, errors):
+    reader = writer = None
+    for i in range(n_requests):
+        path = PATHS[(offset + i) % len(PATHS)].format(t=time.time_ns())
+        request = (f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+                   "Accept-Encoding: gzip, br\r\n\r\n").encode()
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            status, keep_alive = await read_response(reader)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+            errors.append(1)
+            keep_alive = False
+        else:
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors.append(status)
+        if not keep_alive and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def load(port, clients, n_requests):
+    latencies, errors = [], []
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, n_requests, c, latencies, errors)
+                           for c in range(clients)))
+    return time.perf_counter() - started, sorted(latencies), errors
+
+
+def percentile(values, p):
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20, help="Requests por cliente")
+    args = parser.parse_args(argv)
+
+    servers = [
+        ("http.server", [sys.executable, "-m", "http.server"]),
+        ("servidor.py", [sys.executable, str(BASE / "scripts" / "servidor.py"), "--bind", "127.0.0.1"]),
+    ]
+    print(f"{args.clients} clientes x {args.requests} requests")
+    print(f"{'servidor':<12} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errores':>8}")
+    for name, cmd in servers:
+        port = free_port()
+        proc = start_server(cmd + [str(port)], port)
+        try:
+            elapsed, latencies, errors = asyncio.run(load(port, args.clients, args.requests))
+        finally:
+            proc.terminate()
+            proc.wait()
+        rps = len(latencies) / elapsed
+        print(f"{name:<12} {rps:>9.0f} {percentile(latencies, 0.5) * 1000:>8.1f} "
+              f"{percentile(latencies, 0.99) * 1000:>8.1f} {len(errors):>8}")
+
+
+if __name__ == "__main__":
+    main()
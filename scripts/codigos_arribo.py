@@ -0,0 +1,215 @@
+"""
+Genera un código de arribo firmado por asistente, con su QR, y la tabla
+con la que la app los valida sin conexión.
+
+Cada código es "RTCC2026|ARRIBO|" + una etiqueta HMAC-SHA256 (80 bits, en
+base32) de la clave del asistente (email, teléfono o id de expositor), con
+un secreto que no sale de esta máquina: sin el secreto no se puede armar un
+código válido. Los asistentes salen de speakers.json y de exportaciones CSV
+(mismo formato que combinar_correos.py).
+
+La app no tiene el secreto: recibe webapp/data/arribos.json, un arreglo
+ordenado con los primeros 10 bytes del SHA-256 de cada código, y busca el
+código escaneado por búsqueda binaria (O(log n), sin red). No es un filtro
+de Bloom a propósito: la tabla es pública y un filtro con falsos positivos
+se puede forzar probando códigos hasta que uno pase; con 80 bits por
+entrada eso es impracticable. El QR compartido ARRIVAL_QR_EXPECTED sigue
+valiendo.
+
+Los QR se dibujan en paralelo (uno por asistente) en arribos/qr/, con el
+listado arribos/codigos.csv para enviarlos; esa carpeta no se publica.
+Necesita qrcode con Pillow (pip install "qrcode[pil]"); sin él se generan
+los códigos y la tabla, sin imágenes.
+
+Uso: ARRIBO_SECRETO=... python scripts/codigos_arribo.py --csv asistentes.csv [--speakers]
+     python -c "import secrets; print(secrets.token_hex(32))"   # para crear el secreto
+"""
+import os
+import re
+import csv
+import hmac
+import time
+import base64
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from actualizar_datos import dump_json_compact, write_if_changed
+from combinar_correos import SPEAKERS_JSON, csv_recipients, recipient_key, speaker_recipients
+
+BASE = Path(__file__).resolve().parent.parent
+TABLE_OUT = BASE / "webapp" / "data" / "arribos.json"
+OUT_DIR = BASE / "arribos"
+SECRET_ENV = "ARRIBO_SECRETO"
+TABLE_VERSION = 1
+# Must match ARRIVAL_CODE_PREFIX in app.js
+CODE_PREFIX = "RTCC2026|ARRIBO|"
+TAG_BYTES = 10
+FINGERPRINT_BYTES = 10
+QR_BOX_SIZE = 12
+QR_MASK = 2
+# Hex digits of the key hash in the QR file names
+QR_NAME_HASH = 12
+
+
+def sign(secret, key):
+    """The arrival code of attendee ``key``."""
+    tag = hmac.new(secret, f"{CODE_PREFIX}{key}".encode("utf-8"), hashlib.sha256).digest()[:TAG_BYTES]
+    return CODE_PREFIX + base64.b32encode(tag).decode("ascii")
+
+
+def fingerprint(code, width=FINGERPRINT_BYTES):
+    return hashlib.sha256(code.encode("utf-8")).digest()[:width]
+
+
+def build_table(codes, width=FINGERPRINT_BYTES):
+    """Verification table: the sorted, concatenated fingerprints, base64."""
+    packed = b"".join(sorted({fingerprint(code, width) for code in codes}))
+    return {
+        "version": TABLE_VERSION,
+        "prefix": CODE_PREFIX,
+        "bytes": width,
+        "count": len(packed) // width,
+        "hashes": base64.b64encode(packed).decode("ascii"),
+    }
+
+
+def contains(packed, width, code):
+    """Binary search of ``code`` in a packed table, as isSignedArrivalCode() in app.js."""
+    target = fingerprint(code, width)
+    lo, hi = 0, len(packed) // width - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        entry = packed[mid * width:(mid + 1) * width]
+        if entry == target:
+            return True
+        if entry < target:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return False
+
+
+def qr_file_name(key):
+    """File name of the QR of ``key``: readable, plus a hash of the exact key.
+
+    Cleaning up the key alone maps different keys (a+b@x, a_b@x) to the
+    same name; the hash keeps them apart.
+    """
+    readable = re.sub(r"[^\w.@-]", "_", key)[:80]
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:QR_NAME_HASH]
+    return f"{readable}-{digest}.png"
+
+
+def render_qr(job):
+    """Worker: draw one code as a 1-bit PNG."""
+    import qrcode
+    from PIL import Image
+    code, path = job
+    # A fixed mask skips scoring all 8 (most of the time per code); any mask
+    # is valid and every code has the same length and alphabet
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=4, mask_pattern=QR_MASK)
+    qr.add_data(code)
+    qr.make(fit=True)
+    # One pixel per module, then scaled: much faster than make_image()
+    matrix = qr.get_matrix()
+    size = len(matrix)
+    image = Image.new("1", (size, size))
+    image.putdata([0 if dark else 1 for row in matrix for dark in row])
+    image.resize((size * QR_BOX_SIZE, size * QR_BOX_SIZE), Image.NEAREST).save(path)
+    return path
+
+
+def render_qrs(jobs, workers=None):
+    """Draw the QR images in a process pool; returns how many were drawn."""
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for done, _ in enumerate(pool.map(render_qr, jobs, chunksize=64), 1):
+            if done % 5000 == 0:
+                print(f"  {done}/{len(jobs)} QR")
+    return done
+
+
+def load_secret(path=None):
+    if path:
+        return Path(path).read_bytes().strip()
+    secret = os.environ.get(SECRET_ENV, "")
+    if len(secret) < 32:
+        raise SystemExit(f"Falta el secreto: definir {SECRET_ENV} (al menos 32 caracteres) o usar "
+                         f"--secreto-archivo. Para crear uno: "
+                         f"python -c \"import secrets; print(secrets.token_hex(32))\"")
+    return secret.encode("utf-8")
+
+
+def qr_available():
+    try:
+        import qrcode  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--speakers", nargs="?", const=str(SPEAKERS_JSON),
+                        help="Incluir a los expositores de speakers.json (o de este archivo)")
+    parser.add_argument("--csv", action="append", default=[], help="Exportación CSV de asistentes (repetible)")
+    parser.add_argument("--salida", default=str(OUT_DIR), help="Carpeta de los QR y el listado (privada)")
+    parser.add_argument("--tabla", default=str(TABLE_OUT), help="Tabla de verificación para la app")
+    parser.add_argument("--secreto-archivo", help=f"Leer el secreto de este archivo en vez de {SECRET_ENV}")
+    parser.add_argument("--sin-qr", action="store_true", help="Solo códigos y tabla, sin dibujar los QR")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Procesos en paralelo para los QR (por defecto, uno por núcleo)")
+    args = parser.parse_args(argv)
+    if not args.speakers and not args.csv:
+        parser.error("indicar --speakers y/o --csv")
+    secret = load_secret(args.secreto_archivo)
+
+    out_dir = Path(args.salida)
+    qr_dir = out_dir / "qr"
+    qr_dir.mkdir(parents=True, exist_ok=True)
+    draw = not args.sin_qr and qr_available()
+    if not args.sin_qr and not draw:
+        print('Aviso: falta el paquete qrcode (pip install "qrcode[pil]"); se generan los códigos sin QR.')
+
+    started = time.perf_counter()
+    codes, jobs, seen, names = [], [], set(), set()
+    sources = [speaker_recipients(args.speakers)] if args.speakers else []
+    sources += [csv_recipients(path) for path in args.csv]
+    with open(out_dir / "codigos.csv", "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["clave", "nombre", "email", "telefono", "codigo", "qr"])
+        for recipients in sources:
+            for recipient in recipients:
+                key = recipient_key(recipient)
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                code = sign(secret, key)
+                name = qr_file_name(key)
+                if name.lower() in names:
+                    # Case too, for case-insensitive file systems
+                    raise SystemExit(f"Dos asistentes tendrían el mismo archivo de QR: {name}")
+                names.add(name.lower())
+                qr_path = qr_dir / name
+                codes.append(code)
+                jobs.append((code, str(qr_path)))
+                writer.writerow([key, recipient.get("name", ""), recipient.get("email", ""),
+                                 recipient.get("phone", ""), code, qr_path.relative_to(out_dir).as_posix()])
+    minted = time.perf_counter() - started
+
+    table = build_table(codes)
+    written = write_if_changed(args.tabla, dump_json_compact(table))
+    print(f"{len(codes)} códigos en {minted:.2f}s; {Path(args.tabla).name}: "
+          f"{len(table['hashes']) / 1024:.0f} KB{'' if written else ' (sin cambios)'}")
+    if draw:
+        started = time.perf_counter()
+        drawn = render_qrs(jobs, args.workers)
+        elapsed = time.perf_counter() - started
+        print(f"{drawn} QR en {elapsed:.1f}s ({drawn / elapsed if elapsed else 0:.0f}/s) -> {qr_dir}")
+    print(f"Listado: {out_dir / 'codigos.csv'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,645 @@
+"""
+Combina las plantillas de Comunicaciones/ con la lista de destinatarios.
+
+Cada plantilla se compila una sola vez en fragmentos fijos y campos
+{{nombre}}, {{especialidad}}, {{area}}, {{institucion}} y {{archivo}}; el
+saludo "Estimado/a colega," y el ejemplo de nombre de archivo de las
+instrucciones a expositores se personalizan solos. Los destinatarios salen
+de speakers.json y de exportaciones CSV de asistentes (columnas nombre,
+apellido, email/correo, telefono/celular, especialidad, institucion, area,
+con "," o ";"), que se leen de a una fila.
+
+Los mensajes se escriben a medida que se generan, con memoria constante:
+- --eml CARPETA: un .eml por destinatario,
+- --mbox ARCHIVO: un mbox,
+- --jsonl ARCHIVO: una línea JSON por destinatario (para WhatsApp),
+- --smtp HOST[:PUERTO]: envío con un pool de conexiones SMTP asyncio,
+  con PIPELINING, límite de mensajes por segundo y reintentos.
+
+El progreso queda en un registro de solo agregado: si se corta, la
+siguiente corrida con los mismos argumentos saltea lo ya hecho (y recorta
+el mbox a su último mensaje completo). bench_correos.py incluye un
+servidor SMTP de prueba local.
+
+Uso: python scripts/combinar_correos.py invitacion --csv asistentes.csv --mbox invitaciones.mbox
+     python scripts/combinar_correos.py expositores --speakers --smtp smtp.ejemplo.com:587 --starttls
+"""
+import os
+import re
+import csv
+import ssl
+import html
+import json
+import time
+import base64
+import asyncio
+import hashlib
+import itertools
+import argparse
+import unicodedata
+from email.header import Header
+from email.utils import formataddr, formatdate, parseaddr
+from pathlib import Path
+
+from indice_busqueda import fold
+
+BASE = Path(__file__).resolve().parent.parent
+COMUNICACIONES = BASE / "Comunicaciones"
+SPEAKERS_JSON = BASE / "webapp" / "data" / "speakers.json"
+STATE_DIR = BASE / "scripts"
+DEFAULT_SENDER = "RT International Institute <convention@rtinternational.uy>"
+MESSAGE_ID_DOMAIN = "rtinternational.uy"
+
+# name -> (file, subject or None to use the HTML <title>)
+TEMPLATES = {
+    "invitacion": ("email_invitacion_convencion.html", None),
+    "expositores": ("email_instrucciones_expositores.html", None),
+    "whatsapp": ("invitacion_whatsapp.txt", "RT International Institute Convention 2026"),
+}
+# Literal text of the hand-written templates -> the same text with slots
+PERSONALIZE = [
+    ("Estimado/a colega,", "Estimado/a {{nombre}},"),
+    ("(ej: Apellido_Especialidad_Mama.pptx)", "(ej: {{archivo}})"),
+]
+# Plain ASCII addr-spec (no quoted local parts, no SMTPUTF8), domain already IDNA-encoded
+ADDRESS_RE = re.compile(r"[A-Za-z0-9.!#$%&'*+/=?^_`{|}~-]+@"
+                        r"[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?(?:\.[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?)+")
+AREA_LABELS = {"mama": "Mama", "pulmon": "Pulmón", "prostata": "Próstata", "neuro": "Neuro"}
+# Folded CSV header -> recipient field
+CSV_COLUMNS = {
+    "nombre": "name", "name": "name", "nombre completo": "name", "nombre y apellido": "name",
+    "apellido": "surname", "apellidos": "surname",
+    "email": "email", "e-mail": "email", "mail": "email", "correo": "email",
+    "correo electronico": "email",
+    "telefono": "phone", "celular": "phone", "whatsapp": "phone", "movil": "phone",
+    "especialidad": "specialty", "institucion": "institution", "area": "area", "id": "id",
+}
+SLOT_RE = re.compile(r"\{\{(\w+)\}\}")
+UNICODE_ESCAPE_RE = re.compile(r"\\u([0-9a-fA-F]{4})")
+TITLE_RE = re.compile(r"<title>(.*?)</title>", re.S)
+# File sinks flush output and progress every this many messages (a message
+# redone after a crash is only rewritten); SMTP logs each send right away
+FLUSH_EVERY = 500
+
+
+class Template:
+    """A message template split once into literal byte chunks and slots.
+
+    Rendering a recipient only joins the cached chunks with its escaped
+    field values; lines end in CRLF, ready for SMTP.
+    """
+
+    def __init__(self, name, text, subject=None, is_html=True):
+        # The WhatsApp text was saved with some accents as literal \\u00f3 escapes
+        text = UNICODE_ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 16)), text)
+        if subject is None:
+            title = TITLE_RE.search(text)
+            subject = html.unescape(title.group(1)).strip() if title else name
+        for literal, slotted in PERSONALIZE:
+            text = text.replace(literal, slotted)
+        text = "\r\n".join(text.splitlines()) + "\r\n"
+        pieces = SLOT_RE.split(text)
+        self.name = name
+        self.subject = subject
+        self.is_html = is_html
+        self.content_type = "text/html" if is_html else "text/plain"
+        self.slots = pieces[1::2]
+        # Even pieces are literal text, odd ones slot names
+        self.parts = [piece if i % 2 else piece.encode("utf-8") for i, piece in enumerate(pieces)]
+        self.subject_header = Header(subject, "utf-8").encode(linesep="\r\n")
+
+    def render(self, values):
+        escape = html.escape if self.is_html else str
+        return b"".join(part if i % 2 == 0 else escape(values.get(part, "")).encode("utf-8")
+                        for i, part in enumerate(self.parts))
+
+
+def load_template(name, subject=None):
+    filename, default_subject = TEMPLATES[name]
+    path = COMUNICACIONES / filename
+    return Template(name, path.read_text(encoding="utf-8"), subject or default_subject,
+                    is_html=path.suffix == ".html")
+
+
+def ascii_word(text):
+    decomposed = unicodedata.normalize("NFD", text or "")
+    return re.sub(r"[^A-Za-z0-9]+", "", "".join(c for c in decomposed if not unicodedata.combining(c)))
+
+
+def deck_file_name(recipient):
+    """Apellido_Especialidad_Area.pptx for this speaker, as the instructions ask."""
+    surname = ascii_word((recipient.get("surname") or recipient.get("name") or "Apellido").split()[-1])
+    specialty = ascii_word(recipient.get("specialty", "").split("/")[0].title()) or "Especialidad"
+    area = ascii_word(AREA_LABELS.get(recipient.get("area", ""), recipient.get("area", ""))) or "Area"
+    return f"{surname or 'Apellido'}_{specialty}_{area}.pptx"
+
+
+def slot_values(recipient):
+    area = recipient.get("area", "")
+    return {
+        "nombre": recipient.get("name") or "colega",
+        "especialidad": recipient.get("specialty", ""),
+        "area": AREA_LABELS.get(fold(area), area),
+        "institucion": recipient.get("institution", ""),
+        "archivo": deck_file_name(recipient),
+    }
+
+
+def speaker_recipients(path=SPEAKERS_JSON):
+    """Recipients from speakers.json (email/phone are used if the entries have them)."""
+    with open(path, encoding="utf-8") as f:
+        for speaker in json.load(f):
+            yield {field: speaker.get(field, "") for field in
+                   ("id", "name", "specialty", "institution", "area", "email", "phone")}
+
+
+def csv_recipients(path):
+    """Stream the rows of an attendee CSV export as recipients."""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(f, dialect)
+        header = [CSV_COLUMNS.get(fold(column)) for column in next(reader, [])]
+        for row in reader:
+            recipient = {field: value.strip() for field, value in zip(header, row) if field}
+            if recipient.get("surname"):
+                recipient["name"] = f"{recipient.get('name', '')} {recipient['surname']}".strip()
+            recipient["area"] = fold(recipient.get("area", ""))
+            if any(recipient.values()):
+                yield recipient
+
+
+def recipient_key(recipient):
+    return (recipient.get("email", "").lower() or re.sub(r"\D", "", recipient.get("phone", ""))
+            or recipient.get("id", ""))
+
+
+def ascii_address(value):
+    """``value`` as an ASCII address for the To header and RCPT TO, or None if it is not one.
+
+    An international domain is IDNA-encoded; a non-ASCII local part would
+    need SMTPUTF8, which the relays we use do not offer.
+    """
+    local, at, domain = value.strip().rpartition("@")
+    if not at or not local:
+        return None
+    try:
+        domain = domain.encode("idna").decode("ascii")
+    except UnicodeError:
+        return None
+    address = f"{local}@{domain}"
+    return address if ADDRESS_RE.fullmatch(address) else None
+
+
+def message_bytes(template, recipient, sender_header, date):
+    """The complete RFC 5322 message for one recipient."""
+    body = template.render(slot_values(recipient))
+    digest = hashlib.sha1(f"{template.name}:{recipient_key(recipient)}".encode()).hexdigest()[:24]
+    to = formataddr((recipient.get("name", ""), recipient["email"]), "utf-8")
+    head = (f"From: {sender_header}\r\nTo: {to}\r\nSubject: {template.subject_header}\r\n"
+            f"Date: {date}\r\nMessage-ID: <{digest}@{MESSAGE_ID_DOMAIN}>\r\nMIME-Version: 1.0\r\n"
+            f"Content-Type: {template.content_type}; charset=\"utf-8\"\r\n"
+            "Content-Transfer-Encoding: 8bit\r\n\r\n")
+    return head.encode("ascii") + body
+
+
+class Progress:
+    """Append-only log of the keys already done: "ok<TAB>key[<TAB>offset]".
+
+    Lines are buffered and only written by flush(), so the caller can flush
+    the output first and the log never gets ahead of it. Failed keys are
+    logged too but retried on the next run.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.done = set()
+        self.offset = None
+        self.pending = []
+        self.resumed = self.path.exists()
+        if self.resumed:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    fields = line.rstrip("\n").split("\t")
+                    if len(fields) >= 2 and fields[0] == "ok":
+                        self.done.add(fields[1])
+                        if len(fields) > 2:
+                            self.offset = int(fields[2])
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def mark(self, key, status="ok", detail=""):
+        detail = " ".join(str(detail).split())
+        self.pending.append(f"{status}\t{key}" + (f"\t{detail}" if detail else "") + "\n")
+
+    def due(self):
+        return len(self.pending) >= FLUSH_EVERY
+
+    def flush(self, sync=True):
+        """Write the buffered lines; with ``sync``, also fsync them to disk."""
+        if self.pending:
+            self.file.write("".join(self.pending))
+            self.pending = []
+            self.file.flush()
+            if sync:
+                os.fsync(self.file.fileno())
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+class EmlSink:
+    needs = "email"
+
+    def __init__(self, folder, progress):
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+    def write(self, key, recipient, message):
+        (self.folder / (re.sub(r"[^\w.@-]", "_", key) + ".eml")).write_bytes(message)
+        return ""
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class AppendSink:
+    """Single output file; each logged message records the file size after it.
+
+    On resume the file is cut back to the last logged size, dropping the
+    messages written after the last progress flush: those are redone.
+    """
+    needs = "email"
+
+    def __init__(self, path, progress):
+        self.file = open(path, "ab")
+        if progress.resumed and self.file.tell() > (progress.offset or 0):
+            self.file.truncate(progress.offset or 0)
+
+    def write(self, key, recipient, message):
+        self.file.write(self.encode(recipient, key, message))
+        return str(self.file.tell())
+
+    def flush(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+class MboxSink(AppendSink):
+    """mbox with LF lines and ">From " quoting."""
+    FROM_RE = re.compile(rb"^(>*From )", re.M)
+    separator = b"From MAILER-DAEMON " + time.asctime(time.gmtime()).encode() + b"\n"
+
+    def encode(self, recipient, key, message):
+        body = message.replace(b"\r\n", b"\n")
+        # The regex scan is most of the cost; most messages have no such line
+        if b"From " in body:
+            body = self.FROM_RE.sub(rb">\1", body)
+        return self.separator + body + b"\n"
+
+
+class JsonlSink(AppendSink):
+    """One JSON line per recipient with the rendered text, e.g. for WhatsApp."""
+    needs = None
+
+    def encode(self, recipient, key, message):
+        body = message.split(b"\r\n\r\n", 1)[1].decode("utf-8").replace("\r\n", "\n")
+        return (json.dumps({"key": key, "name": recipient.get("name", ""), "email": recipient.get("email", ""),
+                            "phone": recipient.get("phone", ""), "text": body}, ensure_ascii=False) + "\n").encode()
+
+
+def pending_messages(template, recipients, progress, sender, needs="email", stats=None):
+    """Yield (key, recipient, message bytes) for every recipient not done yet."""
+    sender_header = formataddr(parseaddr(sender), "utf-8")
+    date = formatdate(localtime=True)
+    seen = set(progress.done)
+    stats = stats if stats is not None else {}
+    for recipient in recipients:
+        email = recipient.get("email", "")
+        if needs == "email" and "@" not in email:
+            stats["sin email"] = stats.get("sin email", 0) + 1
+            continue
+        if email:
+            address = ascii_address(email)
+            if address is None and needs == "email":
+                stats["email inválido"] = stats.get("email inválido", 0) + 1
+                continue
+            # Sinks that do not mail (JSONL) just leave a bad address out
+            recipient["email"] = address or ""
+        key = recipient_key(recipient)
+        if not key:
+            stats["sin contacto"] = stats.get("sin contacto", 0) + 1
+            continue
+        key = f"{template.name}:{key}"
+        if key in seen:
+            stats["ya hechos"] = stats.get("ya hechos", 0) + 1
+            continue
+        seen.add(key)
+        recipient.setdefault("email", "")
+        yield key, recipient, message_bytes(template, recipient, sender_header, date)
+
+
+def write_messages(messages, sink, progress):
+    """Write to a file sink, flushing output before the progress log."""
+    count = 0
+    try:
+        for key, recipient, message in messages:
+            progress.mark(key, "ok", sink.write(key, recipient, message))
+            count += 1
+            if progress.due():
+                sink.flush()
+                progress.flush()
+    finally:
+        sink.close()
+        progress.close()
+    return count
+
+
+class SmtpError(Exception):
+    def __init__(self, code, message):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+    @property
+    def permanent(self):
+        return self.code >= 500
+
+
+class SmtpClient:
+    """Minimal asyncio SMTP client: EHLO, STARTTLS/SSL, AUTH PLAIN, PIPELINING."""
+
+    def __init__(self, host, port=25, tls=None, user=None, password=None, timeout=30):
+        self.host, self.port, self.tls = host, port, tls
+        self.user, self.password = user, password
+        self.timeout = timeout
+        self.extensions = set()
+        self.reader = self.writer = None
+
+    async def connect(self):
+        context = ssl.create_default_context() if self.tls else None
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=context if self.tls == "ssl" else None),
+            self.timeout)
+        await self.expect(await self.reply(), 220, "conexión")
+        await self.ehlo()
+        if self.tls == "starttls":
+            await self.command("STARTTLS", 220)
+            await self.writer.start_tls(context)
+            await self.ehlo()
+        if self.user:
+            token = base64.b64encode(f"\0{self.user}\0{self.password or ''}".encode()).decode()
+            await self.command(f"AUTH PLAIN {token}", 235)
+
+    async def ehlo(self):
+        _, lines = await self.command("EHLO localhost", 250)
+        self.extensions = {line.split()[0].upper() for line in lines[1:] if line}
+
+    async def reply(self):
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+            if not line:
+                raise ConnectionError("el servidor SMTP cerró la conexión")
+            lines.append(line[4:].decode("utf-8", "replace").rstrip())
+            if line[3:4] != b"-":
+                return int(line[:3]), lines
+
+    async def expect(self, reply, code, what):
+        if reply[0] != code:
+            raise SmtpError(reply[0], f"{what}: {' '.join(reply[1])}")
+        return reply
+
+    async def command(self, line, code):
+        self.writer.write(line.encode() + b"\r\n")
+        return await self.expect(await self.reply(), code, line.split()[0])
+
+    async def send(self, sender, recipient, message):
+        mail = f"MAIL FROM:<{sender}>" + (" BODY=8BITMIME" if "8BITMIME" in self.extensions else "")
+        commands = [(mail, 250), (f"RCPT TO:<{recipient}>", 250), ("DATA", 354)]
+        if "PIPELINING" in self.extensions:
+            self.writer.write("".join(line + "\r\n" for line, _ in commands).encode())
+            replies = [await self.reply() for _ in commands]
+            if replies[2][0] == 354 and any(r[0] != c for r, (_, c) in zip(replies, commands)):
+                # DATA was accepted after a rejected command: the session state is unknown
+                raise ConnectionError("respuesta SMTP inconsistente")
+            for reply, (line, code) in zip(replies, commands):
+                await self.expect(reply, code, line.split()[0])
+        else:
+            for line, code in commands:
+                await self.command(line, code)
+        # Dot-stuffing; the message already ends with CRLF
+        data = message.replace(b"\r\n.", b"\r\n..")
+        self.writer.write(data + b".\r\n")
+        await self.expect(await self.reply(), 250, "DATA")
+
+    async def reset(self):
+        try:
+            await self.command("RSET", 250)
+        except (SmtpError, OSError, asyncio.TimeoutError):
+            await self.close()
+            return False
+        return True
+
+    async def close(self, quit=False):
+        if self.writer is None:
+            return
+        try:
+            if quit:
+                await self.command("QUIT", 221)
+        except (SmtpError, OSError, asyncio.TimeoutError):
+            pass
+        self.writer.close()
+        self.writer = None
+
+
+class RateLimit:
+    """Spaces sends at most ``per_second`` apart, shared by all connections."""
+
+    def __init__(self, per_second):
+        self.interval = 1 / per_second if per_second else 0
+        self.next = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self.next)
+        self.next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def deliver(messages, progress, client_factory, sender, connections=8, per_second=0,
+                  per_connection=100, retries=3):
+    """Send ``messages`` over a pool of SMTP connections; returns the stats.
+
+    Messages are rendered as the queue drains, so at most a few per
+    connection are in memory. Temporary failures (4xx, dropped connections)
+    are retried on a new connection with backoff; permanent ones (5xx) are
+    logged as errors and retried on the next run.
+    """
+    queue = asyncio.Queue(maxsize=connections * 2)
+    limiter = RateLimit(per_second)
+    stats = {"enviados": 0, "fallidos": 0, "reintentos": 0}
+    envelope_sender = parseaddr(sender)[1]
+
+    async def worker():
+        client, sent = None, 0
+        while (item := await queue.get()) is not None:
+            key, recipient, message = item
+            for attempt in range(retries + 1):
+                await limiter.wait()
+                try:
+                    if client is None:
+                        client, sent = client_factory(), 0
+                        await client.connect()
+                    await client.send(envelope_sender, recipient["email"], message)
+                except SmtpError as exc:
+                    if exc.permanent:
+                        progress.mark(key, "error", str(exc))
+                        stats["fallidos"] += 1
+                        if not await client.reset():
+                            client = None
+                        break
+                    error = exc
+                except (OSError, asyncio.TimeoutError) as exc:
+                    error = exc
+                else:
+                    progress.mark(key)
+                    stats["enviados"] += 1
+                    sent += 1
+                    if sent >= per_connection:
+                        await client.close(quit=True)
+                        client = None
+                    break
+                if client is not None:
+                    await client.close()
+                    client = None
+                stats["reintentos"] += 1
+                await asyncio.sleep(min(30, 0.5 * 2 ** attempt))
+            else:
+                progress.mark(key, "error", str(error))
+                stats["fallidos"] += 1
+            # Logged right away (written to the OS, fsynced on close): a send
+            # missing from the log would be mailed again by --reanudar
+            progress.flush(sync=False)
+        if client is not None:
+            await client.close(quit=True)
+
+    async def feed():
+        for item in messages:
+            await queue.put(item)
+        for _ in workers:
+            await queue.put(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(connections)]
+    tasks = [asyncio.create_task(feed()), *workers]
+    try:
+        # Awaited together: a worker that dies with an unexpected error
+        # ends the run here, instead of leaving feed() blocked on a full queue
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        progress.close()
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("template", metavar="plantilla", choices=sorted(TEMPLATES),
+                        help=f"Una de: {', '.join(sorted(TEMPLATES))}")
+    parser.add_argument("--speakers", nargs="?", const=str(SPEAKERS_JSON),
+                        help="Incluir a los expositores de speakers.json (o de este archivo)")
+    parser.add_argument("--csv", action="append", default=[], help="Exportación CSV de asistentes (repetible)")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--eml", metavar="CARPETA", help="Un .eml por destinatario en CARPETA")
+    output.add_argument("--mbox", metavar="ARCHIVO", help="Todos los mensajes en un mbox")
+    output.add_argument("--jsonl", metavar="ARCHIVO", help="Una línea JSON por destinatario (WhatsApp)")
+    output.add_argument("--smtp", metavar="HOST[:PUERTO]", help="Enviar por SMTP")
+    parser.add_argument("--remitente", default=DEFAULT_SENDER)
+    parser.add_argument("--asunto", help="Reemplaza el asunto de la plantilla")
+    parser.add_argument("--progreso", help="Registro de progreso (por defecto, junto a la salida)")
+    parser.add_argument("--limite", type=int, help="Procesar como máximo esta cantidad de destinatarios")
+    smtp = parser.add_argument_group("SMTP")
+    smtp.add_argument("--starttls", action="store_true")
+    smtp.add_argument("--ssl", action="store_true", help="SMTP sobre TLS directo (puerto 465)")
+    smtp.add_argument("--usuario")
+    smtp.add_argument("--clave-env", default="SMTP_PASSWORD",
+                      help="Variable de entorno con la clave (por defecto SMTP_PASSWORD)")
+    smtp.add_argument("--conexiones", type=int, default=8, help="Conexiones SMTP en paralelo")
+    smtp.add_argument("--por-segundo", type=float, default=0,
+                      help="Máximo de mensajes por segundo entre todas las conexiones (0 = sin límite)")
+    smtp.add_argument("--por-conexion", type=int, default=100,
+                      help="Reconectar después de esta cantidad de mensajes")
+    args = parser.parse_args(argv)
+    if not args.speakers and not args.csv:
+        parser.error("indicar --speakers y/o --csv")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    template = load_template(args.template, args.asunto)
+
+    def recipients():
+        if args.speakers:
+            yield from speaker_recipients(args.speakers)
+        for path in args.csv:
+            yield from csv_recipients(path)
+
+    if args.progreso:
+        progress_path = Path(args.progreso)
+    elif args.smtp:
+        progress_path = STATE_DIR / f".combinar_correos.{args.template}.progreso"
+    else:
+        progress_path = Path((args.eml or args.mbox or args.jsonl).rstrip("/") + ".progreso")
+    progress = Progress(progress_path)
+
+    sink_class = EmlSink if args.eml else MboxSink if args.mbox else JsonlSink if args.jsonl else None
+    stats = {}
+    messages = pending_messages(template, recipients(), progress, args.remitente,
+                                sink_class.needs if sink_class else "email", stats)
+    if args.limite:
+        messages = itertools.islice(messages, args.limite)
+
+    started = time.perf_counter()
+    if sink_class:
+        sink = sink_class(args.eml or args.mbox or args.jsonl, progress)
+        done = write_messages(messages, sink, progress)
+        stats["escritos"] = done
+    else:
+        host, _, port = args.smtp.partition(":")
+        tls = "ssl" if args.ssl else "starttls" if args.starttls else None
+        port = int(port) if port else 465 if args.ssl else 587 if args.starttls else 25
+        password = os.environ.get(args.clave_env)
+
+        def client():
+            return SmtpClient(host, port, tls, args.usuario, password)
+
+        stats.update(asyncio.run(deliver(messages, progress, client, args.remitente, args.conexiones,
+                                         args.por_segundo, args.por_conexion)))
+        done = stats["enviados"] + stats["fallidos"]
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed * 60 if elapsed else 0
+    print(f"{template.name}: {', '.join(f'{v} {k}' for k, v in stats.items())} "
+          f"en {elapsed:.1f}s ({rate:,.0f} por minuto)")
+    print(f"Progreso: {progress_path}")
+    if stats.get("fallidos"):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Formato compacto para los JSON generados (speakers, agenda).
+
+- Tabla de strings compartida: cada texto (área, sala, especialidad,
+  institución...) aparece una sola vez y los registros lo referencian por
+  número. Los más frecuentes tienen los números más cortos.
+- Listas de registros en columnas: los nombres de campo se escriben una vez
+  por lista y cada columna guarda sus valores seguidos. Las columnas de
+  valores casi todos distintos (nombres, ids) quedan en línea, sin pasar por
+  la tabla.
+- Columnas casi vacías (foto, bio, institución) guardan solo las filas que
+  tienen algo; el resto toma el valor por defecto de la columna.
+- Sin indentación, y con hermanos .gz y .br (si está instalado brotli)
+  para que el servidor los entregue ya comprimidos.
+
+decode() devuelve exactamente los datos originales; app.js tiene el mismo
+decodificador (decodeCompact). actualizar_datos.py anota en
+webapp/data/formatos.json qué archivos compactos publicó, así la app no los
+pide cuando no existen.
+"""
+import gzip
+from collections import Counter
+from pathlib import Path
+
+COMPACT_FORMAT = "rtcc-compact"
+COMPACT_VERSION = 1
+TABLE_KEY = "$t"
+# Column codes: index into the string table, or MISSING when the record
+# does not have the key at all
+MISSING = -1
+# String columns with more distinct values than this fraction stay inline
+INLINE_UNIQUE_RATIO = 0.5
+
+
+def is_table(value):
+    return (isinstance(value, list) and len(value) > 1
+            and all(isinstance(item, dict) for item in value))
+
+
+def string_column(records, key):
+    return all(isinstance(record[key], str) for record in records if key in record)
+
+
+def inline_column(records, key):
+    """Mostly unique strings (names, ids) are cheaper inline than in the table."""
+    present = [record[key] for record in records if key in record]
+    return len(set(present)) > len(present) * INLINE_UNIQUE_RATIO
+
+
+def count_strings(value, counter):
+    """Count the strings ``Encoder`` will put in the table (same traversal)."""
+    if is_table(value):
+        for key in dict.fromkeys(key for record in value for key in record):
+            counter[key] += 1
+            if string_column(value, key):
+                if not inline_column(value, key):
+                    counter.update(record[key] for record in value if key in record)
+            else:
+                for record in value:
+                    count_strings(record.get(key), counter)
+    elif isinstance(value, list):
+        for item in value:
+            count_strings(item, counter)
+    elif isinstance(value, dict):
+        for item in value.values():
+            count_strings(item, counter)
+
+
+def sparse_or_dense(codes):
+    """Shorter of ``{"s": codes}`` and ``{"s": [row, code, ...], "d": default}``.
+
+    Sparse rows are delta-encoded, so runs of filled rows stay cheap.
+    """
+    dense = {"s": codes}
+    default = Counter(codes).most_common(1)[0][0]
+    pairs = []
+    previous = -1
+    for row, code in enumerate(codes):
+        if code != default:
+            pairs += [row - previous, code]
+            previous = row
+    sparse = {"s": pairs, "d": default}
+    return sparse if len(str(sparse)) < len(str(dense)) else dense
+
+
+class Encoder:
+    def __init__(self, data):
+        counter = Counter()
+        count_strings(data, counter)
+        # Most frequent first, ties in order of appearance
+        self.strings = [s for s, _ in counter.most_common()]
+        self.index = {s: i for i, s in enumerate(self.strings)}
+
+    def encode(self, value):
+        if is_table(value):
+            return self.table(value)
+        if isinstance(value, list):
+            return [self.encode(item) for item in value]
+        if isinstance(value, dict):
+            if TABLE_KEY in value:
+                raise ValueError(f"Key {TABLE_KEY!r} is reserved by the compact format")
+            return {key: self.encode(item) for key, item in value.items()}
+        return value
+
+    def table(self, records):
+        keys = list(dict.fromkeys(key for record in records for key in record))
+        columns = []
+        for key in keys:
+            if string_column(records, key) and inline_column(records, key):
+                columns.append({"i": [record.get(key) for record in records]})
+            elif string_column(records, key):
+                codes = [self.index[record[key]] if key in record else MISSING for record in records]
+                columns.append(sparse_or_dense(codes))
+            else:
+                column = {"v": [self.encode(record.get(key)) for record in records]}
+                missing = [row for row, record in enumerate(records) if key not in record]
+                if missing:
+                    column["m"] = missing
+                columns.append(column)
+        return {TABLE_KEY: [self.index[key] for key in keys], "n": len(records), "c": columns}
+
+
+def encode(data):
+    encoder = Encoder(data)
+    root = encoder.encode(data)
+    return {"format": COMPACT_FORMAT, "version": COMPACT_VERSION,
+            "strings": encoder.strings, "data": root}
+
+
+def decode(doc):
+    if doc.get("format") != COMPACT_FORMAT or doc.get("version") != COMPACT_VERSION:
+        raise ValueError("Not a compact data file of a supported version")
+    strings = doc["strings"]
+
+    absent = object()
+
+    def column_values(column, n):
+        if "i" in column:
+            return [absent if v is None else v for v in column["i"]], True
+        if "s" not in column:
+            missing = set(column.get("m", ()))
+            return [absent if row in missing else value(v) for row, v in enumerate(column["v"])], True
+        if "d" not in column:
+            return column["s"], False
+        codes = [column["d"]] * n
+        row = -1
+        pairs = column["s"]
+        for i in range(0, len(pairs), 2):
+            row += pairs[i]
+            codes[row] = pairs[i + 1]
+        return codes, False
+
+    def value(v):
+        if isinstance(v, list):
+            return [value(item) for item in v]
+        if isinstance(v, dict):
+            if TABLE_KEY not in v:
+                return {key: value(item) for key, item in v.items()}
+            n = v["n"]
+            records = [{} for _ in range(n)]
+            for key_code, column in zip(v[TABLE_KEY], v["c"]):
+                key = strings[key_code]
+                values, raw = column_values(column, n)
+                for record, code in zip(records, values):
+                    if raw:
+                        if code is not absent:
+                            record[key] = code
+                    elif code != MISSING:
+                        record[key] = strings[code]
+            return records
+        return v
+
+    return value(doc["data"])
+
+
+def write_compressed_siblings(path):
+    """Write ``path.gz`` (and ``path.br`` if brotli is installed); returns their sizes."""
+    path = Path(path)
+    data = path.read_bytes()
+    sizes = {}
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    Path(str(path) + ".gz").write_bytes(gz)
+    sizes["gzip"] = len(gz)
+    try:
+        import brotli
+    except ImportError:
+        stale = Path(str(path) + ".br")
+        if stale.exists():
+            stale.unlink()
+        return sizes
+    br = brotli.compress(data, quality=11)
+    Path(str(path) + ".br").write_bytes(br)
+    sizes["br"] = len(br)
+    return sizes
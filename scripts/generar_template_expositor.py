@@ -3,13 +3,27 @@ Genera el Template Expositor.pptx para la RT International Institute Convention
 
 Crea un PPTX de 5 slides estandarizado para los expositores invitados,
 manteniendo la identidad visual del Formato Base.pptx original.
+
+Con --batch genera además un deck pre-completado por expositor a partir de
+webapp/data/speakers.json y agenda.json, en paralelo con un pool de procesos.
+
+Con --tiempos, --memoria o --perfil mide cada fase (ver instrumentacion.py).
 """
 
+import io
 import os
+import re
 import copy
+import json
+import time
 import zipfile
-import shutil
+import argparse
+import tempfile
+import functools
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from xml.sax.saxutils import escape as xml_escape
 
 from pptx import Presentation
 from pptx.util import Inches, Pt, Emu
@@ -17,11 +31,17 @@ from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN
 from lxml import etree
 
+import instrumentacion
+import rawzip
+
 # Paths
 BASE_DIR = Path(__file__).resolve().parent.parent
 FORMATO_BASE = BASE_DIR / "Presentaciones" / "Base de presentaciones" / "Formato Base.pptx"
 LOGO_PATH = BASE_DIR / "Logos" / "CONVENCION 2026 (1).png"  # Gold on transparent
 OUTPUT_PATH = BASE_DIR / "Presentaciones" / "Base de presentaciones" / "Template Expositor.pptx"
+DECKS_DIR = BASE_DIR / "Presentaciones" / "Decks expositores"
+SPEAKERS_JSON = BASE_DIR / "webapp" / "data" / "speakers.json"
+AGENDA_JSON = BASE_DIR / "webapp" / "data" / "agenda.json"
 
 # Design constants (from original PPTX analysis)
 BG_COLOR = RGBColor(0xEB, 0xEB, 0xE6)       # Beige background
@@ -32,6 +52,7 @@ GOLD_DARK = RGBColor(0xA3, 0x7B, 0x40)       # Dark gold
 
 FONT_TITLE = "Arial Unicode MS"
 FONT_BODY = "Mukti"
+FONTDATA_DEFAULT = '<Default Extension="fntdata" ContentType="application/x-fontdata"/>'
 
 # Positions (EMU) - from original analysis
 HEADER_LEFT_POS = (0, 672465)
@@ -149,19 +170,26 @@ def add_content_placeholder(slide, top=None, height=None, hint_text="Escriba su
                 hint_text, FONT_BODY, Pt(20), RGBColor(0x99, 0x99, 0x99))
 
 
-def create_slide_portada(prs):
-    """Slide 1: Portada del expositor."""
+def create_slide_portada(prs, specialty="ESPECIALIDAD",
+                         title="TÍTULO DE LA PRESENTACIÓN",
+                         name="NOMBRE DEL EXPOSITOR/A",
+                         institution="Institución / Especialidad"):
+    """Slide 1: Portada del expositor.
+
+    The defaults are the placeholders of the generic template; batch mode
+    passes the speaker's own data instead.
+    """
     slide = prs.slides.add_slide(prs.slide_layouts[6])  # Blank layout
     add_background(slide)
 
     # Large title: specialty name
     add_textbox(slide, 1028700, 3200000, 16230600, 1600000,
-                "ESPECIALIDAD", FONT_TITLE, Pt(100), TEXT_DARK,
+                specialty, FONT_TITLE, Pt(100), TEXT_DARK,
                 bold=True, alignment=PP_ALIGN.CENTER)
 
     # Case info
     add_textbox(slide, 4368979, 5200000, 9550042, 500000,
-                "TÍTULO DE LA PRESENTACIÓN", FONT_BODY, Pt(24), TEXT_DARK,
+                title, FONT_BODY, Pt(24), TEXT_DARK,
                 alignment=PP_ALIGN.CENTER)
 
     # Separator line (decorative)
@@ -174,12 +202,12 @@ def create_slide_portada(prs):
 
     # Presenter name
     add_textbox(slide, 4368979, 6100000, 9550042, 540000,
-                "NOMBRE DEL EXPOSITOR/A", FONT_BODY, Pt(32), TEXT_DARK,
+                name, FONT_BODY, Pt(32), TEXT_DARK,
                 alignment=PP_ALIGN.CENTER)
 
     # Institution
     add_textbox(slide, 4368979, 6700000, 9550042, 400000,
-                "Institución / Especialidad", FONT_BODY, Pt(24),
+                institution, FONT_BODY, Pt(24),
                 RGBColor(0x66, 0x66, 0x66), alignment=PP_ALIGN.CENTER)
 
     add_header_footer(slide)
@@ -266,67 +294,288 @@ def create_slide_fundamento(prs):
     return slide
 
 
-def main():
-    print("Generando Template Expositor.pptx...")
-
-    # Create presentation with same dimensions as original
-    prs = Presentation()
-    prs.slide_width = Emu(18288000)   # 20 inches
-    prs.slide_height = Emu(10287000)  # 11.25 inches
+def build_presentation(**portada):
+    """Create the 5-slide deck; ``portada`` overrides the cover placeholders."""
+    with instrumentacion.phase("slide build"):
+        # Create presentation with same dimensions as original
+        prs = Presentation()
+        prs.slide_width = Emu(18288000)   # 20 inches
+        prs.slide_height = Emu(10287000)  # 11.25 inches
+
+        # Create the 5 slides
+        create_slide_portada(prs, **portada)
+        create_slide_aporte(prs)
+        create_slide_decision(prs)
+        create_slide_conducta(prs)
+        create_slide_fundamento(prs)
+    return prs
+
+
+def slugify(text):
+    """ASCII file-name slug, e.g. 'Joaquín Wilkins' -> 'joaquin-wilkins'."""
+    folded = unicodedata.normalize("NFD", text).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "-", folded.lower()).strip("-")
+
+
+def speaker_cases(agenda):
+    """Map speaker ids and normalized names to the title of their first case.
+
+    A speaker belongs to a session when it is listed in ``speakers`` (by id
+    or name) or is the session's moderator.
+    """
+    cases = {}
+    for day in agenda:
+        for session in day.get("sessions", []):
+            people = list(session.get("speakers") or [])
+            if session.get("moderator"):
+                people.append(session["moderator"])
+            for person in people:
+                cases.setdefault(slugify(str(person)), session["title"])
+    return cases
+
+
+def speaker_portada(speaker, cases):
+    """Cover-slide fields for one speaker from speakers.json."""
+    specialty = speaker.get("specialty", "")
+    institution = speaker.get("institution", "")
+    return {
+        "specialty": specialty.upper() or "ESPECIALIDAD",
+        "title": (cases.get(slugify(speaker["id"]))
+                  or cases.get(slugify(speaker["name"]))
+                  or "TÍTULO DE LA PRESENTACIÓN"),
+        "name": speaker["name"],
+        "institution": " / ".join(filter(None, [institution, specialty])),
+    }
+
+
+# Cover fields that the compiled template leaves as {{slots}}
+PORTADA_FIELDS = ("specialty", "title", "name", "institution")
+
+_compiled_decks = {}
+
+
+class CompiledDeck:
+    """Serialized parts of the expositor deck, rendered once.
+
+    The deck is built with python-pptx a single time, with ``{{field}}``
+    slots in the cover text and the fonts already embedded. Every speaker
+    deck is then stamped out by writing the cached parts to a new zip and
+    substituting the slots in the few parts that contain them, without
+    rebuilding any shape or XML tree.
+    """
+
+    def __init__(self):
+        prs = build_presentation(**{field: "{{%s}}" % field for field in PORTADA_FIELDS})
+        buf = io.BytesIO()
+        save_with_fonts(prs, buf)
+        # Unchanged parts are kept compressed and copied raw into every deck
+        self.parts = []
+        self.slots = {}
+        with zipfile.ZipFile(buf) as zf:
+            for info in zf.infolist():
+                data = zf.read(info)
+                if info.filename.endswith(".xml") and b"{{" in data:
+                    self.slots[info.filename] = data.decode("utf-8")
+                    self.parts.append((info, None))
+                else:
+                    self.parts.append((info, b"".join(rawzip.raw_chunks(buf, info))))
+
+    def render(self, values, out_path):
+        """Write a deck with the cover slots filled from ``values``."""
+        replacements = [("{{%s}}" % field, xml_escape(values.get(field, "")))
+                        for field in PORTADA_FIELDS]
+        with open(out_path, "wb") as f, rawzip.RawZipWriter(f) as out_zip:
+            for info, raw in self.parts:
+                if raw is not None:
+                    out_zip.copy(info, (raw,))
+                    continue
+                text = self.slots[info.filename]
+                for slot, value in replacements:
+                    text = text.replace(slot, value)
+                out_zip.writestr(info.filename, text.encode("utf-8"), date_time=info.date_time)
+        return out_path
+
+
+def template_style_key():
+    """Everything besides the slide code that changes the rendered deck."""
+    def mtime(path):
+        return path.stat().st_mtime_ns if path.exists() else 0
+    return (str(BG_COLOR), str(TEXT_DARK), str(GOLD), str(GOLD_DARK),
+            FONT_TITLE, FONT_BODY, mtime(LOGO_PATH), mtime(FORMATO_BASE))
+
+
+def compiled_deck(layout="expositor"):
+    """Per-process cache of compiled decks keyed by layout and style."""
+    key = (layout, template_style_key())
+    if key not in _compiled_decks:
+        with instrumentacion.phase("template compile"):
+            _compiled_decks[key] = CompiledDeck()
+    return _compiled_decks[key]
+
+
+def build_speaker_deck(job):
+    """Build one speaker deck shape by shape with python-pptx (uncached path)."""
+    portada, out_path = job
+    prs = build_presentation(**portada)
+    save_with_fonts(prs, out_path)
+    return out_path
+
+
+def render_speaker_deck(job):
+    """Worker: stamp one speaker deck from the compiled template."""
+    portada, out_path = job
+    deck = compiled_deck()
+    with instrumentacion.phase("deck render"):
+        return deck.render(portada, out_path)
+
+
+def generate_speaker_decks(speakers_path, agenda_path, out_dir, workers=None):
+    """Render one pre-filled deck per speaker in a process pool."""
+    with open(speakers_path, encoding="utf-8") as f:
+        speakers = json.load(f)
+    with open(agenda_path, encoding="utf-8") as f:
+        cases = speaker_cases(json.load(f))
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [
+        (speaker_portada(s, cases), str(out_dir / f"{s['id']}-{slugify(s['name'])}.pptx"))
+        for s in speakers
+    ]
+    if not FORMATO_BASE.exists():
+        print(f"Aviso: no se encontró {FORMATO_BASE}; los decks quedan sin fuentes embebidas.")
+
+    started = time.perf_counter()
+    render = functools.partial(instrumentacion.call_in_worker, render_speaker_deck)
+    with ProcessPoolExecutor(max_workers=workers, **instrumentacion.pool_options()) as pool:
+        for done, (_, phases) in enumerate(pool.map(render, jobs, chunksize=4), 1):
+            instrumentacion.merge(phases)
+            if done % 10 == 0 or done == len(jobs):
+                print(f"  {done}/{len(jobs)} decks")
+    elapsed = time.perf_counter() - started
+    rate = len(jobs) / elapsed if elapsed else 0.0
+    print(f"{len(jobs)} decks en {elapsed:.2f}s ({rate:.1f} decks/s) -> {out_dir}")
+    instrumentacion.count(decks=len(jobs))
+    return [path for _, path in jobs]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera el Template Expositor.pptx")
+    parser.add_argument("--batch", action="store_true",
+                        help="Generar un deck pre-completado por expositor de speakers.json")
+    parser.add_argument("--speakers", default=str(SPEAKERS_JSON))
+    parser.add_argument("--agenda", default=str(AGENDA_JSON))
+    parser.add_argument("--out-dir", default=str(DECKS_DIR))
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Procesos en paralelo (por defecto, uno por núcleo)")
+    instrumentacion.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with instrumentacion.session("generar_template_expositor", args, argv):
+        generate(args)
+
+
+def generate(args):
+    if args.batch:
+        generate_speaker_decks(args.speakers, args.agenda, args.out_dir, args.workers)
+        return
 
-    # Create the 5 slides
-    create_slide_portada(prs)
-    create_slide_aporte(prs)
-    create_slide_decision(prs)
-    create_slide_conducta(prs)
-    create_slide_fundamento(prs)
+    print("Generando Template Expositor.pptx...")
+    prs = build_presentation()
 
-    # Save
+    # Save, embedding the Mukti font from the original PPTX on the way out
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    prs.save(str(OUTPUT_PATH))
+    embedded = save_with_fonts(prs, str(OUTPUT_PATH))
     print(f"Template guardado en: {OUTPUT_PATH}")
-
-    # Now embed the Mukti font from the original PPTX
-    embed_fonts_from_original(str(FORMATO_BASE), str(OUTPUT_PATH))
-    print("Fuentes embebidas copiadas del original.")
+    if embedded:
+        print("Fuentes embebidas copiadas del original.")
     print("¡Listo!")
 
 
+def embed_fonts(deck_fp, source_fp, out_fp):
+    """Write the zip in ``deck_fp`` plus the ``ppt/fonts/`` parts of ``source_fp`` to ``out_fp``.
+
+    Members are copied with their existing compression, in chunks; only
+    ``[Content_Types].xml`` is decompressed and patched to declare
+    ``.fntdata``. Returns False (writing nothing) if the source has no fonts.
+    """
+    with zipfile.ZipFile(source_fp) as src_zip:
+        fonts = [info for info in src_zip.infolist() if info.filename.startswith("ppt/fonts/")]
+        if not fonts:
+            return False
+        font_names = {info.filename for info in fonts}
+
+        with zipfile.ZipFile(deck_fp) as deck_zip, rawzip.RawZipWriter(out_fp) as out_zip:
+            for info in deck_zip.infolist():
+                if info.filename == "[Content_Types].xml":
+                    content_types = deck_zip.read(info).decode("utf-8")
+                    if "fntdata" not in content_types:
+                        content_types = content_types.replace("</Types>", FONTDATA_DEFAULT + "</Types>")
+                    out_zip.writestr(info.filename, content_types.encode("utf-8"),
+                                     date_time=info.date_time)
+                elif info.filename not in font_names:
+                    out_zip.copy(info, rawzip.raw_chunks(deck_fp, info))
+
+            for info in fonts:
+                out_zip.copy(info, rawzip.raw_chunks(source_fp, info))
+    return True
+
+
+def save_with_fonts(prs, out, font_source=None):
+    """Save ``prs`` to ``out`` (path or binary stream) with the fonts embedded.
+
+    The deck is serialized to memory by ``Presentation.save`` and rewritten
+    straight into ``out``. A path is written through a temporary file next
+    to it that then replaces it, so a failure never leaves a truncated deck
+    in place of the previous one. Returns True if fonts were embedded.
+    """
+    font_source = font_source or FORMATO_BASE
+    buf = io.BytesIO()
+    with instrumentacion.phase("save"):
+        prs.save(buf)
+    if hasattr(out, "write"):
+        return write_deck(buf, out, font_source)
+    fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(out)))
+    try:
+        with os.fdopen(fd, "wb") as out_fp:
+            embedded = write_deck(buf, out_fp, font_source)
+        # mkstemp creates the file 0600; give the deck the usual permissions
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
+        os.replace(temp_path, out)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return embedded
+
+
+def write_deck(buf, out_fp, font_source):
+    """Write the saved deck in ``buf`` to ``out_fp``, with the fonts of ``font_source`` if it exists."""
+    if Path(font_source).exists():
+        with open(font_source, "rb") as source_fp, instrumentacion.phase("font embed"):
+            if embed_fonts(buf, source_fp, out_fp):
+                return True
+    out_fp.write(buf.getvalue())
+    return False
+
+
 def embed_fonts_from_original(source_pptx, target_pptx):
-    """Copy embedded font data from source PPTX to target PPTX."""
-    import tempfile
+    """Copy embedded font data from source PPTX to target PPTX.
 
+    The result is streamed to a new file next to the target, which then
+    replaces it atomically.
+    """
     temp_path = target_pptx + ".tmp"
-    shutil.copy2(target_pptx, temp_path)
-
-    with zipfile.ZipFile(source_pptx, 'r') as src_zip:
-        font_files = [f for f in src_zip.namelist() if f.startswith('ppt/fonts/')]
-        if not font_files:
+    try:
+        with open(target_pptx, "rb") as deck_fp, open(source_pptx, "rb") as source_fp, \
+                open(temp_path, "wb") as out_fp:
+            embedded = embed_fonts(deck_fp, source_fp, out_fp)
+        if embedded:
+            os.replace(temp_path, target_pptx)
+    finally:
+        if os.path.exists(temp_path):
             os.remove(temp_path)
-            return
-
-        with zipfile.ZipFile(temp_path, 'r') as tmp_zip:
-            with zipfile.ZipFile(target_pptx, 'w', zipfile.ZIP_DEFLATED) as out_zip:
-                # Update Content_Types to include font data
-                content_types = tmp_zip.read('[Content_Types].xml').decode('utf-8')
-                if 'fntdata' not in content_types:
-                    content_types = content_types.replace(
-                        '</Types>',
-                        '<Default Extension="fntdata" ContentType="application/x-fontdata"/></Types>'
-                    )
-
-                # Copy all existing files from target (with updated Content_Types)
-                for item in tmp_zip.namelist():
-                    if item == '[Content_Types].xml':
-                        out_zip.writestr(item, content_types)
-                    else:
-                        out_zip.writestr(item, tmp_zip.read(item))
-
-                # Copy font files from source
-                for font_file in font_files:
-                    out_zip.writestr(font_file, src_zip.read(font_file))
-
-    os.remove(temp_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,298 @@
+"""
+Motor de horarios: arma la agenda a partir de una grilla de slots y la valida.
+
+La grilla sale de la hoja "Horarios" del Excel del programa, con una fila
+por slot y estas columnas (el orden no importa; acentos y mayúsculas
+tampoco):
+
+    Día | Fecha | Inicio | Fin | Sala | Área | Caso | Título | Descripción
+
+Una fila con Área y número de Caso es la discusión de ese caso: el título,
+el moderador y los expositores salen de la hoja del programa (Sheet1). Las
+demás filas (acreditación, coffee break, cena) usan su Título. Si el Excel
+no tiene la hoja, se usa DEFAULT_SCHEDULE, que reproduce la grilla
+publicada (cuatro salas en paralelo, Sala A a D).
+
+validate() revisa la agenda con un barrido por hora de inicio (O(n log n)):
+salas ocupadas dos veces, expositores o moderadores en dos sesiones a la
+vez, horarios inválidos y huecos largos en el día. Con miles de sesiones
+tarda milisegundos, así que corre en cada build.
+
+Uso: python scripts/horarios.py [agenda.json]   (valida una agenda ya generada)
+"""
+import sys
+import json
+import argparse
+from datetime import date
+from pathlib import Path
+
+from indice_busqueda import fold
+
+BASE = Path(__file__).resolve().parent.parent
+AGENDA_PATH = BASE / "webapp" / "data" / "agenda.json"
+SPEAKERS_PATH = BASE / "webapp" / "data" / "speakers.json"
+SCHEDULE_SHEET = "Horarios"
+
+AREA_LABELS = {"mama": "Mama", "neuro": "Neuro", "pulmon": "Pulmón", "prostata": "Próstata"}
+# Folded sheet header -> slot field
+HEADERS = {
+    "dia": "day", "fecha": "date", "inicio": "time", "fin": "end", "sala": "room",
+    "area": "area", "track": "area", "caso": "case", "titulo": "title", "descripcion": "description",
+}
+REQUIRED = ("day", "date", "time", "end", "room")
+# Idle stretches of the day at least this long are reported
+GAP_MINUTES = 30
+# Room placeholders that are not a real room to double-book
+UNASSIGNED_ROOMS = {"", "por confirmar", "a confirmar"}
+
+# (day, date, start, end, room, area, case, title, description)
+DEFAULT_SCHEDULE = [
+    (1, "2026-03-13", "16:00", "16:30", "Salón Principal", "evento", None, "Acreditación y bienvenida",
+     "Palabras de bienvenida y presentación del formato."),
+    (1, "2026-03-13", "16:30", "17:45", "Sala A", "mama", 1, None, None),
+    (1, "2026-03-13", "16:30", "17:45", "Sala B", "pulmon", 1, None, None),
+    (1, "2026-03-13", "16:30", "17:45", "Sala C", "prostata", 1, None, None),
+    (1, "2026-03-13", "16:30", "17:45", "Sala D", "neuro", 1, None, None),
+    (1, "2026-03-13", "17:45", "18:15", "Foyer", "mama", None, "Coffee break", None),
+    (1, "2026-03-13", "18:15", "19:30", "Sala A", "mama", 2, None, None),
+    (1, "2026-03-13", "18:15", "19:30", "Sala B", "pulmon", 2, None, None),
+    (1, "2026-03-13", "18:15", "19:30", "Sala C", "prostata", 2, None, None),
+    (1, "2026-03-13", "18:15", "19:30", "Sala D", "neuro", 2, None, None),
+    (1, "2026-03-13", "20:30", "23:00", "I'marangatú Restaurant & Beach Club", "evento", None,
+     "Cena de la Convención",
+     "Cena formal de networking en I'marangatú (Rambla C. Williman, Parada 7, Playa Mansa). "
+     "Traslado incluido desde el Gran Hotel."),
+    (2, "2026-03-14", "09:00", "10:15", "Sala A", "mama", 3, None, None),
+    (2, "2026-03-14", "09:00", "10:15", "Sala B", "pulmon", 3, None, None),
+    (2, "2026-03-14", "09:00", "10:15", "Sala C", "prostata", 3, None, None),
+    (2, "2026-03-14", "09:00", "10:15", "Sala D", "neuro", 3, None, None),
+    (2, "2026-03-14", "10:15", "10:45", "Foyer", "mama", None, "Coffee break", None),
+    (2, "2026-03-14", "10:45", "12:00", "Sala A", "mama", 4, None, None),
+    (2, "2026-03-14", "10:45", "12:00", "Sala B", "pulmon", 4, None, None),
+    (2, "2026-03-14", "10:45", "12:00", "Sala C", "prostata", 4, None, None),
+    (2, "2026-03-14", "10:45", "12:00", "Sala D", "neuro", 4, None, None),
+    (2, "2026-03-14", "12:00", "12:30", "Salón Principal", "mama", None, "Cierre y conclusiones",
+     "Síntesis de las discusiones y próximos pasos."),
+]
+SLOT_FIELDS = ("day", "date", "time", "end", "room", "area", "case", "title", "description")
+
+
+class ScheduleError(ValueError):
+    """The schedule has conflicts and the build was asked to be strict."""
+
+
+def clock_minutes(value):
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def clock(value):
+    """``HH:MM`` from a sheet cell (``16:30``, ``16:30:00`` or ``16.30``)."""
+    hours, minutes = value.replace(".", ":").split(":")[:2]
+    return f"{int(hours):02d}:{int(minutes):02d}"
+
+
+def default_slots():
+    return [dict(zip(SLOT_FIELDS, row)) for row in DEFAULT_SCHEDULE]
+
+
+def parse_schedule_sheet(rows):
+    """Slot dicts from the rows of the "Horarios" sheet (see module docstring).
+
+    Rows before the header (the first one naming Inicio and Fin) and empty
+    rows are skipped. Raises ``ValueError`` for a row that cannot be read.
+    """
+    columns = None
+    slots = []
+    for number, row in enumerate(rows, 1):
+        if columns is None:
+            named = {c: HEADERS.get(fold(v)) for c, v in enumerate(row) if HEADERS.get(fold(v))}
+            if {"time", "end"} <= set(named.values()):
+                columns = named
+                missing = [field for field in REQUIRED if field not in named.values()]
+                if missing:
+                    raise ValueError(f"Hoja {SCHEDULE_SHEET}: faltan las columnas {missing}")
+            continue
+        values = {field: row[c] for c, field in columns.items() if c < len(row) and row[c]}
+        if not values:
+            continue
+        try:
+            area = values.get("area", "")
+            slots.append({
+                "day": int(float(values["day"])),
+                "date": values["date"][:10],
+                "time": clock(values["time"]),
+                "end": clock(values["end"]),
+                "room": values["room"],
+                "area": fold(area) if area else "evento",
+                "case": int(float(values["case"])) if values.get("case") else None,
+                "title": values.get("title"),
+                "description": values.get("description"),
+            })
+        except (KeyError, ValueError) as exc:
+            raise ValueError(f"Hoja {SCHEDULE_SHEET}, fila {number}: {exc}") from None
+    if columns is None:
+        raise ValueError(f"Hoja {SCHEDULE_SHEET}: no se encontró la fila de encabezados")
+    return slots
+
+
+def make_session(time, end, area, room, title, moderator=None, desc=None, speakers=()):
+    s = {"time": time, "end": end, "area": area, "room": room, "title": title, "speakers": list(speakers)}
+    if moderator:
+        s["moderator"] = moderator
+    if desc:
+        s["description"] = desc
+    return s
+
+
+def case_title(area, num, cases):
+    idx = num - 1
+    desc = cases[idx] if len(cases) > idx and cases[idx] else ""
+    if desc == "SE ELIMINA":
+        desc = "Por confirmar"
+    label = AREA_LABELS.get(area, area)
+    if desc:
+        return f"Caso {num} — {label}: {desc}"
+    return f"Caso {num} — {label}"
+
+
+def build_agenda(slots, moderators, case_types, case_speakers=None):
+    """Agenda days from ``slots``; case slots take their title, moderator
+    and speakers from the program sheet. Sessions are ordered by start time,
+    ties in slot order.
+    """
+    case_speakers = case_speakers or {}
+    days = {}
+    for slot in slots:
+        if slot.get("case"):
+            area, num = slot["area"], slot["case"]
+            session = make_session(slot["time"], slot["end"], area, slot["room"],
+                                   case_title(area, num, case_types.get(area, [])),
+                                   moderator=moderators.get(area, ""), desc=slot.get("description"),
+                                   speakers=case_speakers.get(area, {}).get(num, ()))
+        else:
+            session = make_session(slot["time"], slot["end"], slot["area"], slot["room"],
+                                   slot.get("title") or "", desc=slot.get("description"))
+        days.setdefault((slot["day"], slot["date"]), []).append(session)
+    return [{"day": day, "date": when, "sessions": sorted(sessions, key=lambda s: clock_minutes(s["time"]))}
+            for (day, when), sessions in sorted(days.items())]
+
+
+def first_overlaps(intervals):
+    """Sweep ``(start, end, item)`` by start time: each item that starts
+    before the latest end seen so far is paired with the item holding that
+    end. O(n log n); every interval that overlaps an earlier one is reported
+    once.
+    """
+    running_end, running = None, None
+    for start, end, item in sorted(intervals, key=lambda i: (i[0], i[1])):
+        if running is not None and start < running_end:
+            yield running, item
+        if running is None or end > running_end:
+            running_end, running = end, item
+
+
+def validate(agenda, speaker_names=None, gap_minutes=GAP_MINUTES):
+    """Problems of ``agenda`` as ``{"severity", "kind", "message"}`` dicts.
+
+    Errors: unreadable or empty time ranges, rooms booked twice and people
+    (speaker ids plus moderators, by name) in two sessions at once. Warnings:
+    idle stretches of a day of at least ``gap_minutes``. ``speaker_names``
+    maps ids to names for the messages.
+    """
+    speaker_names = speaker_names or {}
+    issues = []
+    intervals = []
+    for day in agenda:
+        try:
+            offset = date.fromisoformat(day["date"]).toordinal() * 24 * 60
+        except (KeyError, TypeError, ValueError):
+            issues.append({"severity": "error", "kind": "horario",
+                           "message": f"Día {day.get('day')}: fecha inválida {day.get('date')!r}"})
+            continue
+        for session in day.get("sessions", []):
+            label = f"{day['date']} {session.get('time')} {session.get('title')!r}"
+            try:
+                start = offset + clock_minutes(session["time"])
+                end = offset + clock_minutes(session["end"])
+            except (KeyError, ValueError):
+                issues.append({"severity": "error", "kind": "horario", "message": f"{label}: horario inválido"})
+                continue
+            if end <= start:
+                issues.append({"severity": "error", "kind": "horario",
+                               "message": f"{label}: termina antes de empezar ({session['end']})"})
+                continue
+            intervals.append((start, end, day["date"], session, label))
+
+    by_room, by_person = {}, {}
+    for start, end, _, session, label in intervals:
+        room = fold(session.get("room"))
+        if room not in UNASSIGNED_ROOMS:
+            by_room.setdefault(room, []).append((start, end, label))
+        people = {fold(speaker_names.get(i, i)): speaker_names.get(i, i) for i in session.get("speakers") or []}
+        if session.get("moderator"):
+            people[fold(session["moderator"])] = session["moderator"]
+        for key, name in people.items():
+            by_person.setdefault(key, (name, []))[1].append((start, end, label))
+
+    for room_intervals in by_room.values():
+        for first, second in first_overlaps(room_intervals):
+            issues.append({"severity": "error", "kind": "sala",
+                           "message": f"Sala ocupada dos veces: {first} / {second}"})
+    for name, person_intervals in by_person.values():
+        for first, second in first_overlaps(person_intervals):
+            issues.append({"severity": "error", "kind": "persona",
+                           "message": f"{name} está en dos sesiones a la vez: {first} / {second}"})
+
+    # Gaps: merge each day's intervals in start order
+    by_date = {}
+    for start, end, when, _, _ in intervals:
+        by_date.setdefault(when, []).append((start, end))
+    for when, day_intervals in sorted(by_date.items()):
+        day_intervals.sort()
+        covered_end = day_intervals[0][1]
+        for start, end in day_intervals[1:]:
+            if start - covered_end >= gap_minutes:
+                issues.append({"severity": "warning", "kind": "hueco",
+                               "message": f"{when}: {start - covered_end} min sin actividad "
+                                          f"entre {minutes_clock(covered_end)} y {minutes_clock(start)}"})
+            covered_end = max(covered_end, end)
+    return issues
+
+
+def minutes_clock(minutes):
+    minutes %= 24 * 60
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def print_issues(issues):
+    errors = sum(issue["severity"] == "error" for issue in issues)
+    if not issues:
+        print("Agenda validada: sin conflictos")
+        return
+    print(f"Agenda: {errors} conflictos, {len(issues) - errors} avisos")
+    for issue in issues:
+        marker = "ERROR" if issue["severity"] == "error" else "aviso"
+        print(f"  [{marker}] {issue['message']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Valida una agenda ya generada")
+    parser.add_argument("agenda", nargs="?", default=str(AGENDA_PATH))
+    parser.add_argument("--speakers", default=str(SPEAKERS_PATH), help="Para mostrar nombres en vez de ids")
+    args = parser.parse_args(argv)
+
+    with open(args.agenda, encoding="utf-8") as f:
+        agenda = json.load(f)
+    try:
+        with open(args.speakers, encoding="utf-8") as f:
+            names = {s["id"]: s["name"] for s in json.load(f)}
+    except (OSError, ValueError):
+        names = {}
+    issues = validate(agenda, names)
+    print_issues(issues)
+    sys.exit(1 if any(issue["severity"] == "error" for issue in issues) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Arma la versión para publicar de la webapp con huellas de contenido.
+
+Copia webapp/ a dist/ y:
+
+- Renombra los CSS, JS y el manifest.json con el hash de su contenido
+  (js/app.3f2a9c1b04.js) y actualiza las referencias en index.html. Con el
+  hash en el nombre, servidor.py los entrega como inmutables y el service
+  worker los sirve desde su caché sin consultar la red.
+- Calcula el hash del resto de lo que la app necesita sin conexión
+  (index.html, logos, QR, datos y las fotos de expositores que usa
+  speakers.json) y escribe la lista de precarga dentro de dist/sw.js,
+  junto con la versión de la caché, derivada de todos esos hashes.
+
+Al publicar una versión nueva, el service worker descarga solo los
+archivos cuyo hash cambió; el resto lo copia de la caché anterior.
+
+La carpeta de salida se reemplaza entera, así que solo se acepta una que no
+exista, esté vacía o sea una salida anterior (tiene el archivo
+.huellas_assets), y nunca webapp/ ni una carpeta que la contenga.
+
+Uso: python scripts/huellas_assets.py [--out dist]
+     python scripts/servidor.py 8080 --root dist
+"""
+import re
+import json
+import shutil
+import hashlib
+import argparse
+from pathlib import Path
+
+from formato_compacto import write_compressed_siblings
+
+BASE = Path(__file__).resolve().parent.parent
+WEBAPP_DIR = BASE / "webapp"
+DIST_DIR = BASE / "dist"
+SW_NAME = "sw.js"
+HASH_LENGTH = 10
+
+# Source folders that are not part of the site
+EXCLUDE_DIRS = {"Programa"}
+COMPRESSED_SUFFIXES = (".gz", ".br")
+# Only referenced from index.html, so they can be renamed
+FINGERPRINT_GLOBS = ("css/*.css", "js/*.js", "manifest.json")
+# Precached besides the renamed assets and the speaker photos
+PRECACHE_GLOBS = ("index.html", "img/*.png", "img/*.svg", "qr/*.png", "data/*.json")
+REFERENCE_RE = re.compile(r'(\b(?:src|href)=")([^"#?:]+)((?:[?#][^"]*)?")')
+MANIFEST_PLACEHOLDER = "const PRECACHE_MANIFEST = null;"
+# Written into every output folder: only a folder that has it is replaced
+BUILD_MARKER = ".huellas_assets"
+
+
+def file_hash(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:HASH_LENGTH]
+
+
+def fingerprinted_name(rel, digest):
+    path = Path(rel)
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+
+
+def site_files(root):
+    """Webapp-relative paths of every file that goes to the site."""
+    files = []
+    for path in sorted(root.rglob("*")):
+        rel = path.relative_to(root)
+        if path.is_file() and rel.parts[0] not in EXCLUDE_DIRS \
+                and path.suffix not in COMPRESSED_SUFFIXES:
+            files.append(rel.as_posix())
+    return files
+
+
+def speaker_photos(root):
+    """Local photos the app shows: the original, or its photoSet variants at the ``src`` width."""
+    try:
+        with open(root / "data" / "speakers.json", encoding="utf-8") as f:
+            speakers = json.load(f)
+    except (OSError, ValueError):
+        return []
+    photos = []
+    for speaker in speakers:
+        photo_set = speaker.get("photoSet")
+        if photo_set:
+            width = photo_set["src"].rsplit("-", 1)[-1].split(".")[0]
+            for key, value in photo_set.items():
+                if key in ("source", "src", "placeholder"):
+                    continue
+                photos += [candidate.split()[0] for candidate in value.split(", ")
+                           if candidate.endswith(f" {width}w")]
+        else:
+            photos.append((speaker.get("photo") or "").strip().removeprefix("./"))
+    return [rel for rel in photos if rel and (root / rel).is_file()]
+
+
+def rewrite_references(html, renamed):
+    def replace(match):
+        rel = match.group(2).removeprefix("./")
+        if rel not in renamed:
+            return match.group(0)
+        return match.group(1) + renamed[rel] + match.group(3)
+    return REFERENCE_RE.sub(replace, html)
+
+
+def check_out_dir(out_dir, source_dir=WEBAPP_DIR):
+    """Raise ValueError unless ``out_dir`` is safe to replace entirely.
+
+    It may not overlap the source (inside it or one of its ancestors, such
+    as the repo root) and, if it exists, must be empty or an earlier output.
+    """
+    out_dir, source_dir = Path(out_dir).resolve(), Path(source_dir).resolve()
+    if out_dir == source_dir or source_dir in out_dir.parents or out_dir in source_dir.parents:
+        raise ValueError(f"{out_dir} se superpone con {source_dir}")
+    if out_dir.exists() and not (out_dir / BUILD_MARKER).is_file():
+        if not out_dir.is_dir() or any(out_dir.iterdir()):
+            raise ValueError(f"{out_dir} existe y no es una salida de huellas_assets.py "
+                             f"(falta {BUILD_MARKER}; si es una salida anterior, borrarla a mano)")
+
+
+def build(out_dir=DIST_DIR, source_dir=WEBAPP_DIR):
+    """Write the fingerprinted site to ``out_dir``; returns the precache manifest."""
+    check_out_dir(out_dir, source_dir)
+    files = site_files(source_dir)
+    fingerprint = {rel for pattern in FINGERPRINT_GLOBS
+                   for rel in (p.relative_to(source_dir).as_posix() for p in source_dir.glob(pattern))}
+    renamed = {rel: fingerprinted_name(rel, file_hash(source_dir / rel)) for rel in sorted(fingerprint)}
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    out_dir.mkdir(parents=True)
+    (out_dir / BUILD_MARKER).write_text("", encoding="utf-8")
+    for rel in files:
+        target = out_dir / renamed.get(rel, rel)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source_dir / rel, target)
+        if rel in renamed:
+            write_compressed_siblings(target)
+        else:
+            # Keep precompressed siblings of files that keep their name
+            for suffix in COMPRESSED_SUFFIXES:
+                sibling = source_dir / (rel + suffix)
+                if sibling.exists():
+                    shutil.copy2(sibling, out_dir / (rel + suffix))
+
+    index_path = out_dir / "index.html"
+    index_path.write_text(rewrite_references(index_path.read_text(encoding="utf-8"), renamed),
+                          encoding="utf-8")
+
+    # Renamed assets carry their hash in the URL; the rest are tracked by revision
+    assets = {name: None for name in renamed.values()}
+    precache = {rel for pattern in PRECACHE_GLOBS
+                for rel in (p.relative_to(out_dir).as_posix() for p in out_dir.glob(pattern))}
+    precache.update(speaker_photos(out_dir))
+    for rel in sorted(precache):
+        if rel not in assets:
+            assets[rel] = file_hash(out_dir / rel)
+    assets = dict(sorted(assets.items()))
+    version = hashlib.sha256(json.dumps(assets, sort_keys=True).encode("utf-8")).hexdigest()[:HASH_LENGTH]
+    manifest = {"version": version, "assets": assets}
+
+    sw_path = out_dir / SW_NAME
+    sw = sw_path.read_text(encoding="utf-8")
+    if MANIFEST_PLACEHOLDER not in sw:
+        raise ValueError(f"{SW_NAME} does not contain {MANIFEST_PLACEHOLDER!r}")
+    sw = sw.replace(MANIFEST_PLACEHOLDER,
+                    f"const PRECACHE_MANIFEST = {json.dumps(manifest, separators=(',', ':'))};")
+    sw_path.write_text(sw, encoding="utf-8")
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Arma la webapp para publicar, con huellas de contenido")
+    parser.add_argument("--out", default=str(DIST_DIR), help="Carpeta de salida (se reemplaza entera)")
+    args = parser.parse_args(argv)
+
+    out_dir = Path(args.out).resolve()
+    try:
+        check_out_dir(out_dir)
+    except ValueError as exc:
+        parser.error(f"--out: {exc}")
+    manifest = build(out_dir)
+    assets = manifest["assets"]
+    size = sum((out_dir / rel).stat().st_size for rel in assets)
+    print(f"{out_dir}: versión {manifest['version']}")
+    print(f"  {sum(rev is None for rev in assets.values())} assets con hash en el nombre, "
+          f"{len(assets)} en precarga ({size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
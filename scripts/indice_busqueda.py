@@ -0,0 +1,143 @@
+"""
+Índice de búsqueda de expositores, generado junto a speakers.json.
+
+Cada campo buscable (nombre, especialidad, institución y área) se normaliza
+igual que normalizeText() en app.js (sin acentos, en minúsculas) y se parte
+en palabras. De cada palabra se indexan todos sus fragmentos de 2 y 3
+caracteres; cada fragmento apunta a los ordinales (posición en
+speakers.json) de los expositores que lo contienen, como lista de deltas o,
+si es más corto (fragmentos muy comunes), como mapa de bits en base64.
+
+Una consulta se resuelve intersectando listas: un fragmento de 2 o 3
+letras se busca directo y uno más largo por sus trigramas (una sola letra
+no filtra: casi todos los expositores la contienen). El resultado es un
+superconjunto de los expositores cuyo campo contiene el texto buscado; la
+app confirma cada candidato con la misma comparación que hacía antes sobre
+toda la lista.
+"""
+import re
+import base64
+import unicodedata
+
+INDEX_VERSION = 1
+FIELDS = ("name", "specialty", "institution", "area")
+MIN_GRAM = 2
+GRAM = 3
+WORD_RE = re.compile(r"[^\W_]+")
+
+
+def fold(value):
+    """Accent-folded lowercase text, same as ``normalizeText()`` in app.js."""
+    decomposed = unicodedata.normalize("NFD", str(value or ""))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower().strip()
+
+
+def words(text):
+    return WORD_RE.findall(text)
+
+
+def word_grams(word):
+    """Every substring of ``word`` of ``MIN_GRAM`` to ``GRAM`` characters."""
+    return {word[i:i + n] for n in range(MIN_GRAM, GRAM + 1) for i in range(len(word) - n + 1)}
+
+
+def query_grams(piece):
+    """Grams that every word containing ``piece`` must also contain."""
+    if len(piece) < MIN_GRAM:
+        return []
+    if len(piece) <= GRAM:
+        return [piece]
+    return [piece[i:i + GRAM] for i in range(len(piece) - GRAM + 1)]
+
+
+def encode_postings(ordinals, count):
+    """Sorted ordinals -> delta list, or a base64 bitmap string when shorter."""
+    previous = 0
+    deltas = []
+    for ordinal in ordinals:
+        deltas.append(ordinal - previous)
+        previous = ordinal
+    bitmap = bytearray((count + 7) // 8)
+    for ordinal in ordinals:
+        bitmap[ordinal >> 3] |= 1 << (ordinal & 7)
+    packed = base64.b64encode(bytes(bitmap)).decode("ascii")
+    return packed if len(packed) + 2 < len(str(deltas).replace(" ", "")) else deltas
+
+
+def decode_postings(value):
+    if isinstance(value, str):
+        bitmap = base64.b64decode(value)
+        return [i for i in range(len(bitmap) * 8) if bitmap[i >> 3] & (1 << (i & 7))]
+    ordinals = []
+    total = 0
+    for delta in value:
+        total += delta
+        ordinals.append(total)
+    return ordinals
+
+
+def build_search_index(speakers):
+    """Index dict for ``speakers`` (the list written to speakers.json)."""
+    postings = {}
+    for ordinal, speaker in enumerate(speakers):
+        grams = set()
+        for field in FIELDS:
+            for word in words(fold(speaker.get(field))):
+                grams |= word_grams(word)
+        for gram in grams:
+            postings.setdefault(gram, []).append(ordinal)
+    return {
+        "version": INDEX_VERSION,
+        "fields": list(FIELDS),
+        "gram": [MIN_GRAM, GRAM],
+        "ids": [s["id"] for s in speakers],
+        "postings": {gram: encode_postings(ordinals, len(speakers)) for gram, ordinals in sorted(postings.items())},
+    }
+
+
+def matches(speaker, term):
+    """The app's per-record check: some field contains the folded term."""
+    needle = fold(term)
+    return any(needle in fold(speaker.get(field)) for field in FIELDS)
+
+
+class SearchIndex:
+    """Lookups over a loaded index, mirroring what app.js does with it.
+
+    Decoded posting lists and the folded fields of each speaker are cached,
+    so a keystroke costs a few set intersections plus one substring check
+    per candidate. Raises ``ValueError`` if the index does not belong to
+    ``speakers`` (other version or other speaker order).
+    """
+
+    def __init__(self, index, speakers):
+        if index.get("version") != INDEX_VERSION or index.get("ids") != [s["id"] for s in speakers]:
+            raise ValueError("Search index does not match speakers.json")
+        self.postings = index["postings"]
+        self.folded = [tuple(fold(s.get(field)) for field in FIELDS) for s in speakers]
+        self._decoded = {}
+
+    def posting(self, gram):
+        ordinals = self._decoded.get(gram)
+        if ordinals is None:
+            ordinals = self._decoded[gram] = frozenset(decode_postings(self.postings.get(gram, ())))
+        return ordinals
+
+    def candidates(self, term):
+        """Ordinals that may match ``term``; ``None`` if the index cannot narrow it."""
+        grams = {g for piece in words(fold(term)) for g in query_grams(piece)}
+        if not grams:
+            return None
+        result = None
+        for gram in sorted(grams, key=lambda g: -len(g)):
+            result = self.posting(gram) if result is None else result & self.posting(gram)
+            if not result:
+                break
+        return result
+
+    def search(self, term):
+        """Sorted ordinals of the speakers matching ``term``."""
+        needle = fold(term)
+        candidates = self.candidates(term)
+        ordinals = range(len(self.folded)) if candidates is None else sorted(candidates)
+        return [i for i in ordinals if any(needle in value for value in self.folded[i])]
@@ -0,0 +1,281 @@
+"""
+Instrumentación opcional de los scripts de datos y decks.
+
+Mide cada fase con nombre (tiempo total y propio, cantidad de llamadas y,
+con --memoria, el pico de memoria de Python dentro de la fase), registra
+el pico de memoria del proceso, puede volcar un perfil de cProfile y
+escribe un reporte JSON de la corrida. Si el reporte termina en .jsonl se
+agrega una línea por corrida, para llevar el historial en CI.
+
+Sin ninguna de las opciones no se mide nada: phase() es un contexto vacío.
+
+    with instrumentacion.session("actualizar_datos", args):
+        with instrumentacion.phase("grid parse"):
+            ...
+"""
+import sys
+import json
+import time
+import platform
+import contextlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPORT_VERSION = 1
+
+_run = None
+
+
+class Run:
+    """Phase timings of one script run (or of one pool worker)."""
+
+    def __init__(self, memory=False, profile_path=None):
+        self.memory = memory
+        self.profile_path = profile_path
+        self.profiler = None
+        self.phases = {}
+        self.worker_phases = {}
+        self.counts = {}
+        # Open phases: [key, start, child seconds, peak of the finished children]
+        self.stack = []
+        self.started = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc)
+
+    def start(self):
+        if self.memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.profile_path:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop(self):
+        if self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.profile_path)
+        if self.memory:
+            import tracemalloc
+            tracemalloc.stop()
+
+    def enter(self, name):
+        parent = self.stack[-1][0][1] if self.stack else None
+        key = (parent, name)
+        if self.memory:
+            import tracemalloc
+            # Fold the parent's peak so far into it before resetting
+            if self.stack:
+                self.stack[-1][3] = max(self.stack[-1][3], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        # Registered on entry, so the report lists parents before their children
+        self.phases.setdefault(key, {"calls": 0, "seconds": 0.0, "selfSeconds": 0.0})
+        self.stack.append([key, time.perf_counter(), 0.0, 0])
+
+    def exit(self):
+        key, started, children, peak = self.stack.pop()
+        seconds = time.perf_counter() - started
+        if self.stack:
+            self.stack[-1][2] += seconds
+        entry = self.phases[key]
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        entry["selfSeconds"] += seconds - children
+        if self.memory:
+            import tracemalloc
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            entry["peakKB"] = max(entry.get("peakKB", 0), peak // 1024)
+            if self.stack:
+                self.stack[-1][3] = max(self.stack[-1][3], peak)
+
+    def take(self):
+        """Phases recorded so far as a picklable list; clears them."""
+        phases, self.phases = self.phases, {}
+        return [(parent, name, entry) for (parent, name), entry in phases.items()]
+
+    def merge(self, records):
+        """Add the phases a pool worker recorded (see call_in_worker)."""
+        for parent, name, entry in records or ():
+            total = self.worker_phases.setdefault((parent, name), {"calls": 0, "seconds": 0.0, "selfSeconds": 0.0})
+            for field in ("calls", "seconds", "selfSeconds"):
+                total[field] += entry[field]
+            if "peakKB" in entry:
+                total["peakKB"] = max(total.get("peakKB", 0), entry["peakKB"])
+
+    def self_seconds(self):
+        """Self time per phase name, summed over every parent it ran under."""
+        totals = {}
+        for (_, name), entry in self.phases.items():
+            totals[name] = totals.get(name, 0.0) + entry["selfSeconds"]
+        return totals
+
+    def report(self, script, argv):
+        return {
+            "version": REPORT_VERSION,
+            "script": script,
+            "argv": argv,
+            "startedAt": self.started_at.isoformat(timespec="seconds"),
+            "seconds": round(time.perf_counter() - self.started, 4),
+            "python": platform.python_version(),
+            "phases": phase_list(self.phases),
+            # Summed over all the pool workers, so they can exceed the wall time
+            "workerPhases": phase_list(self.worker_phases),
+            "peakRssKB": peak_rss_kb(),
+            "workersPeakRssKB": peak_rss_kb(children=True),
+            "counts": self.counts,
+            "profile": str(self.profile_path) if self.profile_path else None,
+        }
+
+
+def phase_list(phases):
+    return [{"phase": name, "parent": parent, **{k: round(v, 4) if isinstance(v, float) else v
+                                                  for k, v in entry.items()}}
+            for (parent, name), entry in phases.items()]
+
+
+def peak_rss_kb(children=False):
+    """Peak resident memory of this process (or of its finished children), in KB."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is in bytes on macOS, in KB elsewhere
+    return usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+
+
+def enabled():
+    return _run is not None
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Time the block as phase ``name``, nested under the enclosing phase."""
+    run = _run
+    if run is None:
+        yield
+        return
+    run.enter(name)
+    try:
+        yield
+    finally:
+        run.exit()
+
+
+def timed_iter(name, iterable):
+    """Iterate ``iterable``, timing only the time spent producing items.
+
+    For lazy readers (e.g. the workbook rows): the time spent on each row
+    by the consumer is not charged to ``name``.
+    """
+    if _run is None:
+        return iterable
+    return _timed_iter(name, iter(iterable))
+
+
+def _timed_iter(name, iterator):
+    while True:
+        with phase(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def count(**counts):
+    """Record result sizes (speakers, sessions, decks...) in the report."""
+    if _run is not None:
+        _run.counts.update(counts)
+
+
+def worker_init(memory):
+    """ProcessPoolExecutor initializer: record phases in the worker too."""
+    global _run
+    _run = Run(memory=memory)
+    _run.start()
+
+
+def pool_options():
+    """initializer/initargs for a ProcessPoolExecutor, if instrumentation is on."""
+    if _run is None:
+        return {}
+    return {"initializer": worker_init, "initargs": (_run.memory,)}
+
+
+def call_in_worker(fn, *args):
+    """Run ``fn(*args)`` in a pool worker; returns (result, recorded phases)."""
+    result = fn(*args)
+    return result, (_run.take() if _run is not None else None)
+
+
+def merge(records):
+    if _run is not None:
+        _run.merge(records)
+
+
+def add_arguments(parser):
+    group = parser.add_argument_group("instrumentación")
+    group.add_argument("--tiempos", metavar="ARCHIVO",
+                       help="Escribir un reporte JSON con el tiempo de cada fase "
+                            "(si termina en .jsonl, se agrega una línea por corrida)")
+    group.add_argument("--memoria", action="store_true",
+                       help="Medir también el pico de memoria de cada fase (más lento)")
+    group.add_argument("--perfil", metavar="ARCHIVO",
+                       help="Volcar un perfil de cProfile del proceso principal (ver con pstats)")
+
+
+def print_phases(report):
+    print("Fases:")
+    for title, key in (("", "phases"), (" (suma de los workers)", "workerPhases")):
+        for entry in report[key]:
+            indent = "    " if entry["parent"] else "  "
+            memory = f", pico {entry['peakKB'] / 1024:.1f} MB" if "peakKB" in entry else ""
+            print(f"{indent}{entry['phase']}{title}: {entry['seconds']:.3f}s"
+                  f" (propio {entry['selfSeconds']:.3f}s, {entry['calls']}x{memory})")
+    if report["peakRssKB"]:
+        workers = (f", {report['workersPeakRssKB'] / 1024:.1f} MB en el worker más grande"
+                   if report["workerPhases"] else "")
+        print(f"Memoria máxima: {report['peakRssKB'] / 1024:.1f} MB{workers}")
+
+
+@contextlib.contextmanager
+def record(memory=False, profile_path=None):
+    """Record the phases of the enclosed block; yields the Run."""
+    global _run
+    run = _run = Run(memory=memory, profile_path=profile_path)
+    run.start()
+    try:
+        yield run
+    finally:
+        _run = None
+        run.stop()
+
+
+@contextlib.contextmanager
+def session(script, args, argv=None):
+    """Instrument the enclosed run if ``args`` asked for it (see add_arguments).
+
+    The report is written even if the run ends with SystemExit or an error.
+    """
+    if not (args.tiempos or args.memoria or args.perfil):
+        yield
+        return
+    run = None
+    try:
+        with record(args.memoria, args.perfil) as run:
+            yield
+    finally:
+        # Still None if record() itself failed: no report, and its error goes through
+        if run is not None:
+            report = run.report(script, sys.argv[1:] if argv is None else list(argv))
+            print_phases(report)
+            if args.tiempos:
+                path = Path(args.tiempos)
+                if path.suffix == ".jsonl":
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(report, ensure_ascii=False) + "\n")
+                else:
+                    path.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+                print(f"Reporte de tiempos: {path}")
+            if args.perfil:
+                print(f"Perfil: {args.perfil}")
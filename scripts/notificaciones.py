@@ -0,0 +1,167 @@
+"""
+Publica avisos para los asistentes en el registro de notificaciones.
+
+webapp/data/notifications.jsonl es un registro de solo agregado: una
+notificación por línea, con ids crecientes. servidor.py lo sigue y envía a
+cada app conectada (Server-Sent Events en /events/notifications) solo las
+entradas posteriores al último id que recibió, en menos de un segundo.
+
+Cada publicación también regenera notifications.json, que sigue siendo lo
+que leen la carga inicial, el paquete de publicar_datos.py y los clientes
+sin conexión al servidor. Si ya hay un paquete publicado
+(webapp/data/bundle/latest.json), se publica una versión nueva, así los
+clientes de un hosting estático sin servidor.py también la ven; con
+--sin-paquete queda para la próxima corrida de publicar_datos.py. La primera
+vez, el registro se inicia con las notificaciones que ya tenga
+notifications.json.
+
+Uso: python scripts/notificaciones.py publicar "Título" "Mensaje" [--prioridad high]
+     python scripts/notificaciones.py listar [--desde 12]
+"""
+import sys
+import json
+import argparse
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import publicar_datos
+from actualizar_datos import write_if_changed
+
+BASE = Path(__file__).resolve().parent.parent
+NOTIFICATIONS_JSON = BASE / "webapp" / "data" / "notifications.json"
+NOTIFICATIONS_LOG = BASE / "webapp" / "data" / "notifications.jsonl"
+PRIORITIES = ("normal", "high")
+
+
+def parse_log(text):
+    """Entries of a log's text; a trailing line without newline is still being written.
+
+    Lines that are not a notification (damaged by hand or by a crashed
+    writer) are reported on stderr and skipped, as servidor.py does.
+    """
+    complete = text[:text.rfind("\n") + 1]
+    entries = []
+    for number, line in enumerate(complete.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+            int(entry["id"])
+        except (ValueError, KeyError, TypeError):
+            print(f"Aviso: línea {number} del registro ilegible, se ignora", file=sys.stderr)
+            continue
+        entries.append(entry)
+    return entries
+
+
+def read_log(path=NOTIFICATIONS_LOG):
+    try:
+        return parse_log(Path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return []
+
+
+def log_line(entry):
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+@contextmanager
+def locked(path):
+    """Exclusive lock on ``path`` so concurrent publishers get distinct ids (POSIX only)."""
+    with open(path, "a+", encoding="utf-8") as f:
+        try:
+            import fcntl
+        except ImportError:
+            yield f
+            return
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield f
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def seed_log(f, json_path):
+    """Start the empty, locked log ``f`` from notifications.json; returns its entries."""
+    existing = []
+    if json_path:
+        try:
+            with open(json_path, encoding="utf-8") as source:
+                existing = json.load(source)
+        except (OSError, ValueError):
+            pass
+    existing = sorted(existing, key=lambda e: e["id"])
+    f.write("".join(log_line(e) for e in existing))
+    return existing
+
+
+def write_json(entries, json_path=NOTIFICATIONS_JSON):
+    # Same layout as the hand-edited file
+    return write_if_changed(json_path, json.dumps(entries, indent=2) + "\n")
+
+
+def append(title, message, priority="normal", when=None,
+           path=NOTIFICATIONS_LOG, json_path=NOTIFICATIONS_JSON):
+    """Append one notification with the next id; returns the entry."""
+    when = when or datetime.now()
+    with locked(path) as f:
+        f.seek(0)
+        text = f.read()
+        if text and not text.endswith("\n"):
+            # A partial last line (a writer died mid-line): drop it, or the
+            # next entry would be glued to it
+            text = text[:text.rfind("\n") + 1]
+            f.truncate(len(text.encode("utf-8")))
+        # Seeded under the lock, so a concurrent first publish cannot seed twice
+        entries = parse_log(text) if text else seed_log(f, json_path)
+        entry = {
+            "id": max((e["id"] for e in entries), default=0) + 1,
+            "date": when.strftime("%Y-%m-%d"),
+            "time": when.strftime("%H:%M"),
+            "title": title,
+            "message": message,
+            "priority": priority,
+        }
+        # One write of a whole line: readers never see half an entry
+        f.write(log_line(entry))
+        f.flush()
+        entries.append(entry)
+        if json_path:
+            write_json(entries, json_path)
+    return entry
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publica notificaciones para los asistentes")
+    commands = parser.add_subparsers(dest="command", required=True)
+    publish = commands.add_parser("publicar", help="Agregar una notificación al registro")
+    publish.add_argument("title", metavar="titulo")
+    publish.add_argument("message", metavar="mensaje")
+    publish.add_argument("--prioridad", dest="priority", choices=PRIORITIES, default="normal",
+                         help="high la muestra además como banner")
+    publish.add_argument("--sin-paquete", dest="bundle", action="store_false",
+                         help="No publicar una versión nueva del paquete de publicar_datos.py")
+    listing = commands.add_parser("listar", help="Mostrar las notificaciones publicadas")
+    listing.add_argument("--desde", dest="since", type=int, default=0,
+                         help="Solo las posteriores a este id")
+    args = parser.parse_args(argv)
+
+    if args.command == "publicar":
+        entry = append(args.title, args.message, args.priority)
+        print(f"Publicada #{entry['id']} ({entry['date']} {entry['time']}): {entry['title']}")
+        if args.bundle and publicar_datos.LATEST_PATH.exists():
+            publicar_datos.publish()
+        return
+    entries = read_log()
+    if not entries and NOTIFICATIONS_JSON.exists():
+        with open(NOTIFICATIONS_JSON, encoding="utf-8") as f:
+            entries = json.load(f)
+    for entry in entries:
+        if entry["id"] > args.since:
+            marker = "!" if entry.get("priority") == "high" else " "
+            print(f"{marker}#{entry['id']:<4} {entry['date']} {entry['time']}  {entry['title']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Optimiza las fotos de los expositores para la webapp.
+
+Para cada foto referenciada en speakers.json (y cualquier otra en
+webapp/img/speakers/) genera recortes cuadrados en varios anchos, en AVIF
+(si Pillow lo soporta), WebP y JPEG de respaldo, sin metadatos, más un
+placeholder borroso de pocos bytes para mostrar inline mientras carga.
+El resultado queda en webapp/img/speakers/opt/ y el manifiesto de cada foto
+se escribe en speakers.json como "photoSet" (listo para srcset).
+
+Es incremental: una foto cuyo contenido no cambió no se vuelve a procesar.
+Con --remote también descarga y procesa fotos con URL http(s), como las
+subidas a Supabase.
+"""
+import io
+import json
+import base64
+import hashlib
+import argparse
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageOps, features
+
+from actualizar_datos import SPEAKERS_OUT, dump_json, write_if_changed
+
+BASE = Path(__file__).resolve().parent.parent
+WEBAPP_DIR = BASE / "webapp"
+PHOTOS_DIR = WEBAPP_DIR / "img" / "speakers"
+OUT_DIR = PHOTOS_DIR / "opt"
+STATE_PATH = BASE / "scripts" / ".optimizar_fotos.state.json"
+STATE_VERSION = 1
+
+# 1x/2x/3x of the 96px detail photo (the grid shows them at 72px)
+WIDTHS = (96, 192, 288)
+GRID_WIDTH = 192
+PLACEHOLDER_SIZE = 16
+PHOTO_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+FORMATS = [
+    # (key, extension, Pillow format, save options)
+    ("avif", "avif", "AVIF", {"quality": 50}),
+    ("webp", "webp", "WEBP", {"quality": 75, "method": 6}),
+    ("jpeg", "jpg", "JPEG", {"quality": 80, "optimize": True, "progressive": True}),
+]
+if not features.check("avif"):
+    FORMATS = FORMATS[1:]
+
+
+def encode(img, fmt, options):
+    buf = io.BytesIO()
+    img.save(buf, fmt, **options)
+    return buf.getvalue()
+
+
+def flatten(img):
+    """RGB copy of ``img`` with any transparency composited onto white.
+
+    A plain convert("RGB") drops the alpha channel and leaves the transparent
+    areas black.
+    """
+    if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info:
+        rgba = img.convert("RGBA")
+        img = Image.alpha_composite(Image.new("RGBA", rgba.size, (255, 255, 255, 255)), rgba)
+    return img.convert("RGB")
+
+
+def process_photo(job):
+    """Worker: (source, photoSet, sizes) of one photo, or (source, None, error).
+
+    An unreadable or corrupt image is returned as a failure instead of
+    raising, so it does not abort the pool and the other photos are saved.
+    """
+    source = job[0]
+    try:
+        return optimize_photo(*job)
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        # UnidentifiedImageError is an OSError
+        return source, None, f"{type(exc).__name__}: {exc}"
+
+
+def optimize_photo(source, data, stem):
+    """Write every variant of one photo, return its photoSet and sizes.
+
+    The photo is cropped to a centered square (what ``object-fit: cover``
+    shows in the round frames). No EXIF, XMP or ICC data is written out.
+    """
+    with Image.open(io.BytesIO(data)) as img:
+        img = flatten(ImageOps.exif_transpose(img))
+    side = min(img.size)
+
+    photo_set = {"source": source}
+    written = {}
+    widths = sorted({min(width, side) for width in WIDTHS})
+    for width in widths:
+        resized = ImageOps.fit(img, (width, width), Image.LANCZOS)
+        for key, ext, fmt, options in FORMATS:
+            rel = f"{OUT_DIR.relative_to(WEBAPP_DIR).as_posix()}/{stem}-{width}.{ext}"
+            payload = encode(resized, fmt, options)
+            (WEBAPP_DIR / rel).write_bytes(payload)
+            written[rel] = len(payload)
+            photo_set.setdefault(key, []).append(f"{rel} {width}w")
+            if key == "jpeg" and width == min(GRID_WIDTH, widths[-1]):
+                photo_set["src"] = rel
+
+    for key, _, _, _ in FORMATS:
+        photo_set[key] = ", ".join(photo_set[key])
+
+    tiny = ImageOps.fit(img, (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.BOX)
+    placeholder = encode(tiny, "WEBP", {"quality": 30})
+    photo_set["placeholder"] = "data:image/webp;base64," + base64.b64encode(placeholder).decode("ascii")
+    return source, photo_set, written
+
+
+def read_source(source, remote):
+    """Bytes of a photo given as a webapp-relative path or an http(s) URL."""
+    if source.startswith(("http://", "https://")):
+        if not remote:
+            return None
+        with urllib.request.urlopen(source, timeout=30) as resp:
+            return resp.read()
+    path = WEBAPP_DIR / source
+    return path.read_bytes() if path.is_file() else None
+
+
+def collect_sources(speakers):
+    """Photo sources -> output file stem, from speakers.json plus the photo folder."""
+    sources = {}
+    for speaker in speakers:
+        photo = (speaker.get("photo") or "").strip().removeprefix("./")
+        if photo and not photo.startswith("data:"):
+            local = not photo.startswith(("http://", "https://"))
+            sources[photo] = Path(photo).stem if local else speaker["id"]
+    for path in sorted(PHOTOS_DIR.iterdir()):
+        if path.suffix.lower() in PHOTO_EXTENSIONS:
+            sources.setdefault(path.relative_to(WEBAPP_DIR).as_posix(), path.stem)
+    return sources
+
+
+def load_state():
+    try:
+        with open(STATE_PATH, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state.get("photos", {}) if state.get("version") == STATE_VERSION else {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Optimiza las fotos de los expositores")
+    parser.add_argument("--remote", action="store_true",
+                        help="Descargar y procesar también fotos con URL http(s)")
+    parser.add_argument("--force", action="store_true", help="Reprocesar todas las fotos")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    with open(SPEAKERS_OUT, encoding="utf-8") as f:
+        speakers = json.load(f)
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    state = {} if args.force else load_state()
+
+    jobs, results, originals, failed = [], {}, {}, {}
+    for source, stem in collect_sources(speakers).items():
+        try:
+            data = read_source(source, args.remote)
+        except OSError as exc:
+            failed[source] = f"{type(exc).__name__}: {exc}"
+            continue
+        if data is None:
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        originals[source] = len(data)
+        previous = state.get(source)
+        if previous and previous["hash"] == digest and \
+                all((WEBAPP_DIR / rel).exists() for rel in previous["files"]):
+            results[source] = previous
+            continue
+        jobs.append((source, data, stem))
+        results[source] = {"hash": digest}
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for source, photo_set, written in pool.map(process_photo, jobs):
+            if photo_set is None:
+                # Left out of the state, so the next run tries it again
+                failed[source] = written
+                del results[source], originals[source]
+                continue
+            results[source].update({"photoSet": photo_set, "files": written})
+    processed = len(jobs) - len(failed.keys() & {job[0] for job in jobs})
+    print(f"Fotos: {len(results)} ({processed} procesadas, {len(results) - processed} sin cambios"
+          f"{f', {len(failed)} con error' if failed else ''})")
+
+    for speaker in speakers:
+        photo = (speaker.get("photo") or "").strip().removeprefix("./")
+        if photo in results:
+            speaker["photoSet"] = results[photo]["photoSet"]
+        elif photo not in failed:
+            # A photo that failed keeps the photoSet it had, if any
+            speaker.pop("photoSet", None)
+    if write_if_changed(SPEAKERS_OUT, dump_json(speakers)):
+        print("speakers.json: manifiesto de fotos actualizado")
+    write_if_changed(STATE_PATH, json.dumps({"version": STATE_VERSION, "photos": results}))
+
+    total_in = sum(originals.values())
+    total_out = sum(sum(r["files"].values()) for r in results.values())
+    grid = sum(size for r in results.values() for rel, size in r["files"].items()
+               if rel.endswith(f"-{GRID_WIDTH}.webp"))
+    print(f"Originales: {total_in / 1024:.0f} KB; variantes generadas: {total_out / 1024:.0f} KB")
+    if total_in:
+        print(f"Grilla ({GRID_WIDTH}w webp): {grid / 1024:.0f} KB, "
+              f"ahorro {(total_in - grid) / 1024:.0f} KB ({100 * (total_in - grid) / total_in:.0f}%)")
+    for source, error in sorted(failed.items()):
+        print(f"Error en {source}: {error}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Hornea los perfiles de Supabase de los expositores en un único archivo.
+
+Antes, cada visita descargaba la tabla profiles entera y la cruzaba en el
+navegador con speakersData (un findIndex por perfil). Este script trae los
+perfiles una vez por la API REST (PostgREST) de Supabase y publica
+webapp/data/speakers-perfiles.json, versionado: por cada expositor vinculado,
+los campos que su perfil pisa (nombre + apellido y los datos que el perfil
+tiene cargados y visibles), más la lista de expositores vinculados. Los
+campos que el usuario ocultó en "visibility" no se publican. No copia
+speakers.json: auth.js aplica esos campos sobre los expositores que la app
+cargó, así que un speakers.json regenerado después (expositores, áreas o
+fotos nuevas) se ve sin volver a hornear. auth.js solo consulta Supabase si
+el archivo no existe.
+
+Es incremental: guarda los perfiles ya traídos y la última updated_at vista,
+y en la corrida siguiente pide solo los modificados desde entonces (con unos
+minutos de solapamiento, por transacciones que confirman tarde). Los perfiles
+borrados no aparecen en una consulta por updated_at: --completo vuelve a
+traer la tabla entera. La versión del archivo sube solo si el contenido
+cambió.
+
+Con --perfiles archivo.json se usa un volcado local de la tabla (una lista
+de filas) en lugar de Supabase, para probar sin red.
+
+El archivo es público: se consulta siempre con la clave pública de auth.js,
+así las reglas de acceso (RLS) de Supabase son las mismas que para
+cualquier visitante.
+
+Uso: python scripts/perfiles_supabase.py [--completo] [--perfiles volcado.json]
+     SUPABASE_URL=http://127.0.0.1:54321 python scripts/perfiles_supabase.py
+"""
+import os
+import json
+import hashlib
+import argparse
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from actualizar_datos import dump_json_compact, write_if_changed
+
+BASE = Path(__file__).resolve().parent.parent
+SNAPSHOT_OUT = BASE / "webapp" / "data" / "speakers-perfiles.json"
+STATE_PATH = BASE / "scripts" / ".perfiles_supabase.state.json"
+STATE_VERSION = 1
+# Must match PROFILES_SNAPSHOT_FORMAT in auth.js
+SNAPSHOT_FORMAT = 2
+
+# Same project and public key as auth.js. Never a service key: the result
+# is published, so it may only hold rows an anonymous visitor can read
+SUPABASE_URL = "https://csknrwrqyrmblzqfnzju.supabase.co"
+SUPABASE_ANON = "sb_publishable_JKEUYfYuxUPD8ohiA2QtVw_1gfeUEx8"
+PROFILE_FIELDS = ("user_id", "speaker_id", "name", "lastname", "country", "institution", "specialty",
+                  "phone", "email", "bio", "photo_url", "visibility", "updated_at")
+PAGE_SIZE = 1000
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+# speakers.json key -> profiles column; the profile value wins when it has one
+FALLBACK_FIELDS = {
+    "country": "country",
+    "institution": "institution",
+    "specialty": "specialty",
+    "phone": "phone",
+    "email": "email",
+    "bio": "bio",
+    "photo": "photo_url",
+}
+# Fields a user can hide (VISIBILITY_FIELDS in auth.js)
+HIDEABLE_FIELDS = ("institution", "specialty", "country", "phone", "email", "bio")
+
+
+def build_full_name(name, lastname):
+    """Same as buildFullName() in auth.js."""
+    return " ".join(part for part in (name, lastname) if part).strip()
+
+
+def profile_key(profile):
+    return profile.get("user_id") or f"speaker:{profile.get('speaker_id')}"
+
+
+def change_order(profile):
+    return (profile.get("updated_at") or "", profile_key(profile))
+
+
+def profile_overlay(profile, previous=None):
+    """The fields ``profile`` sets on its speaker, as profileOverlay() in auth.js.
+
+    Applied over the speaker it gives the same record the old browser merge
+    did (empty profile fields keep the speaker's value), except that the
+    fields the profile's visibility hides are left out. ``previous`` is the
+    overlay of an earlier profile claiming the same speaker.
+    """
+    overlay = dict(previous or {})
+    visibility = profile.get("visibility") or {}
+    name = build_full_name(profile.get("name"), profile.get("lastname"))
+    if name:
+        overlay["name"] = name
+    for field, column in FALLBACK_FIELDS.items():
+        if field in HIDEABLE_FIELDS and visibility.get(field) is False:
+            overlay.pop(field, None)
+        elif profile.get(column):
+            overlay[field] = profile[column]
+    overlay["visibility"] = visibility
+    overlay["_claimed"] = True
+    return overlay
+
+
+def build_overlays(profiles):
+    """(speaker id -> overlay, claimed speaker ids).
+
+    Profiles are applied in change order, so if two claim the same speaker
+    the latest one wins.
+    """
+    overlays = {}
+    for profile in sorted(profiles, key=change_order):
+        speaker_id = profile.get("speaker_id")
+        if speaker_id:
+            overlays[speaker_id] = profile_overlay(profile, overlays.get(speaker_id))
+    return dict(sorted(overlays.items())), sorted(overlays)
+
+
+def apply_overlays(speakers, overlays):
+    """``speakers`` with the overlays applied, as applyProfileOverlays() in auth.js."""
+    return [{**speaker, **overlays[speaker.get("id")]} if speaker.get("id") in overlays else speaker
+            for speaker in speakers]
+
+
+def parse_timestamp(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def refresh_since(cursor):
+    """Lower bound for an incremental fetch: the last change seen, minus the overlap."""
+    return (parse_timestamp(cursor) - REFRESH_OVERLAP).isoformat() if cursor else None
+
+
+def rest_rows(base_url, key, query):
+    request = urllib.request.Request(
+        f"{base_url.rstrip('/')}/rest/v1/profiles?{urllib.parse.urlencode(query, safe=',.()')}",
+        headers={"apikey": key, "Authorization": f"Bearer {key}", "Accept": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as resp:
+            return json.load(resp)
+    except urllib.error.HTTPError as e:
+        raise SystemExit(f"Supabase respondió {e.code}: {e.read().decode('utf-8', 'replace')[:300]}")
+    except urllib.error.URLError as e:
+        raise SystemExit(f"No se pudo conectar con {base_url}: {e.reason}")
+
+
+def fetch_profiles(base_url, key, since=None, page_size=PAGE_SIZE):
+    """Yield the profiles changed at or after ``since`` (all if None), oldest first.
+
+    Pages by keyset on (updated_at, user_id) rather than offset, so a row
+    updated mid-run cannot shift the pages and be skipped.
+    """
+    last = None
+    while True:
+        query = {"select": ",".join(PROFILE_FIELDS), "order": "updated_at.asc,user_id.asc",
+                 "limit": page_size}
+        if since:
+            query["updated_at"] = f"gte.{since}"
+        if last:
+            # Quoted: timestamps have the "." and ":" that PostgREST reserves in or=()
+            query["or"] = (f"(updated_at.gt.\"{last['updated_at']}\","
+                           f"and(updated_at.eq.\"{last['updated_at']}\",user_id.gt.\"{last['user_id']}\"))")
+        rows = rest_rows(base_url, key, query)
+        yield from rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
+
+
+def dump_profiles(path, since=None):
+    """Rows of a local dump of the profiles table, filtered like fetch_profiles()."""
+    with open(path, encoding="utf-8") as f:
+        rows = json.load(f)
+    if since:
+        since = parse_timestamp(since)
+        rows = [row for row in rows if row.get("updated_at") and parse_timestamp(row["updated_at"]) >= since]
+    return sorted(rows, key=change_order)
+
+
+def load_state():
+    try:
+        with open(STATE_PATH, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if state.get("version") == STATE_VERSION else {}
+
+
+def content_hash(value):
+    return hashlib.sha256(dump_json_compact(value).encode("utf-8")).hexdigest()[:10]
+
+
+def bake(profiles, state, cursor):
+    """The snapshot document; its version goes up only when the content changed."""
+    overlays, claimed = build_overlays(profiles)
+    digest = content_hash({"claimed": claimed, "overlays": overlays})
+    version = state.get("snapshotVersion", 0)
+    if digest != state.get("snapshotHash"):
+        version += 1
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "version": version,
+        "hash": digest,
+        "profilesUpdatedAt": cursor,
+        "profiles": len(profiles),
+        "claimed": claimed,
+        "overlays": overlays,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--completo", action="store_true",
+                        help="Traer todos los perfiles (necesario para ver perfiles borrados)")
+    parser.add_argument("--perfiles", metavar="ARCHIVO",
+                        help="Usar un volcado JSON de la tabla profiles en lugar de Supabase")
+    parser.add_argument("--url", default=os.environ.get("SUPABASE_URL", SUPABASE_URL),
+                        help="URL del proyecto de Supabase (o de un PostgREST local)")
+    parser.add_argument("--salida", default=str(SNAPSHOT_OUT))
+    args = parser.parse_args(argv)
+
+    # The snapshot version carries on even after --completo
+    state = load_state()
+    known = {} if args.completo else state.get("profiles", {})
+    cursor = None if args.completo else state.get("cursor")
+    since = refresh_since(cursor)
+
+    rows = (dump_profiles(args.perfiles, since) if args.perfiles
+            else fetch_profiles(args.url, SUPABASE_ANON, since))
+    fetched = changed = 0
+    for row in rows:
+        fetched += 1
+        row_key = profile_key(row)
+        if known.get(row_key) != row:
+            changed += 1
+            known[row_key] = row
+        if row.get("updated_at") and (not cursor or parse_timestamp(row["updated_at"]) > parse_timestamp(cursor)):
+            cursor = row["updated_at"]
+    kind = "completa" if since is None else f"desde {since}"
+    print(f"Perfiles: {fetched} traídos ({kind}), {changed} nuevos o modificados, {len(known)} en total")
+
+    profiles = list(known.values())
+    snapshot = bake(profiles, state, cursor)
+    if write_if_changed(args.salida, dump_json_compact(snapshot)):
+        print(f"{Path(args.salida).name}: versión {snapshot['version']}, "
+              f"{len(snapshot['claimed'])} expositores vinculados")
+    else:
+        print(f"{Path(args.salida).name}: sin cambios (versión {snapshot['version']})")
+    write_if_changed(STATE_PATH, json.dumps({
+        "version": STATE_VERSION,
+        "cursor": cursor,
+        "snapshotVersion": snapshot["version"],
+        "snapshotHash": snapshot["hash"],
+        "profiles": known,
+    }, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Publica los datos de la webapp como un paquete versionado con deltas.
+
+Junta agenda, speakers, locations y notifications (más los índices
+derivados, si existen) en un único JSON versionado en webapp/data/bundle/.
+Cada vez que el contenido cambia se publica una versión nueva, junto con un
+delta directo desde cada una de las últimas versiones: un cliente que tiene
+la versión N descarga solo lo que cambió desde N. Si su versión es más
+vieja que las que tienen delta (o el delta no ahorra lo suficiente),
+descarga el paquete completo.
+
+webapp/data/bundle/latest.json es el único archivo que se revalida; los
+demás llevan el hash del contenido en el nombre (v12.3f2a9c1b04.json) y se
+pueden cachear para siempre.
+
+Uso: python scripts/publicar_datos.py [--keep 8]
+"""
+import gzip
+import json
+import hashlib
+import argparse
+from pathlib import Path
+
+from actualizar_datos import dump_json_compact, write_if_changed
+
+BASE = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE / "webapp" / "data"
+BUNDLE_DIR = DATA_DIR / "bundle"
+LATEST_PATH = BUNDLE_DIR / "latest.json"
+BUNDLE_FORMAT = 1
+
+# Bundle key -> file in webapp/data; the indexes are optional
+DATASETS = {
+    "agenda": "agenda.json",
+    "speakers": "speakers.json",
+    "locations": "locations.json",
+    "notifications": "notifications.json",
+    "speakersIndex": "speakers-index.json",
+    "agendaIndex": "agenda-index.json",
+}
+OPTIONAL = {"speakersIndex", "agendaIndex"}
+DEFAULT_KEEP = 8
+# A delta bigger than this fraction of the full bundle is not published
+MAX_DELTA_RATIO = 0.6
+
+
+def load_datasets():
+    data = {}
+    for key, name in DATASETS.items():
+        path = DATA_DIR / name
+        if not path.exists() and key in OPTIONAL:
+            continue
+        with open(path, encoding="utf-8") as f:
+            data[key] = json.load(f)
+    return data
+
+
+def content_hash(data):
+    return hashlib.sha256(dump_json_compact(data).encode("utf-8")).hexdigest()[:10]
+
+
+def size_of(value):
+    return len(dump_json_compact(value).encode("utf-8"))
+
+
+def diff(old, new, path=()):
+    """Operations that turn ``old`` into ``new``.
+
+    ``["s", path, value]`` sets a value, ``["d", path]`` deletes an object
+    key and ``["l", path, start, delete_count, items]`` splices a list.
+    Lists keep their common head and tail and only the middle is replaced
+    (or patched element by element if it kept its length), so appending or
+    prepending a notification is one small splice. A subtree whose
+    operations would be bigger than its new value is just set.
+    """
+    if old == new:
+        return []
+    ops = None
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [["d", [*path, key]] for key in old if key not in new]
+        for key, value in new.items():
+            if key in old:
+                ops += diff(old[key], value, (*path, key))
+            else:
+                ops.append(["s", [*path, key], value])
+    elif isinstance(old, list) and isinstance(new, list):
+        head = 0
+        while head < min(len(old), len(new)) and old[head] == new[head]:
+            head += 1
+        tail = 0
+        while tail < min(len(old), len(new)) - head and old[-1 - tail] == new[-1 - tail]:
+            tail += 1
+        old_mid, new_mid = old[head:len(old) - tail], new[head:len(new) - tail]
+        if len(old_mid) == len(new_mid):
+            ops = []
+            for offset, (a, b) in enumerate(zip(old_mid, new_mid)):
+                ops += diff(a, b, (*path, head + offset))
+        else:
+            ops = [["l", list(path), head, len(old_mid), new_mid]]
+    if ops is None or size_of(ops) >= size_of(new) + len(path) * 8 + 16:
+        return [["s", list(path), new]]
+    return ops
+
+
+def apply_ops(data, ops):
+    """Apply ``diff`` operations to ``data`` in place and return it."""
+    for op in ops:
+        kind, path = op[0], op[1]
+        if not path:
+            data = op[2]
+            continue
+        parent = data
+        for key in path[:-1]:
+            parent = parent[key]
+        last = path[-1]
+        if kind == "s":
+            parent[last] = op[2]
+        elif kind == "d":
+            del parent[last]
+        elif kind == "l":
+            target = parent[last]
+            target[op[2]:op[2] + op[3]] = op[4]
+        else:
+            raise ValueError(f"Unknown delta operation {kind!r}")
+    return data
+
+
+def load_latest():
+    try:
+        with open(LATEST_PATH, encoding="utf-8") as f:
+            latest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return latest if latest.get("format") == BUNDLE_FORMAT else None
+
+
+def load_bundle(name):
+    try:
+        with open(BUNDLE_DIR / name, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def publish(keep=DEFAULT_KEEP):
+    """Publish a new version if the data changed; returns the latest manifest."""
+    data = load_datasets()
+    digest = content_hash(data)
+    latest = load_latest()
+    if latest and latest["hash"] == digest:
+        print(f"Sin cambios: versión {latest['version']} ({latest['full']})")
+        return latest
+
+    BUNDLE_DIR.mkdir(parents=True, exist_ok=True)
+    version = latest["version"] + 1 if latest else 1
+    full_name = f"v{version}.{digest}.json"
+    full_text = dump_json_compact({"version": version, "hash": digest, "data": data})
+    write_if_changed(BUNDLE_DIR / full_name, full_text)
+    full_size = len(full_text.encode("utf-8"))
+
+    # Previous versions still kept on disk, newest first
+    history = [{"version": version, "hash": digest, "full": full_name}]
+    if latest:
+        history += [entry for entry in latest.get("history", []) if entry["version"] < version]
+    history = history[:keep + 1]
+
+    deltas = {}
+    print(f"Versión {version}: {full_name} {full_size / 1024:.1f} KB "
+          f"({len(gzip.compress(full_text.encode('utf-8'))) / 1024:.1f} KB gzip)")
+    for entry in history[1:]:
+        old = load_bundle(entry["full"])
+        if old is None:
+            continue
+        ops = diff(old["data"], data)
+        # A delta that does not rebuild the data is never published; those
+        # clients download the full bundle instead
+        if apply_ops(json.loads(json.dumps(old["data"])), ops) != data:
+            print(f"  delta desde v{entry['version']}: no reproduce los datos, se omite")
+            continue
+        delta_text = dump_json_compact({"from": entry["version"], "fromHash": entry["hash"],
+                                        "to": version, "ops": ops})
+        delta_size = len(delta_text.encode("utf-8"))
+        if delta_size > full_size * MAX_DELTA_RATIO:
+            print(f"  delta desde v{entry['version']}: {delta_size / 1024:.1f} KB, no conviene")
+            continue
+        delta_name = f"d{entry['version']}-{version}.{digest}.json"
+        write_if_changed(BUNDLE_DIR / delta_name, delta_text)
+        deltas[str(entry["version"])] = delta_name
+        print(f"  delta desde v{entry['version']}: {delta_name} {delta_size / 1024:.1f} KB "
+              f"({len(ops)} operaciones)")
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": version,
+        "hash": digest,
+        "full": full_name,
+        "deltas": deltas,
+        "history": history,
+    }
+    write_if_changed(LATEST_PATH, dump_json_compact(manifest))
+
+    # Remove bundles and deltas no longer referenced
+    referenced = {LATEST_PATH.name, *deltas.values(), *(entry["full"] for entry in history)}
+    for path in BUNDLE_DIR.glob("*.json"):
+        if path.name not in referenced:
+            path.unlink()
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publica los datos de la webapp como paquete versionado")
+    parser.add_argument("--keep", type=int, default=DEFAULT_KEEP,
+                        help="Cantidad de versiones anteriores con delta directo a la última")
+    args = parser.parse_args(argv)
+    publish(args.keep)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Reescritura de archivos zip (PPTX) copiando los miembros comprimidos tal cual.
+
+zipfile no permite pasar una entrada de un zip a otro sin descomprimirla y
+volver a comprimirla. Este módulo lee los bytes crudos de cada entrada desde
+su cabecera local y los escribe de a bloques en el zip de salida, con sus
+propias cabeceras y directorio central.
+"""
+import time
+import zlib
+import struct
+import zipfile
+
+CHUNK_SIZE = 1 << 20
+
+# Formats from the ZIP application note (same layout zipfile uses)
+LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+CENTRAL_DIR = struct.Struct("<4s4B4HL2L5H2L")
+END_RECORD = struct.Struct("<4s4H2LH")
+LOCAL_SIG = b"PK\003\004"
+CENTRAL_SIG = b"PK\001\002"
+END_SIG = b"PK\005\006"
+
+UTF8_FLAG = 0x800
+ZIP32_LIMIT = 0xFFFFFFFF
+ZIP32_MAX_ENTRIES = 0xFFFF
+
+
+def raw_chunks(fp, zinfo, chunk_size=CHUNK_SIZE):
+    """Yield the compressed bytes of ``zinfo`` from the open zip file ``fp``."""
+    fp.seek(zinfo.header_offset)
+    header = fp.read(LOCAL_HEADER.size)
+    if len(header) != LOCAL_HEADER.size or header[:4] != LOCAL_SIG:
+        raise zipfile.BadZipFile(f"Bad local header for {zinfo.filename}")
+    name_len, extra_len = struct.unpack("<HH", header[26:30])
+    fp.seek(name_len + extra_len, 1)
+
+    remaining = zinfo.compress_size
+    while remaining:
+        chunk = fp.read(min(chunk_size, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated data for {zinfo.filename}")
+        remaining -= len(chunk)
+        yield chunk
+
+
+def dos_datetime(date_time):
+    year, month, day, hour, minute, second = date_time
+    return ((hour << 11) | (minute << 5) | (second // 2),
+            ((max(year, 1980) - 1980) << 9) | (month << 5) | day)
+
+
+class RawZipWriter:
+    """Write a zip from already-compressed entries.
+
+    ``fp`` only needs ``write``; it does not have to be seekable, so the
+    output can go straight to a file, a socket or a ``BytesIO``. Sizes and
+    CRCs come from the source ``ZipInfo`` (or are computed up front in
+    ``writestr``), so no data descriptors are needed. ZIP64 is not
+    supported: a PPTX over 4 GB or 65535 entries raises
+    ``zipfile.LargeZipFile``, before the entry or central directory that
+    would not fit is written.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.pos = 0
+        self.entries = []
+
+    def _write(self, data):
+        self.fp.write(data)
+        self.pos += len(data)
+
+    def copy(self, zinfo, chunks):
+        """Add an entry described by ``zinfo`` whose compressed bytes are ``chunks``."""
+        if max(zinfo.compress_size, zinfo.file_size, self.pos) > ZIP32_LIMIT:
+            raise zipfile.LargeZipFile(f"{zinfo.filename} needs ZIP64 (over 4 GB), which is not supported")
+        if len(self.entries) >= ZIP32_MAX_ENTRIES:
+            raise zipfile.LargeZipFile(f"More than {ZIP32_MAX_ENTRIES} entries need ZIP64, which is not supported")
+        name = zinfo.filename.encode("utf-8")
+        flags = UTF8_FLAG if not zinfo.filename.isascii() else 0
+        version = max(20, zinfo.extract_version)
+        dostime, dosdate = dos_datetime(zinfo.date_time)
+
+        self.entries.append((zinfo, name, flags, version, dostime, dosdate, self.pos))
+        self._write(LOCAL_HEADER.pack(
+            LOCAL_SIG, version, 0, flags, zinfo.compress_type, dostime, dosdate,
+            zinfo.CRC, zinfo.compress_size, zinfo.file_size, len(name), 0))
+        self._write(name)
+
+        written = 0
+        for chunk in chunks:
+            self._write(chunk)
+            written += len(chunk)
+        if written != zinfo.compress_size:
+            raise zipfile.BadZipFile(f"Size mismatch for {zinfo.filename}")
+
+    def writestr(self, name, data, compress_type=zipfile.ZIP_DEFLATED, date_time=None):
+        """Add a small in-memory entry, compressing it here."""
+        zinfo = zipfile.ZipInfo(name, date_time or time.localtime()[:6])
+        zinfo.compress_type = compress_type
+        zinfo.file_size = len(data)
+        zinfo.CRC = zlib.crc32(data)
+        if compress_type == zipfile.ZIP_DEFLATED:
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            data = compressor.compress(data) + compressor.flush()
+        elif compress_type != zipfile.ZIP_STORED:
+            raise NotImplementedError("Only stored and deflated entries are supported")
+        zinfo.compress_size = len(data)
+        self.copy(zinfo, (data,))
+
+    def close(self):
+        """Write the central directory and end record.
+
+        The ZIP32 limits are checked first, so an oversized archive fails
+        with a clear error instead of a ``struct.error`` halfway through.
+        """
+        start = self.pos
+        size = sum(CENTRAL_DIR.size + len(entry[1]) for entry in self.entries)
+        if len(self.entries) > ZIP32_MAX_ENTRIES:
+            raise zipfile.LargeZipFile(f"{len(self.entries)} entries need ZIP64, which is not supported")
+        if start + size > ZIP32_LIMIT:
+            raise zipfile.LargeZipFile(f"Archive of {start + size} bytes needs ZIP64 (over 4 GB), "
+                                       f"which is not supported")
+        for zinfo, name, flags, version, dostime, dosdate, offset in self.entries:
+            self._write(CENTRAL_DIR.pack(
+                CENTRAL_SIG, 20, zinfo.create_system, version, 0, flags,
+                zinfo.compress_type, dostime, dosdate, zinfo.CRC,
+                zinfo.compress_size, zinfo.file_size, len(name), 0, 0, 0,
+                zinfo.internal_attr, zinfo.external_attr, offset))
+            self._write(name)
+        self._write(END_RECORD.pack(
+            END_SIG, 0, 0, len(self.entries), len(self.entries),
+            self.pos - start, start, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
@@ -0,0 +1,475 @@
+"""
+Servidor estático asyncio para la webapp (reemplaza python -m http.server).
+
+- Variantes precomprimidas .br/.gz junto a cada archivo; si no existen, los
+  archivos de texto se comprimen con gzip una vez y quedan en memoria.
+- ETag fuerte (hash del contenido) y respuestas 304. El query string, como
+  el ?t= anti-caché, no forma parte de la identidad del archivo.
+- Cache-Control inmutable para assets con hash en el nombre
+  (app.3f2a9c1b.js) y no-cache para el resto.
+- Conexiones keep-alive (HTTP/1.1), rangos de bytes y sendfile (copia cero)
+  para los cuerpos que se sirven directo desde disco.
+- /events/notifications: Server-Sent Events con las notificaciones que
+  publica scripts/notificaciones.py. El registro se lee cuatro veces por
+  segundo (FEED_POLL_INTERVAL) para todas las conexiones y cada cliente
+  recibe solo lo posterior a su último id (Last-Event-ID al reconectar, o
+  ?desde=). Una conexión en espera no cuesta más que su socket, así que
+  miles entran en un solo proceso.
+
+Uso: python scripts/servidor.py [puerto] [--root webapp] [--bind 0.0.0.0]
+                                [--notificaciones webapp/data/notifications.jsonl]
+"""
+import os
+import re
+import gzip
+import json
+import bisect
+import asyncio
+import hashlib
+import argparse
+import mimetypes
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+BASE = Path(__file__).resolve().parent.parent
+WEBAPP_DIR = BASE / "webapp"
+
+KEEPALIVE_TIMEOUT = 15
+MAX_HEADER_LINES = 100
+# Text bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{8,}\.\w+$")
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json",
+                      "application/manifest+json", "image/svg+xml")
+# Precompressed siblings, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+FEED_PATH = "/events/notifications"
+FEED_LOG = Path("data") / "notifications.jsonl"
+FEED_POLL_INTERVAL = 0.25
+# Comment line sent to idle streams so proxies keep them open and dead
+# clients are noticed
+FEED_HEARTBEAT = 25
+FEED_RETRY_MS = 3000
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+mimetypes.add_type("application/javascript", ".js")
+
+STATUS_TEXT = {200: "OK", 206: "Partial Content", 301: "Moved Permanently", 304: "Not Modified",
+               400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               416: "Range Not Satisfiable"}
+
+
+def content_type(path):
+    ctype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if ctype.startswith("text/") or ctype in ("application/javascript", "application/json",
+                                               "application/manifest+json"):
+        ctype += "; charset=utf-8"
+    return ctype
+
+
+def accepted_encodings(value):
+    """Content codings of an Accept-Encoding header -> q-value (1 if not given)."""
+    accepted = {}
+    for item in value.split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, number = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        accepted[name.lower()] = q
+    return accepted
+
+
+def choose_encoding(accepted, offered):
+    """The coding in ``offered`` the client rates highest, or None.
+
+    ``q=0`` refuses a coding and ``*`` rates the ones not named; ties keep
+    the order of ``offered``.
+    """
+    best, best_q = None, 0.0
+    for encoding in offered:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def file_etag(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()[:20]
+
+
+class FileEntry:
+    """Metadata of one file, cached until its mtime or size changes."""
+
+    def __init__(self, path, stat):
+        self.path = path
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.etag = file_etag(path)
+        self.content_type = content_type(path)
+        self.compressible = self.content_type.startswith(COMPRESSIBLE_TYPES)
+        name = os.path.basename(path)
+        self.cache_control = IMMUTABLE if HASHED_NAME_RE.search(name) else REVALIDATE
+        # encoding -> (path, size) of precompressed siblings on disk
+        self.variants = {}
+        for encoding, suffix in ENCODINGS:
+            try:
+                variant_stat = os.stat(path + suffix)
+            except OSError:
+                continue
+            if variant_stat.st_mtime_ns >= stat.st_mtime_ns:
+                self.variants[encoding] = (path + suffix, variant_stat.st_size)
+        self._gzip = None
+
+    async def gzip_body(self):
+        """In-memory gzip of the file, built off the event loop on first use."""
+        if self._gzip is None:
+            self._gzip = await asyncio.get_running_loop().run_in_executor(None, self._compress)
+        return self._gzip
+
+    def _compress(self):
+        with open(self.path, "rb") as f:
+            return gzip.compress(f.read(), compresslevel=6, mtime=0)
+
+
+class NotificationFeed:
+    """Tail of the notifications log shared by every event stream.
+
+    Each entry is serialized to its SSE frame once, when it is read; a new
+    notification wakes all the waiting streams through a single event.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.ids = []
+        self.frames = []
+        self.offset = 0
+        self.inode = None
+        self.changed = asyncio.Event()
+
+    def poll(self):
+        """Read lines appended since the last poll; returns how many entries were added."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return 0
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            # Replaced or truncated: read it again from the start
+            self.ids, self.frames, self.offset, self.inode = [], [], 0, stat.st_ino
+        if stat.st_size == self.offset:
+            return 0
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(stat.st_size - self.offset)
+        # A line without its newline is still being written
+        chunk = chunk[:chunk.rfind(b"\n") + 1]
+        self.offset += len(chunk)
+        added = 0
+        for line in chunk.splitlines():
+            try:
+                entry = json.loads(line)
+                entry_id = int(entry["id"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            if self.ids and entry_id <= self.ids[-1]:
+                continue
+            data = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+            self.ids.append(entry_id)
+            self.frames.append(f"id: {entry_id}\nevent: notification\ndata: {data}\n\n".encode("utf-8"))
+            added += 1
+        if added:
+            self.changed.set()
+            self.changed = asyncio.Event()
+        return added
+
+    async def watch(self):
+        while True:
+            self.poll()
+            await asyncio.sleep(FEED_POLL_INTERVAL)
+
+    def after(self, last_id):
+        """SSE frames of the entries newer than ``last_id``, and the newest id."""
+        start = bisect.bisect_right(self.ids, last_id)
+        return self.frames[start:], self.ids[-1] if start < len(self.ids) else last_id
+
+    async def stream(self, writer, last_id):
+        writer.write(header_block(200, {
+            "Content-Type": "text/event-stream; charset=utf-8",
+            "Cache-Control": "no-store",
+            "X-Accel-Buffering": "no",
+        }, None, keep_alive=False))
+        writer.write(f"retry: {FEED_RETRY_MS}\n\n".encode("ascii"))
+        while not writer.is_closing():
+            # Taken before draining, so entries read meanwhile are not missed
+            changed = self.changed
+            frames, last_id = self.after(last_id)
+            writer.writelines(frames)
+            await writer.drain()
+            try:
+                await asyncio.wait_for(changed.wait(), FEED_HEARTBEAT)
+            except asyncio.TimeoutError:
+                writer.write(b":\n\n")
+
+
+def feed_last_id(target, headers):
+    """Resume point: Last-Event-ID (EventSource reconnecting) or ?desde=."""
+    value = headers.get("last-event-id") or parse_qs(urlsplit(target).query).get("desde", ["0"])[0]
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+
+class StaticServer:
+    def __init__(self, root, feed=None):
+        self.root = os.path.realpath(root)
+        self.entries = {}
+        self.feed = feed
+
+    def resolve(self, target):
+        """Map a request target to a file under the root, or None."""
+        path = unquote(urlsplit(target).path)
+        if path.endswith("/"):
+            path += "index.html"
+        full = os.path.realpath(os.path.join(self.root, path.lstrip("/")))
+        if os.path.commonpath([full, self.root]) != self.root:
+            return None
+        return full
+
+    async def entry(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        cached = self.entries.get(path)
+        if cached is None or cached.signature != (stat.st_mtime_ns, stat.st_size):
+            # Hashing reads the whole file: keep it off the event loop
+            loop = asyncio.get_running_loop()
+            cached = self.entries[path] = await loop.run_in_executor(None, FileEntry, path, stat)
+        return cached
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                headers = await read_headers(reader)
+                if len(parts) != 3 or headers is None:
+                    await send(writer, 400, {}, b"Bad Request", keep_alive=False)
+                    break
+                method, target, version = parts
+
+                length = int(headers.get("content-length", "0") or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                if self.feed and method == "GET" and urlsplit(target).path.endswith(FEED_PATH):
+                    # The stream holds the connection until the client leaves
+                    await self.feed.stream(writer, feed_last_id(target, headers))
+                    break
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = (connection != "close" if version == "HTTP/1.1"
+                              else connection == "keep-alive")
+                await self.respond(writer, method, target, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, method, target, headers, keep_alive):
+        if method not in ("GET", "HEAD"):
+            await send(writer, 405, {"Allow": "GET, HEAD"}, b"Method Not Allowed", keep_alive)
+            return
+
+        path = self.resolve(target)
+        if path and os.path.isdir(path):
+            # Relative URLs in index.html need the trailing slash
+            url = urlsplit(target)
+            location = url.path + "/" + (f"?{url.query}" if url.query else "")
+            await send(writer, 301, {"Location": location}, b"", keep_alive)
+            return
+        entry = await self.entry(path) if path else None
+        if entry is None:
+            await send(writer, 404, {}, b"Not Found", keep_alive, head=method == "HEAD")
+            return
+
+        offered = list(entry.variants)
+        if entry.compressible and entry.size >= MIN_COMPRESS_SIZE and "gzip" not in offered:
+            offered.append("gzip")
+        encoding = choose_encoding(accepted_encodings(headers.get("accept-encoding", "")), offered)
+
+        etag = f'"{entry.etag}-{encoding}"' if encoding else f'"{entry.etag}"'
+        response_headers = {
+            "Content-Type": entry.content_type,
+            "ETag": etag,
+            "Last-Modified": entry.last_modified,
+            "Cache-Control": entry.cache_control,
+            "Accept-Ranges": "bytes",
+        }
+        if entry.compressible or entry.variants:
+            response_headers["Vary"] = "Accept-Encoding"
+
+        if not_modified(headers, etag, entry.mtime):
+            await send(writer, 304, response_headers, None, keep_alive)
+            return
+
+        if encoding:
+            response_headers["Content-Encoding"] = encoding
+            if encoding in entry.variants:
+                body_path, size = entry.variants[encoding]
+                await send_file(writer, 200, response_headers, body_path, 0, size,
+                                keep_alive, method == "HEAD")
+            else:
+                await send(writer, 200, response_headers, await entry.gzip_body(), keep_alive,
+                           head=method == "HEAD")
+            return
+
+        start, end = 0, entry.size
+        status = 200
+        if "range" in headers:
+            byte_range = parse_range(headers["range"], entry.size)
+            if byte_range is None:
+                response_headers["Content-Range"] = f"bytes */{entry.size}"
+                await send(writer, 416, response_headers, b"", keep_alive)
+                return
+            start, end = byte_range
+            status = 206
+            response_headers["Content-Range"] = f"bytes {start}-{end - 1}/{entry.size}"
+        await send_file(writer, status, response_headers, entry.path, start, end - start,
+                        keep_alive, method == "HEAD")
+
+
+async def read_headers(reader):
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, sep, value = line.decode("latin-1").partition(":")
+        if not sep:
+            return None
+        headers[name.strip().lower()] = value.strip()
+    return None
+
+
+def not_modified(headers, etag, mtime):
+    if "if-none-match" in headers:
+        tags = [t.strip() for t in headers["if-none-match"].split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+    if "if-modified-since" in headers:
+        try:
+            since = parsedate_to_datetime(headers["if-modified-since"]).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since
+    return False
+
+
+def parse_range(value, size):
+    """Parse a single ``bytes=`` range into ``(start, end)``, end exclusive."""
+    unit, _, spec = value.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last) + 1, size) if last else size
+        else:
+            start = max(size - int(last), 0)
+            end = size
+    except ValueError:
+        return None
+    if start >= end:
+        return None
+    return start, end
+
+
+def header_block(status, headers, length, keep_alive):
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}",
+             f"Date: {formatdate(usegmt=True)}",
+             "Server: rtcc-static",
+             f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if length is not None:
+        lines.append(f"Content-Length: {length}")
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def send(writer, status, headers, body, keep_alive, head=False):
+    """Send a response with an in-memory body (``None`` for 304)."""
+    writer.write(header_block(status, headers, None if body is None else len(body), keep_alive))
+    if body and not head:
+        writer.write(body)
+    await writer.drain()
+
+
+async def send_file(writer, status, headers, path, offset, count, keep_alive, head):
+    """Send a file body with ``loop.sendfile`` (os.sendfile where available)."""
+    writer.write(header_block(status, headers, count, keep_alive))
+    await writer.drain()
+    if head or not count:
+        return
+    loop = asyncio.get_running_loop()
+    with open(path, "rb") as f:
+        await loop.sendfile(writer.transport, f, offset, count)
+
+
+async def serve(root, host, port, feed_log=None):
+    feed = NotificationFeed(feed_log or Path(root) / FEED_LOG)
+    feed.poll()
+    watcher = asyncio.create_task(feed.watch())
+    server = StaticServer(root, feed)
+    srv = await asyncio.start_server(server.handle, host, port, backlog=1024)
+    print(f"Sirviendo {root} en http://{host}:{port} (Ctrl+C para detener)")
+    print(f"Notificaciones: {feed.path} en {FEED_PATH}")
+    try:
+        async with srv:
+            await srv.serve_forever()
+    finally:
+        watcher.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor estático para la webapp RTCC")
+    parser.add_argument("port", nargs="?", type=int, default=8080)
+    parser.add_argument("--root", default=str(WEBAPP_DIR))
+    parser.add_argument("--bind", default="0.0.0.0")
+    parser.add_argument("--notificaciones", default=None,
+                        help=f"Registro de notificaciones (por defecto <root>/{FEED_LOG.as_posix()})")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.root, args.bind, args.port, args.notificaciones))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Rebuilds de actualizar_datos.py sobre un speakers.json con datos cargados a mano."""
+import json
+
+import actualizar_datos
+import publicar_datos
+
+
+def redirect_outputs(monkeypatch, data_dir):
+    paths = {name: data_dir / getattr(actualizar_datos, name).name
+             for name in ("SPEAKERS_OUT", "AGENDA_OUT", "SEARCH_INDEX_OUT", "AGENDA_INDEX_OUT", "DATA_FORMATS_OUT")}
+    for name, path in paths.items():
+        monkeypatch.setattr(actualizar_datos, name, path)
+    monkeypatch.setattr(actualizar_datos, "OUTPUTS", tuple(paths.values()))
+    monkeypatch.setattr(actualizar_datos, "COMPACT_OUTPUTS", {
+        paths["SPEAKERS_OUT"]: data_dir / "speakers.compact.json",
+        paths["AGENDA_OUT"]: data_dir / "agenda.compact.json",
+    })
+    monkeypatch.setattr(publicar_datos, "LATEST_PATH", data_dir / "bundle" / "latest.json")
+    return paths["SPEAKERS_OUT"]
+
+
+def test_rebuild_keeps_curated_fields(tmp_path, monkeypatch):
+    speakers_out = redirect_outputs(monkeypatch, tmp_path)
+    actualizar_datos.build({})
+    speakers = json.loads(speakers_out.read_text(encoding="utf-8"))
+    edited, moderator = speakers[0], next(s for s in speakers if s["institution"])
+    edited.update(institution="Hospital de Clínicas", bio="Cargada a mano.", photo="img/speakers/x.jpg")
+    moderator.update(institution="Otra institución", bio="Bio del moderador.")
+    speakers_out.write_text(json.dumps(speakers, ensure_ascii=False), encoding="utf-8")
+
+    actualizar_datos.build({})
+
+    rebuilt = {s["id"]: s for s in json.loads(speakers_out.read_text(encoding="utf-8"))}
+    assert rebuilt[edited["id"]]["institution"] == "Hospital de Clínicas"
+    assert rebuilt[edited["id"]]["bio"] == "Cargada a mano."
+    assert rebuilt[edited["id"]]["photo"] == "img/speakers/x.jpg"
+    # The sheet gives the moderators' institution, so it wins; the bio is kept
+    assert rebuilt[moderator["id"]]["institution"] == "RT International Institute"
+    assert rebuilt[moderator["id"]]["bio"] == "Bio del moderador."
@@ -0,0 +1,301 @@
+"""
+Valida en paralelo los decks que devuelven los expositores contra el template.
+
+Para cada .pptx de la carpeta revisa:
+- las 5 slides del template (menos es error; más, aviso),
+- el tamaño de slide 18288000 x 10287000 EMU,
+- que las fuentes que usan las slides y no vienen instaladas (Mukti) estén
+  embebidas con sus datos: las que declara presentation.xml o, como en el
+  template, las partes de ppt/fonts/, identificadas por el nombre de familia
+  que trae la propia fuente,
+- en cada slide, los elementos de add_header_footer(): "CONVENTION 2026",
+  "MARZO 2026", "@RTINTERNATIONAL", el logo y la línea dorada, en su lugar.
+
+No usa python-pptx: lee el directorio central del zip y recorre solo las
+partes XML necesarias (presentation.xml, sus relaciones y las slides) con
+un parser incremental, descomprimiéndolas de a bloques. Las imágenes y
+videos embebidos no se leen nunca, así que un deck de cientos de MB cuesta
+lo mismo que uno liviano. Los decks se reparten entre procesos (uno por
+núcleo) y el resultado es un reporte JSON.
+
+Uso: python scripts/validar_decks.py CARPETA [--reporte reporte.json] [--workers N]
+"""
+import sys
+import json
+import time
+import struct
+import zipfile
+import argparse
+import posixpath
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from xml.etree.ElementTree import ParseError, iterparse
+
+from generar_template_expositor import (FONT_BODY, FOOTER_LEFT_POS, HEADER_LEFT_POS,
+                                        HEADER_RIGHT_POS, LINE_Y, LOGO_POS)
+
+REQUIRED_SLIDES = 5
+SLIDE_SIZE = (18288000, 10287000)
+# Shapes nudged less than this (0.1") still count as in place
+POSITION_TOLERANCE = 91440
+# (name, expected text, (x, y)); x None means any horizontal position
+HEADER_FOOTER_TEXTS = [
+    ("encabezado izquierdo", "CONVENTION 2026", HEADER_LEFT_POS),
+    ("encabezado derecho", "MARZO 2026", HEADER_RIGHT_POS),
+    ("pie izquierdo", "@RTINTERNATIONAL", FOOTER_LEFT_POS),
+]
+
+NS = {
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+P, A, R, REL = ("{%s}" % NS[k] for k in ("p", "a", "r", "rel"))
+PRESENTATION = "ppt/presentation.xml"
+FONT_TAGS = {A + "latin", A + "ea", A + "cs", A + "sym"}
+# Typefaces the presentation machines do not have: a slide using one needs it embedded
+EMBEDDED_FONTS = (FONT_BODY,)
+EOT_MAGIC = 0x504C
+SFNT_VERSIONS = (b"\x00\x01\x00\x00", b"OTTO", b"true")
+
+
+def stream(zf, name, tags):
+    """Yield the elements named ``tags`` of part ``name`` as the parser closes them.
+
+    The part is decompressed and parsed in chunks; each yielded element is
+    cleared afterwards, so memory stays flat whatever the part size.
+    """
+    with zf.open(name) as f:
+        for _, elem in iterparse(f, events=("end",)):
+            if elem.tag in tags:
+                yield elem
+                elem.clear()
+
+
+def relationships(zf, part):
+    """rId -> target part path of ``part``'s .rels."""
+    folder, name = posixpath.split(part)
+    rels_name = posixpath.join(folder, "_rels", name + ".rels")
+    if rels_name not in zf.NameToInfo:
+        return {}
+    return {rel.get("Id"): posixpath.normpath(posixpath.join(folder, rel.get("Target")))
+            for rel in stream(zf, rels_name, {REL + "Relationship"})}
+
+
+def read_presentation(zf):
+    """Slide size, slide parts in order and embedded font typefaces -> parts."""
+    size, slide_ids, fonts = None, [], {}
+    for elem in stream(zf, PRESENTATION, {P + "sldSz", P + "sldId", P + "embeddedFont"}):
+        if elem.tag == P + "sldSz":
+            size = (int(elem.get("cx", 0)), int(elem.get("cy", 0)))
+        elif elem.tag == P + "sldId":
+            slide_ids.append(elem.get(R + "id"))
+        else:
+            font = elem.find(P + "font")
+            if font is not None:
+                fonts[font.get("typeface")] = [child.get(R + "id") for child in elem if child.get(R + "id")]
+    rels = relationships(zf, PRESENTATION)
+    slides = [rels.get(rid) for rid in slide_ids]
+    fonts = {face: [rels.get(rid) for rid in rids] for face, rids in fonts.items()}
+    return size, slides, fonts
+
+
+def read_shapes(zf, slide, typefaces=None):
+    """(kind, text, (x, y)) of every shape and picture of a slide.
+
+    The typefaces the shapes' text runs name are added to ``typefaces``;
+    theme references (+mn-lt) are left out.
+    """
+    shapes = []
+    for elem in stream(zf, slide, {P + "sp", P + "pic", P + "cxnSp"}):
+        off = elem.find(f".//{A}xfrm/{A}off")
+        position = (int(off.get("x", 0)), int(off.get("y", 0))) if off is not None else None
+        text = "".join(t.text or "" for t in elem.iter(A + "t")).strip()
+        shapes.append(("pic" if elem.tag == P + "pic" else "sp", text, position))
+        if typefaces is not None:
+            typefaces.update(face for face in (font.get("typeface") for font in elem.iter()
+                                               if font.tag in FONT_TAGS)
+                             if face and not face.startswith("+"))
+    return shapes
+
+
+def font_family(data):
+    """Family name of an embedded font part, or None if it is not recognized.
+
+    Reads the EOT header PowerPoint writes to .fntdata parts, or the name
+    table of a bare TrueType/OpenType font.
+    """
+    if len(data) > 84 and struct.unpack_from("<H", data, 34)[0] == EOT_MAGIC:
+        size = struct.unpack_from("<H", data, 82)[0]
+        return data[84:84 + size].decode("utf-16-le", "replace").rstrip("\x00") or None
+    if data[:4] not in SFNT_VERSIONS:
+        return None
+    try:
+        (tables,) = struct.unpack_from(">H", data, 4)
+        for i in range(tables):
+            tag, _, offset, _ = struct.unpack_from(">4sIII", data, 12 + 16 * i)
+            if tag != b"name":
+                continue
+            _, count, strings = struct.unpack_from(">HHH", data, offset)
+            for j in range(count):
+                platform, _, _, name_id, length, at = struct.unpack_from(">6H", data, offset + 6 + 12 * j)
+                if name_id == 1:
+                    start = offset + strings + at
+                    return data[start:start + length].decode(
+                        "utf-16-be" if platform in (0, 3) else "latin-1", "replace") or None
+    except struct.error:
+        return None
+    return None
+
+
+def embedded_fonts(zf, declared):
+    """Typeface -> font parts actually in the deck.
+
+    A font declared in presentation.xml counts when all its parts exist. The
+    ppt/fonts/ parts no declaration points at (the template carries them
+    raw, see embed_fonts) are identified from the font data.
+    """
+    present = {face: parts for face, parts in declared.items()
+               if parts and all(part in zf.NameToInfo for part in parts)}
+    listed = {part for parts in declared.values() for part in parts}
+    for name in zf.NameToInfo:
+        if name.startswith("ppt/fonts/") and not name.endswith("/") and name not in listed:
+            face = font_family(zf.read(name))
+            if face:
+                present.setdefault(face, []).append(name)
+    return present
+
+
+def near(position, expected):
+    if position is None:
+        return False
+    return all(want is None or abs(got - want) <= POSITION_TOLERANCE
+               for got, want in zip(position, expected))
+
+
+def check_header_footer(shapes):
+    """Names of the add_header_footer() elements missing from a slide."""
+    missing = []
+    for name, text, position in HEADER_FOOTER_TEXTS:
+        if not any(kind == "sp" and shape_text.upper() == text and near(at, position)
+                   for kind, shape_text, at in shapes):
+            missing.append(name)
+    if not any(kind == "pic" and near(at, LOGO_POS) for kind, _, at in shapes):
+        missing.append("logo")
+    if not any(kind == "sp" and not shape_text and near(at, (None, LINE_Y)) for kind, shape_text, at in shapes):
+        missing.append("línea")
+    return missing
+
+
+def lint_deck(path):
+    """Worker: check one deck; returns its report entry."""
+    path = Path(path)
+    started = time.perf_counter()
+    report = {"file": path.name, "bytes": path.stat().st_size, "errors": [], "warnings": []}
+    errors, warnings = report["errors"], report["warnings"]
+    try:
+        with zipfile.ZipFile(path) as zf:
+            if PRESENTATION not in zf.NameToInfo:
+                errors.append("no es una presentación PowerPoint (falta ppt/presentation.xml)")
+                return finish(report, started)
+            size, slides, fonts = read_presentation(zf)
+            report["slides"] = len(slides)
+            report["slideSize"] = list(size) if size else None
+            report["media"] = sum(info.file_size for info in zf.infolist()
+                                  if info.filename.startswith("ppt/media/"))
+
+            if size != SLIDE_SIZE:
+                errors.append(f"tamaño de slide {size}, se espera {SLIDE_SIZE}")
+            if len(slides) < REQUIRED_SLIDES:
+                errors.append(f"tiene {len(slides)} slides, el template tiene {REQUIRED_SLIDES}")
+            elif len(slides) > REQUIRED_SLIDES:
+                warnings.append(f"tiene {len(slides)} slides, el template tiene {REQUIRED_SLIDES}")
+
+            typefaces = set()
+            for number, slide in enumerate(slides[:REQUIRED_SLIDES], 1):
+                if slide is None or slide not in zf.NameToInfo:
+                    errors.append(f"slide {number}: falta la parte XML")
+                    continue
+                missing = check_header_footer(read_shapes(zf, slide, typefaces))
+                if missing:
+                    errors.append(f"slide {number}: falta {', '.join(missing)}")
+
+            # Checked against the typefaces the slides use, not just any ppt/fonts/ part
+            embedded = embedded_fonts(zf, fonts)
+            report["fonts"] = sorted(embedded)
+            report["fontsUsed"] = sorted(typefaces)
+            for face in sorted(typefaces):
+                if face in embedded or (face not in EMBEDDED_FONTS and face not in fonts):
+                    continue
+                if face in fonts:
+                    errors.append(f"la fuente {face} está declarada pero faltan sus datos")
+                else:
+                    errors.append(f"usa la fuente {face} y no está embebida")
+    # NotImplementedError / RuntimeError: compression methods zipfile lacks, encrypted parts
+    except (zipfile.BadZipFile, ParseError, KeyError, ValueError, OSError,
+            NotImplementedError, RuntimeError) as exc:
+        errors.append(f"no se pudo leer ({type(exc).__name__}: {exc})")
+    return finish(report, started)
+
+
+def finish(report, started):
+    report["ok"] = not report["errors"]
+    report["seconds"] = round(time.perf_counter() - started, 4)
+    return report
+
+
+def lint_folder(folder, workers=None):
+    """Report dict for every .pptx under ``folder``, decks in parallel."""
+    decks = sorted(p for p in Path(folder).rglob("*.pptx") if not p.name.startswith("~$"))
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(lint_deck, deck): deck for deck in decks}
+        for future in as_completed(futures):
+            entry = future.result()
+            entry["file"] = futures[future].relative_to(folder).as_posix()
+            results.append(entry)
+    results.sort(key=lambda entry: entry["file"])
+    elapsed = time.perf_counter() - started
+    return {
+        "template": {"slides": REQUIRED_SLIDES, "slideSize": list(SLIDE_SIZE), "font": FONT_BODY},
+        "summary": {
+            "decks": len(results),
+            "ok": sum(entry["ok"] for entry in results),
+            "withErrors": sum(not entry["ok"] for entry in results),
+            "bytes": sum(entry["bytes"] for entry in results),
+            "seconds": round(elapsed, 3),
+        },
+        "decks": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Valida decks de expositores contra el template")
+    parser.add_argument("folder", metavar="carpeta", help="Carpeta con los .pptx recibidos")
+    parser.add_argument("--reporte", help="Escribir el reporte JSON en este archivo (por defecto, stdout)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Procesos en paralelo (por defecto, uno por núcleo)")
+    args = parser.parse_args(argv)
+
+    folder = Path(args.folder)
+    report = lint_folder(folder, args.workers)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.reporte:
+        Path(args.reporte).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    # Human summary on stderr, so stdout stays valid JSON
+    summary = report["summary"]
+    for entry in report["decks"]:
+        for error in entry["errors"]:
+            print(f"{entry['file']}: {error}", file=sys.stderr)
+    print(f"{summary['decks']} decks ({summary['bytes'] / 1e6:.0f} MB) en {summary['seconds']:.2f}s: "
+          f"{summary['ok']} ok, {summary['withErrors']} con errores", file=sys.stderr)
+    sys.exit(1 if summary["withErrors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
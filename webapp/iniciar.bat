@@ -5,4 +5,4 @@ echo Abri http://localhost:8080 en tu navegador
 echo Presiona Ctrl+C para detener el servidor
 echo.
 start http://localhost:8080
-python -m http.server 8080
+python "%~dp0..\scripts\servidor.py" 8080 --root "%~dp0."
@@ -7,6 +7,8 @@ let agendaData = [];
 let speakersData = [];
 let locationsData = [];
 let notificationsData = [];
+let speakerSearchIndex = null;
+let agendaIndex = null;
 let currentPage = 'home';
 let currentDay = 1;
 let currentAreaFilter = 'all';
@@ -27,12 +29,15 @@ const BELL_SVG = `<svg width="18" height="18" viewBox="0 0 24 24" fill="none" st
 const BELL_FILL_SVG = `<svg width="18" height="18" viewBox="0 0 24 24" fill="currentColor" stroke="currentColor" stroke-width="1" stroke-linecap="round" stroke-linejoin="round"><path d="M18 8A6 6 0 0 0 6 8c0 7-3 9-3 9h18s-3-2-3-9"/><path d="M13.73 21a2 2 0 0 1-3.46 0" fill="none" stroke-width="2"/></svg>`;
 const ARRIVAL_QR_EXPECTED = 'RTCC2026|ARRIBO|HANDSHAKE|R-9F2A-7C61-58D4';
 const ARRIVAL_HANDSHAKE_KEY = 'rtcc_arrival_handshake';
+// Per-attendee codes (scripts/codigos_arribo.py): prefix + HMAC tag
+const ARRIVAL_CODE_PREFIX = 'RTCC2026|ARRIBO|';
 
 let arrivalScannerStream = null;
 let arrivalScanLoopId = null;
 let arrivalDetector = null;
 let arrivalScanActive = false;
 let arrivalLastInvalidAt = 0;
+let arrivalTablePromise = null;
 
 // ============================================
 // INITIALIZATION
@@ -44,32 +49,203 @@ document.addEventListener('DOMContentLoaded', async () => {
 
 async function loadAllData() {
   try {
-    const [agenda, speakers, locations, notifications] = await Promise.all([
-      fetchJSON('data/agenda.json'),
-      fetchJSON('data/speakers.json'),
-      fetchJSON('data/locations.json'),
-      fetchJSON('data/notifications.json')
-    ]);
-    agendaData = agenda || [];
-    speakersData = speakers || [];
-    locationsData = locations || [];
-    notificationsData = notifications || [];
+    const data = await loadDataBundle() || await loadDataFiles();
+    agendaData = data.agenda || [];
+    speakersData = data.speakers || [];
+    locationsData = data.locations || [];
+    notificationsData = data.notifications || [];
+    setSpeakerSearchIndex(data.speakersIndex);
+    setAgendaIndex(data.agendaIndex);
   } catch (e) {
     console.error('Error loading data:', e);
   }
 }
 
-async function fetchJSON(path) {
+async function loadDataFiles() {
+  const formats = fetchJSON('data/formatos.json', true);
+  const [agenda, speakers, locations, notifications, speakersIndex, agendaIndex] = await Promise.all([
+    fetchDataJSON('agenda', formats),
+    fetchDataJSON('speakers', formats),
+    fetchJSON('data/locations.json'),
+    fetchJSON('data/notifications.json'),
+    fetchJSON('data/speakers-index.json'),
+    fetchJSON('data/agenda-index.json')
+  ]);
+  return { agenda, speakers, locations, notifications, speakersIndex, agendaIndex };
+}
+
+// ============================================
+// DATA BUNDLE (scripts/publicar_datos.py)
+// ============================================
+// The last bundle is kept in localStorage. On load only data/bundle/latest.json
+// is revalidated; a client at version N then downloads the delta from N if one
+// was published, or else the full bundle. Bundle and delta files have the
+// content hash in their names, so they are never re-downloaded.
+const DATA_BUNDLE_KEY = 'rtcc_data_bundle';
+const DATA_BUNDLE_FORMAT = 1;
+
+function readStoredBundle() {
+  try {
+    const stored = JSON.parse(localStorage.getItem(DATA_BUNDLE_KEY) || 'null');
+    return stored && stored.format === DATA_BUNDLE_FORMAT && stored.data ? stored : null;
+  } catch {
+    return null;
+  }
+}
+
+function storeBundle(bundle) {
   try {
-    const res = await fetch(BASE_PATH + path + '?t=' + Date.now());
+    localStorage.setItem(DATA_BUNDLE_KEY, JSON.stringify({ format: DATA_BUNDLE_FORMAT, ...bundle }));
+  } catch (e) {
+    console.warn('Could not store data bundle:', e.message);
+  }
+}
+
+async function fetchBundleFile(name, cache = 'default') {
+  try {
+    const res = await fetch(BASE_PATH + 'data/bundle/' + name, { cache });
+    if (!res.ok) return null;
+    return await res.json();
+  } catch {
+    return null;
+  }
+}
+
+// Same operations as diff() in publicar_datos.py
+function applyDataDelta(data, ops) {
+  for (const [kind, path, ...args] of ops) {
+    if (!path.length) {
+      data = args[0];
+      continue;
+    }
+    const parent = path.slice(0, -1).reduce((node, key) => node[key], data);
+    const last = path[path.length - 1];
+    if (kind === 's') parent[last] = args[0];
+    else if (kind === 'd') delete parent[last];
+    else if (kind === 'l') parent[last].splice(args[0], args[1], ...args[2]);
+    else throw new Error('Unknown delta operation ' + kind);
+  }
+  return data;
+}
+
+async function loadDataBundle() {
+  const stored = readStoredBundle();
+  const latest = await fetchBundleFile('latest.json', 'no-cache');
+  if (!latest || latest.format !== DATA_BUNDLE_FORMAT) return stored ? stored.data : null;
+  if (stored && stored.version === latest.version && stored.hash === latest.hash) return stored.data;
+
+  let bundle = null;
+  // The stored version must be the one the manifest knows (same hash), not a
+  // same-numbered version from an earlier publishing history
+  const known = stored && (latest.history || []).some(v => v.version === stored.version && v.hash === stored.hash);
+  const deltaName = known && latest.deltas && latest.deltas[stored.version];
+  if (deltaName) {
+    const delta = await fetchBundleFile(deltaName);
+    if (delta && delta.from === stored.version && delta.fromHash === stored.hash && delta.to === latest.version) {
+      try {
+        // On a copy: a delta failing partway must not leave stored.data half patched
+        const data = applyDataDelta(structuredClone(stored.data), delta.ops);
+        bundle = { version: latest.version, hash: latest.hash, data };
+      } catch (e) {
+        console.warn('Could not apply data delta:', e.message);
+      }
+    }
+  }
+  if (!bundle) {
+    const full = await fetchBundleFile(latest.full);
+    if (full && full.version === latest.version) bundle = { version: full.version, hash: full.hash, data: full.data };
+  }
+  if (!bundle) return stored ? stored.data : null;
+  storeBundle(bundle);
+  return bundle.data;
+}
+
+async function fetchJSON(path, quiet = false) {
+  try {
+    // Revalidate instead of cache-busting: unchanged files come back as 304.
+    const res = await fetch(BASE_PATH + path, { cache: 'no-cache' });
     if (!res.ok) throw new Error(`HTTP ${res.status}`);
     return await res.json();
   } catch (e) {
-    console.warn(`Could not load ${path}:`, e.message);
+    if (!quiet) console.warn(`Could not load ${path}:`, e.message);
     return [];
   }
 }
 
+// data/<name>.compact.json (actualizar_datos.py --compacto) if data/formatos.json
+// lists it, else the plain data/<name>.json. No manifest means no compact files.
+async function fetchDataJSON(name, formats) {
+  const published = await formats;
+  const compact = published && Array.isArray(published.compact) && published.compact.includes(name)
+    ? await fetchJSON(`data/${name}.compact.json`, true)
+    : null;
+  if (compact && compact.format === COMPACT_FORMAT) {
+    try {
+      return decodeCompact(compact);
+    } catch (e) {
+      console.warn(`Could not decode ${name}.compact.json:`, e.message);
+    }
+  }
+  return fetchJSON(`data/${name}.json`);
+}
+
+// ============================================
+// COMPACT DATA FORMAT (scripts/formato_compacto.py)
+// ============================================
+// Strings shared through doc.strings; lists of records stored by column as
+// {"$t": key codes, n, c: columns}. A column is inline strings {i}, string
+// codes {s} (dense, or sparse [rowDelta, code, ...] over default d, -1 when
+// the record has no such key) or raw values {v} with missing rows m.
+const COMPACT_FORMAT = 'rtcc-compact';
+const COMPACT_VERSION = 1;
+
+function decodeCompact(doc) {
+  if (doc.version !== COMPACT_VERSION) throw new Error('Unsupported compact version ' + doc.version);
+  const strings = doc.strings;
+  const ABSENT = {};
+
+  function columnValues(column, n) {
+    if ('i' in column) return { raw: true, values: column.i.map(v => (v === null ? ABSENT : v)) };
+    if (!('s' in column)) {
+      const missing = new Set(column.m || []);
+      return { raw: true, values: column.v.map((v, row) => (missing.has(row) ? ABSENT : value(v))) };
+    }
+    if (!('d' in column)) return { raw: false, values: column.s };
+    const codes = new Array(n).fill(column.d);
+    let row = -1;
+    for (let i = 0; i < column.s.length; i += 2) {
+      row += column.s[i];
+      codes[row] = column.s[i + 1];
+    }
+    return { raw: false, values: codes };
+  }
+
+  function value(v) {
+    if (Array.isArray(v)) return v.map(value);
+    if (!v || typeof v !== 'object') return v;
+    if (!('$t' in v)) {
+      const out = {};
+      Object.keys(v).forEach(key => { out[key] = value(v[key]); });
+      return out;
+    }
+    const records = Array.from({ length: v.n }, () => ({}));
+    v.$t.forEach((keyCode, c) => {
+      const key = strings[keyCode];
+      const { raw, values } = columnValues(v.c[c], v.n);
+      values.forEach((code, row) => {
+        if (raw) {
+          if (code !== ABSENT) records[row][key] = code;
+        } else if (code !== -1) {
+          records[row][key] = strings[code];
+        }
+      });
+    });
+    return records;
+  }
+
+  return value(doc.data);
+}
+
 function initApp() {
   // Hide splash
   setTimeout(() => {
@@ -89,8 +265,11 @@ function initApp() {
   renderMySessions();
   updateNotifBadge();
   showLatestNotifBanner();
+  connectNotificationFeed();
   startCountdown();
   updateArrivalFabState();
+  // Fetched while online so the service worker has it for the door
+  if (!isArrivalValidated()) loadArrivalTable();
   checkReminders();
   setInterval(checkReminders, 60000);
 
@@ -356,13 +535,38 @@ function openSessionDetail(day, sessionIndex) {
   }
 }
 
+function sameSpeakerRecords(snapshot) {
+  return snapshot.length === speakersData.length && speakersData.every((s, i) => s === snapshot[i]);
+}
+
+// Speakers by id, by normalized name (first match, like find()) and by area.
+// Rebuilt only when a record in speakersData is replaced.
+let speakerLookupCache = null;
+
+function getSpeakerLookup() {
+  if (speakerLookupCache && sameSpeakerRecords(speakerLookupCache.speakers)) return speakerLookupCache;
+  const byId = new Map();
+  const byName = new Map();
+  const byArea = new Map();
+  speakersData.forEach(s => {
+    if (!s) return;
+    if (!byId.has(s.id)) byId.set(s.id, s);
+    const name = normalizeText(s.name);
+    if (!byName.has(name)) byName.set(name, s);
+    if (!byArea.has(s.area)) byArea.set(s.area, []);
+    byArea.get(s.area).push(s);
+  });
+  speakerLookupCache = { speakers: speakersData.slice(), byId, byName, byArea };
+  return speakerLookupCache;
+}
+
 function getSessionSpeakerEntries(session) {
+  const lookup = getSpeakerLookup();
   if (!Array.isArray(session.speakers) || !session.speakers.length) {
     if (!session.area || session.area === 'evento') return [];
 
     const moderatorName = normalizeText(session.moderator || '');
-    const inferred = speakersData
-      .filter(s => s.area === session.area)
+    const inferred = (lookup.byArea.get(session.area) || [])
       .filter(s => (s.institution || '').toLowerCase().includes('rt international institute') || /moderador/i.test(s.specialty || ''))
       .map(s => ({ id: s.id, name: s.name }))
       .filter(p => normalizeText(p.name) !== moderatorName);
@@ -374,10 +578,10 @@ function getSessionSpeakerEntries(session) {
     const raw = String(value || '').trim();
     if (!raw) return null;
 
-    const byId = speakersData.find(s => s.id === raw);
+    const byId = lookup.byId.get(raw);
     if (byId) return { id: byId.id, name: byId.name };
 
-    const byName = speakersData.find(s => normalizeText(s.name) === normalizeText(raw));
+    const byName = lookup.byName.get(normalizeText(raw));
     if (byName) return { id: byName.id, name: byName.name };
 
     return { id: '', name: raw };
@@ -392,7 +596,7 @@ function getSessionParticipantEntries(session, speakerEntries) {
       .map(name => String(name || '').trim())
       .filter(Boolean)
       .map(name => {
-        const match = speakersData.find(s => normalizeText(s.name) === normalizeText(name));
+        const match = getSpeakerLookup().byName.get(normalizeText(name));
         return match ? { id: match.id, name: match.name } : { id: '', name };
       });
     return dedupePersonEntries(manual);
@@ -403,8 +607,7 @@ function getSessionParticipantEntries(session, speakerEntries) {
   const speakerNameSet = new Set(speakerEntries.map(p => normalizeText(p.name)));
   const moderatorName = normalizeText(session.moderator || '');
 
-  const areaPeople = speakersData
-    .filter(s => s.area === session.area)
+  const areaPeople = (getSpeakerLookup().byArea.get(session.area) || [])
     .map(s => ({ id: s.id, name: s.name }))
     .filter(p => normalizeText(p.name) !== moderatorName)
     .filter(p => !speakerNameSet.has(normalizeText(p.name)));
@@ -498,12 +701,106 @@ function resolvePhotoSrc(value) {
   return BASE_PATH + photo.replace(/^\.\//, '');
 }
 
+// Responsive <picture> from the photoSet written by scripts/optimizar_fotos.py.
+// Returns '' when there is no set or it belongs to another photo (e.g. a newer
+// Supabase upload merged over speaker.photo). onerrorHTML is a JS expression
+// evaluated to replace the picture if the image fails to load.
+function renderPhotoPicture(speaker, imgClass, sizes, onerrorHTML) {
+  const set = speaker.photoSet;
+  const photo = String(speaker.photo || '').trim().replace(/^\.\//, '');
+  if (!set || set.source !== photo) return '';
+
+  const srcset = value => String(value || '').split(', ').map(resolvePhotoSrc).join(', ');
+  const sources = ['avif', 'webp']
+    .filter(type => set[type])
+    .map(type => `<source type="image/${type}" srcset="${srcset(set[type])}" sizes="${sizes}">`)
+    .join('');
+  const placeholder = set.placeholder ? ` style="background-image:url('${set.placeholder}');background-size:cover"` : '';
+  return `<picture>${sources}<img src="${resolvePhotoSrc(set.src)}" srcset="${srcset(set.jpeg)}" sizes="${sizes}" alt="${escapeHTML(speaker.name)}" class="${imgClass}"${placeholder} loading="lazy" decoding="async" onerror="this.parentNode.outerHTML=${onerrorHTML}"></picture>`;
+}
+
+// ============================================
+// SPEAKER SEARCH INDEX
+// ============================================
+// Built by scripts/actualizar_datos.py (see scripts/indice_busqueda.py):
+// 2-3 letter fragments of the accent-folded name, specialty, institution and
+// area -> speaker ordinals, as a delta list or a base64 bitmap. A lookup only
+// narrows the candidates; renderSpeakers() still checks each one.
+const SPEAKER_SEARCH_INDEX_VERSION = 1;
+let speakerSearchPostings = new Map();
+
+function setSpeakerSearchIndex(index) {
+  speakerSearchPostings = new Map();
+  const ids = index && index.ids;
+  const usable = index && index.version === SPEAKER_SEARCH_INDEX_VERSION && Array.isArray(ids)
+    && ids.length === speakersData.length && speakersData.every((s, i) => s && s.id === ids[i]);
+  // A stale index (speakers.json edited without rebuilding it) falls back to the full scan
+  speakerSearchIndex = usable ? index : null;
+}
+
+function decodeSpeakerPostings(value) {
+  const ordinals = [];
+  if (typeof value === 'string') {
+    const bitmap = atob(value);
+    for (let i = 0; i < bitmap.length * 8; i++) {
+      if (bitmap.charCodeAt(i >> 3) & (1 << (i & 7))) ordinals.push(i);
+    }
+  } else {
+    let total = 0;
+    (value || []).forEach(delta => { total += delta; ordinals.push(total); });
+  }
+  return new Set(ordinals);
+}
+
+function speakerSearchPosting(gram) {
+  let posting = speakerSearchPostings.get(gram);
+  if (!posting) {
+    posting = decodeSpeakerPostings(speakerSearchIndex.postings[gram]);
+    speakerSearchPostings.set(gram, posting);
+  }
+  return posting;
+}
+
+// Ids of the speakers that may match term, or null when the index cannot
+// narrow the search (no index, or only one-letter words).
+function speakerSearchCandidates(term) {
+  if (!speakerSearchIndex) return null;
+  const [minGram, maxGram] = speakerSearchIndex.gram;
+  const grams = new Set();
+  (normalizeText(term).match(/[\p{L}\p{N}]+/gu) || []).forEach(piece => {
+    if (piece.length < minGram) return;
+    if (piece.length <= maxGram) { grams.add(piece); return; }
+    for (let i = 0; i + maxGram <= piece.length; i++) grams.add(piece.substr(i, maxGram));
+  });
+  if (!grams.size) return null;
+
+  let result = null;
+  for (const gram of [...grams].sort((a, b) => b.length - a.length)) {
+    const posting = speakerSearchPosting(gram);
+    result = result ? new Set([...result].filter(o => posting.has(o))) : posting;
+    if (!result.size) break;
+  }
+  const ids = new Set([...result].map(o => speakerSearchIndex.ids[o]));
+  // Claimed speakers may have name/specialty/institution from their profile
+  speakersData.forEach(s => { if (s._claimed) ids.add(s.id); });
+  return ids;
+}
+
+// The merged list only changes when a speaker record is replaced (profile
+// merge) or the attendee list is reloaded, so it is rebuilt only then.
+let speakerListCache = null;
+
 function getSpeakerListWithRegisteredAttendees() {
+  const attendeeList = typeof getAllAttendees === 'function' ? getAllAttendees() : null;
+  if (speakerListCache && speakerListCache.attendees === attendeeList
+      && sameSpeakerRecords(speakerListCache.speakers)) {
+    return speakerListCache.list;
+  }
+
+  const registered = Array.isArray(attendeeList) ? attendeeList : [];
   const merged = [];
   const speakerIds = new Set();
   const attendeeKeys = new Set();
-  const attendeeList = typeof getAllAttendees === 'function' ? getAllAttendees() : [];
-  const registered = Array.isArray(attendeeList) ? attendeeList : [];
 
   speakersData.forEach(speaker => {
     if (!speaker || !speaker.id) return;
@@ -513,6 +810,7 @@ function getSpeakerListWithRegisteredAttendees() {
       name: speaker.name || '',
       specialty: speaker.specialty || '',
       institution: speaker.institution || '',
+      area: speaker.area || '',
       speaker
     });
   });
@@ -538,7 +836,12 @@ function getSpeakerListWithRegisteredAttendees() {
     });
   });
 
-  return merged.sort((a, b) => a.name.localeCompare(b.name, 'es', { sensitivity: 'base' }));
+  merged.forEach(person => {
+    person.searchText = [person.name, person.specialty, person.institution, person.area].map(normalizeText);
+  });
+  merged.sort((a, b) => a.name.localeCompare(b.name, 'es', { sensitivity: 'base' }));
+  speakerListCache = { speakers: speakersData.slice(), attendees: attendeeList, list: merged };
+  return merged;
 }
 
 function renderRegisteredAttendeeCard(att) {
@@ -577,11 +880,10 @@ function renderSpeakers() {
 
   if (currentSpeakerSearch) {
     const term = normalizeText(currentSpeakerSearch);
+    const candidateIds = speakerSearchCandidates(currentSpeakerSearch);
     people = people.filter(person => {
-      const name = normalizeText(person.name);
-      const specialty = normalizeText(person.specialty);
-      const institution = normalizeText(person.institution);
-      return name.includes(term) || specialty.includes(term) || institution.includes(term);
+      if (candidateIds && person.type === 'speaker' && !candidateIds.has(person.speaker.id)) return false;
+      return person.searchText.some(text => text.includes(term));
     });
   }
 
@@ -610,9 +912,10 @@ function renderSpeakers() {
     return `
     <div class="speaker-card" onclick="typeof openSpeakerDetail==='function'?openSpeakerDetail('${speaker.id}'):toggleSpeakerBio(this)">
       <div class="${photoWrapClass}">
-        ${photoSrc
-          ? `<img src="${photoSrc}" alt="${speaker.name}" class="${photoClass}" onerror="this.outerHTML=makeInitials('${escapedName}', ${hasArrivalValidation})">`
-          : makeInitials(speaker.name, hasArrivalValidation)
+        ${renderPhotoPicture(speaker, photoClass, '72px', `makeInitials('${escapedName}', ${hasArrivalValidation})`)
+          || (photoSrc
+            ? `<img src="${photoSrc}" alt="${speaker.name}" class="${photoClass}" onerror="this.outerHTML=makeInitials('${escapedName}', ${hasArrivalValidation})">`
+            : makeInitials(speaker.name, hasArrivalValidation))
         }
         ${speaker.country && typeof COUNTRIES !== 'undefined' ? (() => { const c = COUNTRIES.find(cc => cc.code === speaker.country); return c ? `<span class="speaker-flag-badge">${c.flag}</span>` : ''; })() : ''}
       </div>
@@ -768,6 +1071,173 @@ function closeBanner() {
   }
 }
 
+// Live feed from scripts/servidor.py (/events/notifications): only the
+// entries after the newest id already loaded come down, and after a dropped
+// connection EventSource resumes from the last id it saw (Last-Event-ID).
+// Without the endpoint (static hosting) the request fails once and the app
+// keeps the data it loaded.
+let notificationFeed = null;
+
+function connectNotificationFeed() {
+  if (!('EventSource' in window) || notificationFeed) return;
+  const lastId = notificationsData.reduce((max, n) => Math.max(max, n.id), 0);
+  notificationFeed = new EventSource(BASE_PATH + 'events/notifications?desde=' + lastId);
+  notificationFeed.addEventListener('notification', event => {
+    let notif;
+    try {
+      notif = JSON.parse(event.data);
+    } catch {
+      return;
+    }
+    if (notificationsData.some(n => n.id === notif.id)) return;
+    notificationsData.push(notif);
+    renderNotifications();
+    updateNotifBadge();
+    showLatestNotifBanner();
+    if (document.hidden && 'Notification' in window && Notification.permission === 'granted'
+        && localStorage.getItem('rtcc_notif_disabled') !== '1') {
+      new Notification(notif.title, {
+        body: notif.message,
+        icon: BASE_PATH + 'img/logo-convention-gold.png',
+        tag: 'notif-' + notif.id
+      });
+    }
+  });
+}
+
+// ============================================
+// AGENDA INDEX
+// ============================================
+// Built by scripts/actualizar_datos.py (agenda-index.json): every session as
+// a slot sorted by start time, in minutes from local midnight of the first
+// date, with its sessionKey() and speaker id -> slots. maxEnd[i] is the
+// latest end among slots 0..i, which bounds the scan for running sessions.
+// If the file does not match the loaded agenda, the same tables are built
+// here once from agendaData.
+const AGENDA_INDEX_VERSION = 1;
+
+function clockMinutes(value) {
+  const match = /^(\d{1,2}):(\d{2})$/.exec(String(value || '').trim());
+  return match ? Number(match[1]) * 60 + Number(match[2]) : null;
+}
+
+// Whole calendar days between two YYYY-MM-DD dates, as minutes. Counted on
+// the calendar (not between local midnights), so a day is always 1440
+// minutes, the same as in the Python builder and in agendaMinutes().
+function dayOffsetMinutes(date, base) {
+  return Math.round((Date.parse(date + 'T00:00:00Z') - Date.parse(base + 'T00:00:00Z')) / 86400000) * 24 * 60;
+}
+
+function buildAgendaIndex() {
+  const dates = agendaData.filter(day => day && day.date).map(day => day.date).sort();
+  if (!dates.length) return null;
+  const base = dates[0];
+
+  const rows = [];
+  agendaData.forEach((day, dayPos) => {
+    if (!day || !day.date) return;
+    const offset = dayOffsetMinutes(day.date, base);
+    (day.sessions || []).forEach((session, sessionPos) => {
+      const start = clockMinutes(session.time);
+      const end = clockMinutes(session.end);
+      if (start === null || end === null) return;
+      rows.push({ start: offset + start, end: offset + end, day: dayPos, session: sessionPos,
+                  key: sessionKey(session, day.date), speakers: session.speakers || [] });
+    });
+  });
+  rows.sort((a, b) => a.start - b.start || a.day - b.day || a.session - b.session);
+
+  const slots = { start: [], end: [], maxEnd: [], day: [], session: [], key: [] };
+  const speakers = {};
+  rows.forEach((row, slot) => {
+    ['start', 'end', 'day', 'session', 'key'].forEach(col => slots[col].push(row[col]));
+    slots.maxEnd.push(slot ? Math.max(row.end, slots.maxEnd[slot - 1]) : row.end);
+    new Set(row.speakers).forEach(id => (speakers[id] = speakers[id] || []).push(slot));
+  });
+  return { version: AGENDA_INDEX_VERSION, base, slots, speakers };
+}
+
+// True if every slot of index points at a session of agendaData with the
+// same key, end time and speakers, and no session is left out. One pass over
+// the slots, no sorting.
+function agendaIndexMatches(index) {
+  const slots = index && index.version === AGENDA_INDEX_VERSION && index.base && index.slots;
+  if (!slots || !Array.isArray(slots.key) || !index.speakers) return false;
+  const total = agendaData.reduce((n, day) => n + (day && day.date && day.sessions ? day.sessions.length : 0), 0);
+  if (total !== slots.key.length) return false;
+  let speakerRefs = 0;
+  const ok = slots.key.every((key, slot) => {
+    const day = agendaData[slots.day[slot]];
+    const session = day && day.date && day.sessions && day.sessions[slots.session[slot]];
+    if (!session || sessionKey(session, day.date) !== key) return false;
+    if (dayOffsetMinutes(day.date, index.base) + clockMinutes(session.end) !== slots.end[slot]) return false;
+    const ids = new Set(session.speakers || []);
+    speakerRefs += ids.size;
+    return [...ids].every(id => (index.speakers[id] || []).includes(slot));
+  });
+  return ok && speakerRefs === Object.values(index.speakers).reduce((n, list) => n + list.length, 0);
+}
+
+function setAgendaIndex(index) {
+  const usable = agendaIndexMatches(index) ? index : buildAgendaIndex();
+  if (!usable) {
+    agendaIndex = null;
+    return;
+  }
+  agendaIndex = {
+    ...usable.slots,
+    base: usable.base,
+    speakers: usable.speakers,
+    keySlot: new Map(usable.slots.key.map((key, slot) => [key, slot]))
+  };
+}
+
+// Local wall-clock time of `date` in the index frame: calendar days since
+// the base date times 1440 plus minutes since local midnight. Subtracting a
+// local-midnight timestamp instead would be 60 minutes off after a DST change.
+function agendaMinutes(date) {
+  const day = Date.UTC(date.getFullYear(), date.getMonth(), date.getDate());
+  const days = Math.round((day - Date.parse(agendaIndex.base + 'T00:00:00Z')) / 86400000);
+  return days * 24 * 60 + date.getHours() * 60 + date.getMinutes() +
+    (date.getSeconds() + date.getMilliseconds() / 1000) / 60;
+}
+
+function agendaSlotSession(slot) {
+  const day = agendaData[agendaIndex.day[slot]];
+  return { session: day.sessions[agendaIndex.session[slot]], date: day.date, day };
+}
+
+// Slots running at `now` (in agenda order) and the first one starting after
+// it (-1 if none), by binary search over the start times.
+function findAgendaSlots(now) {
+  const idx = agendaIndex;
+  const minute = agendaMinutes(now);
+  let lo = 0;
+  let hi = idx.start.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (idx.start[mid] <= minute) lo = mid + 1;
+    else hi = mid;
+  }
+  const running = [];
+  for (let slot = lo - 1; slot >= 0 && idx.maxEnd[slot] >= minute; slot--) {
+    if (idx.end[slot] >= minute) running.push(slot);
+  }
+  running.sort((a, b) => idx.day[a] - idx.day[b] || idx.session[a] - idx.session[b]);
+  return { running, next: lo < idx.start.length ? lo : -1 };
+}
+
+// Slots of the given session keys, in start order
+function agendaSlotsForKeys(keys) {
+  if (!agendaIndex) return [];
+  return [...new Set(keys.map(key => agendaIndex.keySlot.get(key)).filter(slot => slot !== undefined))]
+    .sort((a, b) => a - b);
+}
+
+function agendaSlotsForSpeaker(speakerId) {
+  return (agendaIndex && speakerId && agendaIndex.speakers[speakerId]) || [];
+}
+
 // ============================================
 // NEXT SESSION (Home)
 // ============================================
@@ -775,39 +1245,19 @@ function renderNextSession() {
   const container = document.getElementById('nextSessionContent');
   const now = new Date();
 
-  // Find current or next session across all days
-  let nextSession = null;
-  let sessionDate = null;
-
-  for (const day of agendaData) {
-    if (!day.sessions || !day.date) continue;
-    for (const session of day.sessions) {
-      try {
-        const start = new Date(day.date + 'T' + session.time + ':00');
-        const end = new Date(day.date + 'T' + session.end + ':00');
-
-        // Currently happening
-        if (now >= start && now <= end) {
-          nextSession = session;
-          sessionDate = day.date;
-          break;
-        }
-
-        // Next upcoming
-        if (start > now && (!nextSession || start < new Date(sessionDate + 'T' + nextSession.time + ':00'))) {
-          nextSession = session;
-          sessionDate = day.date;
-        }
-      } catch { /* skip invalid */ }
-    }
-    if (nextSession && isSessionNow(nextSession, sessionDate, now)) break;
+  // Current session (first in agenda order) or the next one to start
+  let slot = -1;
+  if (agendaIndex) {
+    const { running, next } = findAgendaSlots(now);
+    slot = running.length ? running[0] : next;
   }
 
-  if (!nextSession) {
+  if (slot < 0) {
     container.innerHTML = '<p class="muted">No hay sesiones pr&oacute;ximas programadas.</p>';
     return;
   }
 
+  const { session: nextSession, date: sessionDate } = agendaSlotSession(slot);
   const isNow = isSessionNow(nextSession, sessionDate, now);
   container.innerHTML = `
     ${isNow ? '<span class="now-badge" style="margin-bottom:8px;"><span class="now-dot"></span> EN VIVO</span>' : ''}
@@ -827,28 +1277,20 @@ function renderMySessions() {
   const reminders = getReminders();
   const mySpeakerId = (typeof currentProfile !== 'undefined' && currentProfile) ? currentProfile.speaker_id : null;
 
-  // Collect sessions where user has reminder OR is a speaker/moderator
-  const mySessions = [];
-  for (const day of agendaData) {
-    if (!day.sessions || !day.date) continue;
-    for (const session of day.sessions) {
-      const key = sessionKey(session, day.date);
-      const hasReminder = reminders.includes(key);
-      const isSpeaker = mySpeakerId && session.speakers && session.speakers.includes(mySpeakerId);
-      if (hasReminder || isSpeaker) {
-        mySessions.push({ session, date: day.date, dayLabel: day.label || ('Día ' + day.day), hasReminder, isSpeaker });
-      }
-    }
-  }
+  // Collect sessions where user has reminder OR is a speaker/moderator (slots are in start order)
+  const reminderSlots = new Set(agendaSlotsForKeys(reminders));
+  const speakerSlots = new Set(agendaSlotsForSpeaker(mySpeakerId));
+  const mySessions = [...new Set([...reminderSlots, ...speakerSlots])].sort((a, b) => a - b).map(slot => {
+    const { session, date, day } = agendaSlotSession(slot);
+    return { session, date, dayLabel: day.label || ('Día ' + day.day),
+             hasReminder: reminderSlots.has(slot), isSpeaker: speakerSlots.has(slot) };
+  });
 
   if (!mySessions.length) {
     container.innerHTML = '<p class="muted">Activá la campana en las sesiones que te interesen para verlas acá.</p>';
     return;
   }
 
-  // Sort by date+time
-  mySessions.sort((a, b) => (a.date + a.session.time).localeCompare(b.date + b.session.time));
-
   const now = new Date();
   container.innerHTML = mySessions.map(ev => {
     const isNow = isSessionNow(ev.session, ev.date, now);
@@ -1001,30 +1443,16 @@ function toggleSpeakerFollow(speakerId, speakerName, event) {
 
 function addSpeakerReminders(speakerId) {
   const reminders = getReminders();
-  for (const day of agendaData) {
-    if (!day.sessions || !day.date) continue;
-    for (const session of day.sessions) {
-      if (session.speakers && session.speakers.includes(speakerId)) {
-        const key = sessionKey(session, day.date);
-        if (!reminders.includes(key)) reminders.push(key);
-      }
-    }
+  for (const slot of agendaSlotsForSpeaker(speakerId)) {
+    const key = agendaIndex.key[slot];
+    if (!reminders.includes(key)) reminders.push(key);
   }
   setReminders(reminders);
 }
 
 function removeSpeakerReminders(speakerId) {
-  let reminders = getReminders();
-  for (const day of agendaData) {
-    if (!day.sessions || !day.date) continue;
-    for (const session of day.sessions) {
-      if (session.speakers && session.speakers.includes(speakerId)) {
-        const key = sessionKey(session, day.date);
-        reminders = reminders.filter(r => r !== key);
-      }
-    }
-  }
-  setReminders(reminders);
+  const keys = new Set(agendaSlotsForSpeaker(speakerId).map(slot => agendaIndex.key[slot]));
+  setReminders(getReminders().filter(r => !keys.has(r)));
 }
 
 function requestNotifPermission() {
@@ -1041,26 +1469,22 @@ function checkReminders() {
   const reminders = getReminders();
   const notified = JSON.parse(localStorage.getItem('rtcc_notified') || '[]');
 
-  for (const day of agendaData) {
-    if (!day.sessions || !day.date) continue;
-    for (const session of day.sessions) {
-      const key = sessionKey(session, day.date);
-      if (!reminders.includes(key) || notified.includes(key)) continue;
-
-      try {
-        const start = new Date(day.date + 'T' + session.time + ':00');
-        const diff = start - now;
-        // Notify between 10 and 11 minutes before
-        if (diff > 0 && diff <= 10 * 60 * 1000 && diff > 9 * 60 * 1000) {
-          new Notification('RTCC 2026 - Pr\u00f3xima sesi\u00f3n', {
-            body: session.title + '\n' + session.time + ' - ' + session.room,
-            icon: BASE_PATH + 'img/logo-convention-gold.png',
-            tag: key
-          });
-          notified.push(key);
-          localStorage.setItem('rtcc_notified', JSON.stringify(notified));
-        }
-      } catch { /* skip */ }
+  // Only the reminded sessions are looked at, each by its key
+  for (const slot of agendaSlotsForKeys(reminders)) {
+    const key = agendaIndex.key[slot];
+    if (notified.includes(key)) continue;
+
+    const diff = (agendaIndex.start[slot] - agendaMinutes(now)) * 60 * 1000;
+    // Notify between 10 and 11 minutes before
+    if (diff > 0 && diff <= 10 * 60 * 1000 && diff > 9 * 60 * 1000) {
+      const { session } = agendaSlotSession(slot);
+      new Notification('RTCC 2026 - Pr\u00f3xima sesi\u00f3n', {
+        body: session.title + '\n' + session.time + ' - ' + session.room,
+        icon: BASE_PATH + 'img/logo-convention-gold.png',
+        tag: key
+      });
+      notified.push(key);
+      localStorage.setItem('rtcc_notified', JSON.stringify(notified));
     }
   }
 }
@@ -1083,26 +1507,17 @@ function renderProfileEvents() {
     return;
   }
 
-  // Match reminder keys to session data
-  const events = [];
-  for (const day of agendaData) {
-    if (!day.sessions || !day.date) continue;
-    for (const session of day.sessions) {
-      const key = sessionKey(session, day.date);
-      if (reminders.includes(key)) {
-        events.push({ key, session, date: day.date, dayLabel: day.label || day.day });
-      }
-    }
-  }
+  // Match reminder keys to session data (slots are in start order)
+  const events = agendaSlotsForKeys(reminders).map(slot => {
+    const { session, date, day } = agendaSlotSession(slot);
+    return { key: agendaIndex.key[slot], session, date, dayLabel: day.label || day.day };
+  });
 
   if (!events.length) {
     container.innerHTML = '<p class="profile-events-empty">No tenés eventos con recordatorio activado.</p>';
     return;
   }
 
-  // Sort by date+time
-  events.sort((a, b) => (a.date + a.session.time).localeCompare(b.date + b.session.time));
-
   container.innerHTML = events.map(ev => {
     const escapedKey = ev.key.replace(/'/g, "\\'");
     const areaTag = typeof areaLabel === 'function' ? areaLabel(ev.session.area) : ev.session.area;
@@ -1150,9 +1565,53 @@ function getArrivalHandshake() {
   }
 }
 
+function isAcceptedHandshake(handshake) {
+  if (!handshake || typeof handshake.code !== 'string') return false;
+  return handshake.code === ARRIVAL_QR_EXPECTED ||
+    (handshake.signed === true && handshake.code.startsWith(ARRIVAL_CODE_PREFIX));
+}
+
 function isArrivalValidated() {
-  const handshake = getArrivalHandshake();
-  return !!(handshake && handshake.code === ARRIVAL_QR_EXPECTED);
+  return isAcceptedHandshake(getArrivalHandshake());
+}
+
+// data/arribos.json: sorted, concatenated SHA-256 prefixes of the valid
+// per-attendee codes. null if it was not generated.
+function loadArrivalTable() {
+  if (!arrivalTablePromise) {
+    arrivalTablePromise = fetchJSON('data/arribos.json', true).then(table => {
+      if (!table || !table.hashes || !table.bytes) {
+        // Try again on the next scan (e.g. first load was offline)
+        arrivalTablePromise = null;
+        return null;
+      }
+      const raw = atob(table.hashes);
+      const hashes = new Uint8Array(raw.length);
+      for (let i = 0; i < raw.length; i++) hashes[i] = raw.charCodeAt(i);
+      return { width: table.bytes, count: hashes.length / table.bytes, hashes };
+    });
+  }
+  return arrivalTablePromise;
+}
+
+// Binary search of the code's fingerprint in the table; works offline
+async function isSignedArrivalCode(code) {
+  if (!code.startsWith(ARRIVAL_CODE_PREFIX) || !window.crypto?.subtle) return false;
+  const table = await loadArrivalTable();
+  if (!table) return false;
+  const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', new TextEncoder().encode(code)));
+  const { width, hashes } = table;
+  let lo = 0;
+  let hi = table.count - 1;
+  while (lo <= hi) {
+    const mid = (lo + hi) >> 1;
+    let cmp = 0;
+    for (let i = 0; i < width && !cmp; i++) cmp = hashes[mid * width + i] - digest[i];
+    if (!cmp) return true;
+    if (cmp < 0) lo = mid + 1;
+    else hi = mid - 1;
+  }
+  return false;
 }
 
 function formatArrivalTimestamp(value) {
@@ -1193,7 +1652,7 @@ function updateArrivalFabState() {
 
 function updateArrivalStatusUI() {
   const handshake = getArrivalHandshake();
-  if (handshake && handshake.code === ARRIVAL_QR_EXPECTED) {
+  if (isAcceptedHandshake(handshake)) {
     const when = formatArrivalTimestamp(handshake.verifiedAt);
     const suffix = when ? ` (${when})` : '';
     setArrivalStatus(
@@ -1240,10 +1699,11 @@ function closeArrivalModalOnBackdrop(event) {
   if (event.target === event.currentTarget) closeArrivalModal();
 }
 
-function registerArrivalHandshake(code, method = 'qr_scan') {
+function registerArrivalHandshake(code, method = 'qr_scan', signed = false) {
   const payload = {
     code,
     method,
+    signed,
     verifiedAt: new Date().toISOString(),
     certificateEnabled: true
   };
@@ -1255,7 +1715,7 @@ function registerArrivalHandshake(code, method = 'qr_scan') {
   showToast('Arribo validado. Certificado habilitado al finalizar el congreso.');
 }
 
-function handleArrivalScanResult(scannedValue) {
+async function handleArrivalScanResult(scannedValue) {
   const value = String(scannedValue || '').trim();
   if (!value) {
     arrivalScanLoopId = requestAnimationFrame(() => scanArrivalLoop());
@@ -1268,6 +1728,13 @@ function handleArrivalScanResult(scannedValue) {
     return;
   }
 
+  if (await isSignedArrivalCode(value)) {
+    registerArrivalHandshake(value, 'qr_scan', true);
+    stopArrivalScanner(false);
+    return;
+  }
+  if (!arrivalScanActive) return;
+
   const now = Date.now();
   if (now - arrivalLastInvalidAt > 1500) {
     setArrivalStatus('QR invalido. Escanea el codigo unico oficial de arribo.', 'error');
@@ -1308,6 +1775,7 @@ async function startArrivalScanner() {
     updateArrivalStatusUI();
     return;
   }
+  loadArrivalTable();
 
   if (!navigator.mediaDevices || !navigator.mediaDevices.getUserMedia) {
     setArrivalStatus('Tu dispositivo no permite abrir la camara desde el navegador.', 'error');
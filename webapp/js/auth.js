@@ -17,6 +17,19 @@ let currentProfile   = null;   // Row from public.profiles
 let pendingPhotoBlob = null;   // Compressed JPEG before upload
 let claimedSpeakerIds = new Set(); // Already claimed speaker_ids
 
+// data/speakers-perfiles.json, baked by scripts/perfiles_supabase.py
+const PROFILES_SNAPSHOT_FORMAT = 2;
+// speakersData key -> profiles column
+const PROFILE_OVERLAY_FIELDS = [
+  ['country', 'country'],
+  ['institution', 'institution'],
+  ['specialty', 'specialty'],
+  ['phone', 'phone'],
+  ['email', 'email'],
+  ['bio', 'bio'],
+  ['photo', 'photo_url'],
+];
+
 // Latin American + common countries for radiotherapy convention
 const COUNTRIES = [
   { code: 'UY', name: 'Uruguay', prefix: '+598', flag: '🇺🇾' },
@@ -113,6 +126,19 @@ document.addEventListener('DOMContentLoaded', async () => {
 async function loadAndMergeSupabaseProfiles() {
   if (!supabaseClient) return;
 
+  // The baked snapshot has every profile's fields ready to apply over the
+  // speakers the app loaded; the live query below is only the fallback
+  // when it was not published
+  const snapshot = await fetchJSON('data/speakers-perfiles.json', true);
+  if (snapshot && snapshot.format === PROFILES_SNAPSHOT_FORMAT && snapshot.overlays) {
+    claimedSpeakerIds = new Set(snapshot.claimed || []);
+    applyProfileOverlays(snapshot.overlays);
+    // The user's own edits show up before the next bake
+    if (currentProfile) mergeProfiles([currentProfile]);
+    if (typeof renderSpeakers === 'function') renderSpeakers();
+    return;
+  }
+
   try {
     const { data: profiles, error } = await supabaseClient
       .from('profiles')
@@ -122,30 +148,7 @@ async function loadAndMergeSupabaseProfiles() {
     if (!profiles || !profiles.length) return;
 
     claimedSpeakerIds.clear();
-
-    profiles.forEach(prof => {
-      if (!prof.speaker_id) return;
-      claimedSpeakerIds.add(prof.speaker_id);
-
-      const idx = speakersData.findIndex(s => s.id === prof.speaker_id);
-      if (idx === -1) return;
-
-      const base = speakersData[idx];
-      const fullName = buildFullName(prof.name, prof.lastname);
-      speakersData[idx] = {
-        ...base,
-        name:        fullName || base.name,
-        country:     prof.country     || base.country,
-        institution: prof.institution || base.institution,
-        specialty:   prof.specialty   || base.specialty,
-        phone:       prof.phone       || base.phone,
-        email:       prof.email       || base.email,
-        bio:         prof.bio         || base.bio,
-        photo:       prof.photo_url   || base.photo,
-        visibility:  prof.visibility  || {},
-        _claimed:    true,
-      };
-    });
+    mergeProfiles(profiles);
 
     if (typeof renderSpeakers === 'function') renderSpeakers();
   } catch (e) {
@@ -153,6 +156,41 @@ async function loadAndMergeSupabaseProfiles() {
   }
 }
 
+// The fields a profile sets on its speaker; same rules as profile_overlay()
+// in scripts/perfiles_supabase.py. Fields the profile hides are left out.
+function profileOverlay(prof, previous = {}) {
+  const overlay = { ...previous };
+  const visibility = prof.visibility || {};
+  const fullName = buildFullName(prof.name, prof.lastname);
+  if (fullName) overlay.name = fullName;
+  for (const [field, column] of PROFILE_OVERLAY_FIELDS) {
+    if (VISIBILITY_FIELDS.includes(field) && visibility[field] === false) delete overlay[field];
+    else if (prof[column]) overlay[field] = prof[column];
+  }
+  overlay.visibility = visibility;
+  overlay._claimed = true;
+  return overlay;
+}
+
+// speaker id -> overlay, joined by id over speakersData
+function applyProfileOverlays(overlays) {
+  const indexById = new Map(speakersData.map((s, i) => [s.id, i]));
+  for (const [speakerId, overlay] of Object.entries(overlays)) {
+    const idx = indexById.get(speakerId);
+    if (idx !== undefined) speakersData[idx] = { ...speakersData[idx], ...overlay };
+  }
+}
+
+function mergeProfiles(profiles) {
+  const overlays = {};
+  profiles.forEach(prof => {
+    if (!prof.speaker_id) return;
+    claimedSpeakerIds.add(prof.speaker_id);
+    overlays[prof.speaker_id] = profileOverlay(prof, overlays[prof.speaker_id]);
+  });
+  applyProfileOverlays(overlays);
+}
+
 async function loadCurrentProfile() {
   if (!supabaseClient || !currentUser) return;
 
@@ -1151,9 +1189,11 @@ function openSpeakerDetail(speakerId) {
   const vis = speaker.visibility || {};
   const showField = (field) => vis[field] !== false;
 
-  const photoHtml = speaker.photo
-    ? `<img src="${BASE_PATH}${speaker.photo}" alt="${speaker.name}" class="speaker-detail-photo" onerror="this.outerHTML='<div class=\\'speaker-detail-initials\\'>${speakerInitials(speaker.name)}</div>'">`
-    : `<div class="speaker-detail-initials">${speakerInitials(speaker.name)}</div>`;
+  const initialsHtml = `'<div class=\\'speaker-detail-initials\\'>${speakerInitials(speaker.name)}</div>'`;
+  const photoHtml = renderPhotoPicture(speaker, 'speaker-detail-photo', '96px', initialsHtml)
+    || (speaker.photo
+      ? `<img src="${resolvePhotoSrc(speaker.photo)}" alt="${speaker.name}" class="speaker-detail-photo" onerror="this.outerHTML=${initialsHtml}">`
+      : `<div class="speaker-detail-initials">${speakerInitials(speaker.name)}</div>`);
 
   const areaColors = { mama: '#e91e8c', pulmon: '#00bcd4', prostata: '#4caf50', neuro: '#ff9800' };
   const areaNames = { mama: 'Mama', pulmon: 'Pulmón', prostata: 'Próstata', neuro: 'Neuro' };
@@ -1,4 +1,7 @@
-const CACHE_NAME = 'rtcc-2026-v13';
+// Replaced by scripts/huellas_assets.py with {version, assets: {path: revision}}.
+// Paths with a null revision have the content hash in their name.
+const PRECACHE_MANIFEST = null;
+const CACHE_NAME = PRECACHE_MANIFEST ? 'rtcc-' + PRECACHE_MANIFEST.version : 'rtcc-2026-v13';
 const ASSETS = [
   './',
   './index.html',
@@ -11,11 +14,40 @@ const ASSETS = [
   './manifest.json'
 ];
 
+// Absolute URL -> cache key of each precached asset. Assets without the
+// hash in their name are stored under url?__v=<revision>, so a new
+// revision is a new key and an unchanged file keeps its key.
+const PRECACHE_KEYS = new Map();
+if (PRECACHE_MANIFEST) {
+  for (const [path, revision] of Object.entries(PRECACHE_MANIFEST.assets)) {
+    const url = new URL(path, self.registration.scope).href;
+    PRECACHE_KEYS.set(url, revision ? url + '?__v=' + revision : url);
+  }
+}
+
+function precacheKey(url) {
+  const { origin, pathname } = new URL(url);
+  const plain = origin + (pathname.endsWith('/') ? pathname + 'index.html' : pathname);
+  return PRECACHE_KEYS.get(plain);
+}
+
+// Copy unchanged assets from the previous caches, download only the rest
+async function precache() {
+  const cache = await caches.open(CACHE_NAME);
+  await Promise.all([...PRECACHE_KEYS].map(async ([url, key]) => {
+    if (await cache.match(key)) return;
+    const previous = await caches.match(key);
+    if (previous) return cache.put(key, previous);
+    const response = await fetch(url, { cache: 'no-cache' });
+    if (!response.ok) throw new Error(`${url}: HTTP ${response.status}`);
+    return cache.put(key, response);
+  }));
+}
+
 // Install - cache static assets
 self.addEventListener('install', event => {
   event.waitUntil(
-    caches.open(CACHE_NAME)
-      .then(cache => cache.addAll(ASSETS))
+    (PRECACHE_MANIFEST ? precache() : caches.open(CACHE_NAME).then(cache => cache.addAll(ASSETS)))
       .then(() => self.skipWaiting())
   );
 });
@@ -32,11 +64,14 @@ self.addEventListener('activate', event => {
 // Fetch - network first for JSON data, cache first for assets
 self.addEventListener('fetch', event => {
   if (event.request.method !== 'GET') return;
+  // Live notification stream: straight to the network
+  if (event.request.headers.get('accept') === 'text/event-stream') return;
   const url = new URL(event.request.url);
   const path = url.pathname || '';
   const isDataJson = path.endsWith('.json') && path.includes('/data/');
   const isNavigation = event.request.mode === 'navigate';
   const isCoreAsset = /\.(?:js|css|html)$/i.test(path);
+  const key = precacheKey(event.request.url);
 
   // JSON data files: always try network first (for fresh notifications/agenda)
   if (isDataJson) {
@@ -47,7 +82,16 @@ self.addEventListener('fetch', event => {
           caches.open(CACHE_NAME).then(cache => cache.put(event.request, clone));
           return response;
         })
-        .catch(() => caches.match(event.request))
+        .catch(async () => (await caches.match(event.request)) || (key && caches.match(key)))
+    );
+    return;
+  }
+
+  // Precached app shell: its revision is in the manifest, so the cached copy
+  // is current until a new service worker ships a new one.
+  if (key) {
+    event.respondWith(
+      caches.match(key).then(cached => cached || fetch(event.request))
     );
     return;
   }
@@ -65,7 +109,7 @@ self.addEventListener('fetch', event => {
           const cached = await caches.match(event.request);
           if (cached) return cached;
           if (isNavigation) {
-            return caches.match('./index.html');
+            return caches.match(precacheKey(self.registration.scope) || './index.html');
           }
           return Response.error();
         })